@@ -3,6 +3,7 @@ import logging
 import textwrap
 import json
 from llm_service import LLMService, parse_llm_json
+from runner_output_parsers import parse_test_output
 
 class AutomatedTestResultParserAgent:
     """
@@ -39,11 +40,19 @@ class AutomatedTestResultParserAgent:
     def parse_results(self, test_output: str) -> dict:
         """
         Parses test runner output and returns a structured result.
+        Known formats (pytest, JUnit XML, unittest, Jest, go test, dotnet test)
+        are parsed locally; the LLM is only consulted when no parser matches.
 
         Returns:
             A dictionary with keys 'success' (bool) and 'summary' (str).
         """
         logging.info("Parsing automated test runner output...")
+        parsed_run = parse_test_output(test_output)
+        if parsed_run is not None:
+            logging.info(f"Test output parsed locally as {parsed_run.framework}. Success: {parsed_run.success}")
+            return parsed_run.to_result_dict()
+
+        logging.info("No local parser recognized the test output. Falling back to the LLM.")
         try:
             prompt = self._build_prompt(test_output)
             response_text = self.llm_service.generate_text(prompt, task_complexity="simple")
@@ -1,6 +1,4 @@
 import logging
-import requests
-from requests.auth import HTTPBasicAuth
 import json
 
 class IntegrationAgentPMT:
@@ -10,6 +8,7 @@ class IntegrationAgentPMT:
     def __init__(self, provider: str, url: str, username: str, api_token: str):
         if not all([provider, url, username, api_token]):
             raise ValueError("All integration parameters (URL, Username, API Token) are required.")
+        from requests.auth import HTTPBasicAuth
 
         self.provider = provider
         # Ensure URL is formatted correctly for the API
@@ -41,6 +40,8 @@ class IntegrationAgentPMT:
         """
         Searches for issues using the tool's query language (e.g., JQL for Jira).
         """
+        import requests
+
         api_url = f"{self.base_url}/rest/api/3/search"
 
         payload = json.dumps({
@@ -104,6 +105,8 @@ class IntegrationAgentPMT:
         Returns:
             A dictionary containing the new issue's 'key' and 'url'.
         """
+        import requests
+
         api_url = f"{self.base_url}/rest/api/3/issue"
 
         fields = {
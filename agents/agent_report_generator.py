@@ -6,28 +6,36 @@ This agent is responsible for generating formatted .docx reports.
 """
 
 import logging
-from docx import Document
-from docx.enum.section import WD_ORIENT
-from docx.shared import Inches
 from io import BytesIO
+import itertools
 import json
 import re
+from typing import TYPE_CHECKING, Iterable
 from klyve_db_manager import KlyveDBManager
 from pathlib import Path
-from docx.shared import Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from htmldocx import HtmlToDocx
-from openpyxl import Workbook
-from openpyxl.styles import Font
-import pandas as pd
 from datetime import datetime, timezone
 from gui.utils import format_timestamp_for_display
-from gui.rendering_utils import generate_dot_png, generate_plotly_png
+from gui.rendering_utils import generate_dot_png, generate_plotly_png, prerender_dot_blocks
+from xlsx_export import WATERMARK_FOOTER, XlsxColumn, write_xlsx
+from markdown_docx import BLOCK_CODE, MarkdownDocxEmitter, is_dot_source, iter_markdown_blocks
 #import plotly.graph_objects as go
 #import plotly.io as pio
-import markdown
-from bs4 import BeautifulSoup
-from PIL import Image
+
+if TYPE_CHECKING:
+    from docx.document import Document
+
+# python-docx, htmldocx, openpyxl, markdown, bs4 and PIL are imported
+# inside the methods that use them, so importing this agent stays cheap at startup.
+
+BACKLOG_XLSX_COLUMNS = [
+    XlsxColumn('#'), XlsxColumn('Title'), XlsxColumn('Type'), XlsxColumn('Status'),
+    XlsxColumn('Priority/Severity'), XlsxColumn('Complexity'), XlsxColumn('Last Modified'),
+]
+
+TRACE_XLSX_COLUMNS = [
+    XlsxColumn('Backlog Item (#)', 18), XlsxColumn('Title', 50), XlsxColumn('Status', 20),
+    XlsxColumn('Artifact Path', 60), XlsxColumn('Artifact Name', 30),
+]
 
 class ReportGeneratorAgent:
     """
@@ -52,6 +60,7 @@ class ReportGeneratorAgent:
         """
         Injects the EU AI Act compliance watermark into the document footer.
         """
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
         try:
             # Access the first section (usually sufficient for uniform documents)
             section = document.sections[0]
@@ -83,11 +92,12 @@ class ReportGeneratorAgent:
                 logging.warning("Style 'Normal' not found. Using default paragraph.")
                 document.add_paragraph(text)
 
-    def _get_styled_document(self) -> Document:
+    def _get_styled_document(self) -> "Document":
         """
         Helper method to load the user's selected .docx template or fall back
         to a default Document object.
         """
+        from docx import Document
         template_path_str = "data/templates/styles/default_docx_template.docx" # Default
 
         if self.db_manager:
@@ -218,10 +228,71 @@ class ReportGeneratorAgent:
         doc_buffer.seek(0)
         return doc_buffer
 
+    def _add_dot_diagram(self, document, code_text: str):
+        """
+        Renders a DOT diagram onto its own landscape page, scaled to fit the
+        page (SAFER SMART SCALING), then restores portrait orientation.
+        """
+        from docx.enum.section import WD_SECTION, WD_ORIENT
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx.shared import Inches
+        from PIL import Image
+        try:
+            image_bytes_io = generate_dot_png(code_text)
+
+            # --- SMART SCALING LOGIC ---
+            try:
+                with Image.open(image_bytes_io) as img:
+                    width_px, height_px = img.size
+                    aspect_ratio = width_px / height_px
+                image_bytes_io.seek(0)
+            except Exception:
+                aspect_ratio = 0.5
+
+            # Landscape Page Dimensions
+            PAGE_WIDTH_AVAIL = 9.0
+            # CHANGED: Reduced max height to 5.5 to prevent truncation
+            PAGE_HEIGHT_AVAIL = 5.5
+            PAGE_ASPECT = PAGE_WIDTH_AVAIL / PAGE_HEIGHT_AVAIL
+
+            # Create Landscape Section
+            section = document.add_section(WD_SECTION.NEW_PAGE)
+            section.orientation = WD_ORIENT.LANDSCAPE
+            section.page_width = Inches(11.0) # Standard Letter Landscape
+            section.page_height = Inches(8.5)
+            section.left_margin = Inches(0.5)
+            section.right_margin = Inches(0.5)
+            section.top_margin = Inches(0.5)
+            section.bottom_margin = Inches(0.5)
+
+            p = document.add_paragraph()
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            r = p.add_run()
+
+            if aspect_ratio > PAGE_ASPECT:
+                r.add_picture(image_bytes_io, width=Inches(PAGE_WIDTH_AVAIL))
+            else:
+                r.add_picture(image_bytes_io, height=Inches(PAGE_HEIGHT_AVAIL))
+
+            # Restore Portrait
+            next_section = document.add_section(WD_SECTION.NEW_PAGE)
+            next_section.orientation = WD_ORIENT.PORTRAIT
+            next_section.page_width = Inches(8.5)
+            next_section.page_height = Inches(11.0)
+            next_section.left_margin = Inches(1.0)
+            next_section.right_margin = Inches(1.0)
+            # --- END SMART SCALING ---
+
+        except Exception as e:
+            logging.error(f"Failed to render DOT diagram for docx: {e}")
+            self._add_styled_paragraph(document, f"[Error rendering DOT diagram: {e}]", 'Code Block')
+
     def generate_text_document_docx(self, title: str, content: str, is_html: bool = False) -> BytesIO:
         """
         Generates a generic .docx file. Includes Title Page and SAFER SMART SCALING for diagrams.
+        Markdown is written straight into the document token by token (see markdown_docx).
         """
+        from htmldocx import HtmlToDocx
         document = self._get_styled_document()
 
         # 1. Add Title Page
@@ -232,7 +303,7 @@ class ReportGeneratorAgent:
         document.add_paragraph()
 
         # Force Title Page Break
-        from docx.enum.section import WD_SECTION, WD_ORIENT
+        from docx.enum.section import WD_SECTION
         document.add_section(WD_SECTION.NEW_PAGE)
         document.add_paragraph("")
 
@@ -248,107 +319,17 @@ class ReportGeneratorAgent:
         # 3. Standard Markdown Processing
         else:
             try:
-                html_content = markdown.markdown(content, extensions=['fenced_code', 'tables', 'sane_lists'])
-                soup = BeautifulSoup(html_content, 'html.parser')
-
-                root_tags = soup.find_all(True, recursive=False)
-                search_node = soup
-                if len(root_tags) == 1 and root_tags[0].name not in ['h1', 'h2', 'h3', 'p', 'ul', 'ol', 'pre', 'hr']:
-                    search_node = root_tags[0]
-
-                for tag in search_node.find_all(True, recursive=False):
-                    style_name = 'Normal'
-
-                    if tag.name == 'h1':
-                        style_name = 'Heading 1'
-                        self._add_styled_paragraph(document, tag.get_text(), style_name)
-                    elif tag.name == 'h2':
-                        style_name = 'Heading 2'
-                        self._add_styled_paragraph(document, tag.get_text(), style_name)
-                    elif tag.name == 'h3':
-                        style_name = 'Heading 3'
-                        self._add_styled_paragraph(document, tag.get_text(), style_name)
-                    elif tag.name == 'p':
-                        style_name = 'Normal'
-                        self._add_styled_paragraph(document, tag.get_text(), style_name)
-                    elif tag.name == 'ul':
-                        style_name = 'Bullet List'
-                        for li in tag.find_all('li'): self._add_styled_paragraph(document, li.get_text(), style_name)
-                    elif tag.name == 'ol':
-                        style_name = 'List Numbered'
-                        for li in tag.find_all('li'): self._add_styled_paragraph(document, li.get_text(), style_name)
-                    elif tag.name == 'table':
-                        try:
-                            # Use the library to render the complex table structure
-                            parser = HtmlToDocx()
-                            # We must pass the string representation of the tag
-                            parser.add_html_to_document(str(tag), document)
-                        except Exception as e:
-                            logging.error(f"Failed to render table in DOCX: {e}")
-                            # Fallback: just dump the text
-                            self._add_styled_paragraph(document, tag.get_text(), 'Code Block')
-                    elif tag.name == 'pre':
-                        code_text = tag.get_text().strip()
-
-                        if code_text.startswith(('digraph', 'graph')):
-                            try:
-                                image_bytes_io = generate_dot_png(code_text)
-
-                                # --- SMART SCALING LOGIC ---
-                                try:
-                                    with Image.open(image_bytes_io) as img:
-                                        width_px, height_px = img.size
-                                        aspect_ratio = width_px / height_px
-                                    image_bytes_io.seek(0)
-                                except Exception:
-                                    aspect_ratio = 0.5
-
-                                # Landscape Page Dimensions
-                                PAGE_WIDTH_AVAIL = 9.0
-                                # CHANGED: Reduced max height to 5.5 to prevent truncation
-                                PAGE_HEIGHT_AVAIL = 5.5
-                                PAGE_ASPECT = PAGE_WIDTH_AVAIL / PAGE_HEIGHT_AVAIL
-
-                                # Create Landscape Section
-                                section = document.add_section(WD_SECTION.NEW_PAGE)
-                                section.orientation = WD_ORIENT.LANDSCAPE
-                                section.page_width = Inches(11.0) # Standard Letter Landscape
-                                section.page_height = Inches(8.5)
-                                section.left_margin = Inches(0.5)
-                                section.right_margin = Inches(0.5)
-                                section.top_margin = Inches(0.5)
-                                section.bottom_margin = Inches(0.5)
-
-                                p = document.add_paragraph()
-                                p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                                r = p.add_run()
-
-                                if aspect_ratio > PAGE_ASPECT:
-                                    r.add_picture(image_bytes_io, width=Inches(PAGE_WIDTH_AVAIL))
-                                else:
-                                    r.add_picture(image_bytes_io, height=Inches(PAGE_HEIGHT_AVAIL))
-
-                                # Restore Portrait
-                                next_section = document.add_section(WD_SECTION.NEW_PAGE)
-                                next_section.orientation = WD_ORIENT.PORTRAIT
-                                next_section.page_width = Inches(8.5)
-                                next_section.page_height = Inches(11.0)
-                                next_section.left_margin = Inches(1.0)
-                                next_section.right_margin = Inches(1.0)
-                                # --- END SMART SCALING ---
-
-                            except Exception as e:
-                                logging.error(f"Failed to render DOT diagram for docx: {e}")
-                                self._add_styled_paragraph(document, f"[Error rendering DOT diagram: {e}]", 'Code Block')
-                        else:
-                            style_name = 'Code Block'
-                            self._add_styled_paragraph(document, code_text, style_name)
-
-                    elif tag.name == 'hr':
-                        document.add_page_break()
+                blocks = list(iter_markdown_blocks(content))
+
+                # Start every diagram rendering at once; the emitter then picks them up in order.
+                prerender_dot_blocks([
+                    block.text for block in blocks if block.kind == BLOCK_CODE and is_dot_source(block.text)
+                ])
+
+                MarkdownDocxEmitter(document, add_diagram=self._add_dot_diagram).emit(blocks)
 
             except Exception as e:
-                logging.error(f"Fatal error during Markdown-to-HTML parsing: {e}")
+                logging.error(f"Fatal error during Markdown-to-DOCX conversion: {e}")
                 self._add_styled_paragraph(document, content, 'Normal')
 
         doc_buffer = BytesIO()
@@ -419,75 +400,61 @@ class ReportGeneratorAgent:
 
         return "".join(md_parts)
 
-    def generate_backlog_xlsx(self, backlog_data: list) -> BytesIO:
+    def generate_backlog_xlsx(self, backlog_data: Iterable[dict]) -> BytesIO:
         """
         Generates an .xlsx file for the full project backlog.
 
         Args:
-            backlog_data (list): The hierarchical list of backlog item dictionaries.
+            backlog_data: The hierarchical list of backlog item dictionaries, or
+                a flat iterable of items that already carry a 'hierarchical_id'
+                (e.g. a generator over a filtered DB query). Flat input is
+                streamed into the workbook without being held in memory.
 
         Returns:
             BytesIO: An in-memory byte stream of the generated .xlsx file.
         """
-        flat_list = []
+        def to_row(item, fallback_id):
+            timestamp_str = item.get('last_modified_timestamp') or item.get('creation_timestamp')
+            return [
+                item.get('hierarchical_id', fallback_id),
+                item.get('title', 'N/A'),
+                (item.get('request_type') or 'N/A').replace('_', ' ').title(),
+                item.get('status', 'N/A'),
+                item.get('priority') or item.get('impact_rating') or '',
+                item.get('complexity', ''),
+                format_timestamp_for_display(timestamp_str)
+            ]
 
         def flatten_hierarchy(items, prefix=""):
             for i, item in enumerate(items, 1):
                 current_prefix = f"{prefix}{i}"
-
-                timestamp_str = item.get('last_modified_timestamp') or item.get('creation_timestamp')
-                formatted_date = format_timestamp_for_display(timestamp_str)
-
-                record = {
-                    '#': item.get('hierarchical_id', current_prefix),
-                    'Title': item.get('title', 'N/A'),
-                    'Type': item.get('request_type', 'N/A').replace('_', ' ').title(),
-                    'Status': item.get('status', 'N/A'),
-                    'Priority/Severity': item.get('priority') or item.get('impact_rating') or '',
-                    'Complexity': item.get('complexity', ''),
-                    'Last Modified': formatted_date
-                }
-                flat_list.append(record)
-
+                yield to_row(item, current_prefix)
                 if "features" in item:
-                    flatten_hierarchy(item["features"], prefix=f"{current_prefix}.")
+                    yield from flatten_hierarchy(item["features"], prefix=f"{current_prefix}.")
                 if "user_stories" in item:
-                    flatten_hierarchy(item["user_stories"], prefix=f"{current_prefix}.")
-
-        # If the data is already flat (e.g. from a filter), we might need different handling.
-        # But assuming the orchestrator provides a hierarchical or somewhat structured list.
-        if backlog_data and 'hierarchical_id' in backlog_data[0]:
-            # Already flattened?
-             for item in backlog_data:
-                timestamp_str = item.get('last_modified_timestamp') or item.get('creation_timestamp')
-                formatted_date = format_timestamp_for_display(timestamp_str)
-                record = {
-                    '#': item.get('hierarchical_id', f"CR-{item.get('cr_id', 'N/A')}"),
-                    'Title': item.get('title', 'N/A'),
-                    'Type': item.get('request_type', 'N/A').replace('_', ' ').title(),
-                    'Status': item.get('status', 'N/A'),
-                    'Priority/Severity': item.get('priority') or item.get('impact_rating') or '',
-                    'Complexity': item.get('complexity', ''),
-                    'Last Modified': formatted_date
-                }
-                flat_list.append(record)
+                    yield from flatten_hierarchy(item["user_stories"], prefix=f"{current_prefix}.")
+
+        def flat_rows(first_item, remaining_items):
+            yield to_row(first_item, f"CR-{first_item.get('cr_id', 'N/A')}")
+            for item in remaining_items:
+                yield to_row(item, f"CR-{item.get('cr_id', 'N/A')}")
+
+        # Flat input (e.g. from a filter) already carries hierarchical IDs; otherwise number the hierarchy here.
+        items = iter(backlog_data or [])
+        first_item = next(items, None)
+        if first_item is None:
+            rows = iter(())
+        elif 'hierarchical_id' in first_item:
+            rows = flat_rows(first_item, items)
         else:
-            flatten_hierarchy(backlog_data)
-
-        if not flat_list:
-            flat_list.append({'#': "No items match filter criteria.", 'Title': '', 'Type': '', 'Status': '', 'Priority/Severity': '', 'Complexity': '', 'Last Modified': ''})
-
-        df = pd.DataFrame(flat_list)
+            rows = flatten_hierarchy(itertools.chain([first_item], items))
 
-        # Save dataframe to an in-memory buffer
         output_buffer = BytesIO()
-        with pd.ExcelWriter(output_buffer, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Project Backlog')
-            # Access the workbook and worksheet to apply the watermark
-            workbook = writer.book
-            worksheet = writer.sheets['Project Backlog']
-            worksheet.oddFooter.center.text = "Generated by Klyve AI Automated Software Factory"
-
+        write_xlsx(
+            output_buffer, 'Project Backlog', BACKLOG_XLSX_COLUMNS, rows,
+            empty_row=["No items match filter criteria.", '', '', '', '', '', ''],
+            footer=WATERMARK_FOOTER
+        )
         output_buffer.seek(0)
         return output_buffer
 
@@ -607,6 +574,8 @@ class ReportGeneratorAgent:
         Generates a formatted .docx file for the Requirements Traceability report,
         using the central styled template.
         """
+        from docx.enum.section import WD_ORIENT
+        from docx.shared import Inches
         logging.info(f"Generating DOCX for traceability report (styled) for project: {project_name}")
         document = self._get_styled_document()
 
@@ -686,6 +655,8 @@ class ReportGeneratorAgent:
         Generates the Project Health Snapshot .docx file, embedding Plotly charts
         into the styled template. (Phase 2 Final)
         """
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx.shared import Inches
         logging.info(f"Generating Project Pulse DOCX (Plotly) for project: {project_name}")
         document = self._get_styled_document()
 
@@ -798,6 +769,8 @@ class ReportGeneratorAgent:
         Generates a formatted .docx file for the Complexity & Risk Assessment report.
         Safe for Nuitka builds (handles missing Plotly).
         """
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx.shared import Inches, Pt
         document = self._get_styled_document()
         title = f"Delivery Automation Risk Assessment: {project_name}"
 
@@ -950,91 +923,52 @@ class ReportGeneratorAgent:
         doc_buffer.seek(0)
         return doc_buffer
 
-    def generate_traceability_xlsx(self, trace_data: list, project_name: str) -> BytesIO:
+    @staticmethod
+    def _trace_rows(trace_data: Iterable[dict]):
+        for item in trace_data:
+            yield [
+                item.get("backlog_id", "N/A"),
+                item.get("backlog_title", "N/A"),
+                item.get("backlog_status", "N/A"),
+                item.get("artifact_path", "N/A"),
+                item.get("artifact_name", "N/A")
+            ]
+
+    def generate_traceability_xlsx(self, trace_data: Iterable[dict], project_name: str) -> BytesIO:
         """
         Generates a formatted .xlsx file for the Requirements Traceability report.
+        Rows are streamed into the workbook, so trace_data may be a generator.
         """
         logging.info(f"Generating XLSX for traceability report for project: {project_name}")
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Traceability Matrix"
-
-        # --- Headers ---
-        headers = ['Backlog Item (#)', 'Title', 'Status', 'Artifact Path', 'Artifact Name']
-        ws.append(headers)
-
-        # Apply bold font to header row
-        for cell in ws["1:1"]:
-            cell.font = Font(bold=True)
-
-        # --- Data ---
-        if not trace_data:
-            ws.append(["No traceability data available for this project."])
-        else:
-            for item in trace_data:
-                ws.append([
-                    item.get("backlog_id", "N/A"),
-                    item.get("backlog_title", "N/A"),
-                    item.get("backlog_status", "N/A"),
-                    item.get("artifact_path", "N/A"),
-                    item.get("artifact_name", "N/A")
-                ])
-
-        # Adjust column widths
-        ws.column_dimensions['A'].width = 18
-        ws.column_dimensions['B'].width = 50
-        ws.column_dimensions['C'].width = 20
-        ws.column_dimensions['D'].width = 60
-        ws.column_dimensions['E'].width = 30
-
-        # Save to in-memory buffer
         xlsx_buffer = BytesIO()
-        wb.save(xlsx_buffer)
+        write_xlsx(
+            xlsx_buffer, "Traceability Matrix", TRACE_XLSX_COLUMNS, self._trace_rows(trace_data or []),
+            empty_row=["No traceability data available for this project."]
+        )
         xlsx_buffer.seek(0)
         return xlsx_buffer
 
-    def generate_sprint_deliverables_xlsx(self, sprint_id: str, report_data: list) -> BytesIO:
+    def generate_sprint_deliverables_xlsx(self, sprint_id: str, report_data: Iterable[dict]) -> BytesIO:
         """
         Generates an .xlsx file listing backlog items and linked artifacts for a sprint.
+        Rows are streamed into the workbook, so report_data may be a generator.
         """
         logging.info(f"ReportGenerator: Generating sprint deliverables XLSX for sprint {sprint_id}")
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Sprint Deliverables"
-
-        headers = ['Backlog Item (#)', 'Title', 'Status', 'Artifact Path', 'Artifact Name']
-        ws.append(headers)
-        for cell in ws["1:1"]:
-            cell.font = Font(bold=True)
-
-        if not report_data:
-            ws.append(["No deliverables found or tracked for this sprint."])
-        else:
-            for item in report_data:
-                ws.append([
-                    item.get("backlog_id", "N/A"),
-                    item.get("backlog_title", "N/A"),
-                    item.get("backlog_status", "N/A"),
-                    item.get("artifact_path", "N/A"),
-                    item.get("artifact_name", "N/A")
-                ])
-
-        # Adjust column widths
-        ws.column_dimensions['A'].width = 18
-        ws.column_dimensions['B'].width = 50
-        ws.column_dimensions['C'].width = 20
-        ws.column_dimensions['D'].width = 60
-        ws.column_dimensions['E'].width = 30
-
         xlsx_buffer = BytesIO()
-        wb.save(xlsx_buffer)
+        write_xlsx(
+            xlsx_buffer, "Sprint Deliverables", TRACE_XLSX_COLUMNS, self._trace_rows(report_data or []),
+            empty_row=["No deliverables found or tracked for this sprint."]
+        )
         xlsx_buffer.seek(0)
         return xlsx_buffer
 
     def generate_burndown_chart_image(self, burndown_data: dict) -> BytesIO:
         """
         Generates a PNG image of the complexity point burndown chart using Plotly.
-        (Placeholder implementation - needs refinement based on actual data structure)
+
+        Args:
+            burndown_data: {'sprint_id', 'total', 'dates': [...], 'remaining': [...]},
+                the remaining complexity points at the end of each sprint day.
         """
         logging.info(f"ReportGenerator: Generating Plotly burndown chart for sprint {burndown_data.get('sprint_id')}")
 
@@ -1046,13 +980,10 @@ class ReportGeneratorAgent:
         # End fix
 
         try:
-            # --- Placeholder Chart Logic ---
-            # Assumes burndown_data has keys like 'total', 'remaining_per_step': [total, points_step1, points_step2,...]
             total_points = burndown_data.get('total', 0)
-            # For this example, let's simulate a simple burndown
-            steps = list(range(5)) # Simulate 5 tasks/days
-            remaining = [total_points, total_points*0.8, total_points*0.5, total_points*0.2, 0] # Example data
-            ideal_line = [total_points * (1 - (i / (len(steps)-1 if len(steps) > 1 else 1))) for i in steps]
+            steps = burndown_data.get('dates') or ['Start']
+            remaining = burndown_data.get('remaining') or [total_points]
+            ideal_line = [total_points * (1 - (i / (len(steps)-1 if len(steps) > 1 else 1))) for i in range(len(steps))]
 
             fig = go.Figure()
 
@@ -1077,7 +1008,7 @@ class ReportGeneratorAgent:
 
             fig.update_layout(
                 title=f"Sprint Burndown ({burndown_data.get('sprint_id', 'N/A')})",
-                xaxis_title="Tasks Completed (Sequence)",
+                xaxis_title="Date",
                 yaxis_title="Remaining Complexity Points",
                 yaxis_range=[0, total_points * 1.05], # Set y-axis to start at 0
                 template="plotly_dark"
@@ -1089,12 +1020,13 @@ class ReportGeneratorAgent:
             logging.error(f"Failed to generate burndown chart image: {e}", exc_info=True)
             # Re-raise the exception to be handled by the caller
             raise
-        # --- End Placeholder ---
 
     def generate_cfd_chart_image(self, cfd_data: dict) -> BytesIO:
         """
         Generates a PNG image of the Cumulative Flow Diagram using Plotly.
-        (Placeholder implementation - needs historical data)
+
+        Args:
+            cfd_data: {'dates': [d1, d2, ...], <status>: [count per date], ...}.
         """
         logging.info("ReportGenerator: Generating Plotly CFD chart image.")
 
@@ -1106,16 +1038,8 @@ class ReportGeneratorAgent:
         # End fix
 
         try:
-            # --- Placeholder Chart Logic ---
-            # Assumes cfd_data contains historical counts per status per day/event
-            # Example data structure: {'dates': [d1, d2, d3], 'TO_DO': [10, 8, 5], 'IN_PROGRESS': [0, 2, 3], 'COMPLETED': [0, 0, 2]}
-            dates = ['Day 1', 'Day 2', 'Day 3', 'Day 4', 'Day 5']
-            statuses = {
-                'TO_DO': [10, 8, 5, 5, 2],
-                'ANALYZED': [0, 1, 2, 1, 1],
-                'IN_PROGRESS': [0, 2, 3, 4, 3],
-                'COMPLETED': [0, 0, 2, 2, 6]
-            }
+            dates = cfd_data.get('dates', [])
+            statuses = {status: values for status, values in cfd_data.items() if status != 'dates'}
 
             fig = go.Figure()
 
@@ -1144,12 +1068,14 @@ class ReportGeneratorAgent:
         except Exception as e:
             logging.error(f"Failed to generate CFD chart image: {e}", exc_info=True)
             raise
-        # --- End Placeholder ---
 
     def generate_quality_trend_chart_image(self, trend_data: dict) -> BytesIO:
         """
         Generates a PNG image of the Code Quality Trend chart using Plotly.
-        (Placeholder implementation - needs historical data)
+
+        Args:
+            trend_data: {'dates': [...], 'PASSED': [...], 'FAILED': [...], 'NOT_TESTED': [...]},
+                the number of code components in each test state at the end of each date.
         """
         logging.info("ReportGenerator: Generating Plotly code quality trend chart image.")
 
@@ -1161,13 +1087,10 @@ class ReportGeneratorAgent:
         # End fix
 
         try:
-            # --- Placeholder Chart Logic ---
-            # Assumes trend_data contains snapshots over time/sprints
-            # Example: {'sprints': ['S1', 'S2', 'S3'], 'PASSED': [5, 8, 12], 'FAILED': [2, 1, 0], 'NOT_TESTED': [3, 1, 0]}
-            sprints = ['Sprint 1', 'Sprint 2', 'Sprint 3']
-            passed = [5, 8, 12]
-            failed = [2, 1, 0]
-            not_tested = [3, 1, 0]
+            sprints = trend_data.get('dates', [])
+            passed = trend_data.get('PASSED', [])
+            failed = trend_data.get('FAILED', [])
+            not_tested = trend_data.get('NOT_TESTED', [])
 
             fig = go.Figure()
 
@@ -1198,9 +1121,9 @@ class ReportGeneratorAgent:
 
             fig.update_layout(
                 title="Code Quality Trend (Unit Test Status)",
-                xaxis_title="Sprint",
+                xaxis_title="Date",
                 yaxis_title="Number of Components",
-                yaxis_range=[0, max(passed + failed + not_tested) * 1.05], # Start y-axis at 0
+                yaxis_range=[0, max(passed + failed + not_tested, default=0) * 1.05 or 1], # Start y-axis at 0
                 template="plotly_dark",
                 legend_title_text="Test Status"
             )
@@ -1210,7 +1133,6 @@ class ReportGeneratorAgent:
         except Exception as e:
             logging.error(f"Failed to generate code quality trend chart image: {e}", exc_info=True)
             raise
-        # --- End Placeholder ---
 
     def generate_ai_assistance_report(self, assistance_data: dict) -> BytesIO:
         """
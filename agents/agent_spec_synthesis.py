@@ -8,6 +8,7 @@ import os
 import subprocess
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 # Add parent directory to path to locate watermarker
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from watermarker import apply_watermark
@@ -18,8 +19,140 @@ from llm_service import LLMService, parse_llm_json
 from klyve_db_manager import KlyveDBManager
 from agents.agent_report_generator import ReportGeneratorAgent
 from master_orchestrator import MasterOrchestrator
+from keyword_matcher import KeywordMatcher
+from content_scanner import format_hits, read_heads, scan_files
 import vault
 
+# Keywords are matched as whole words ('vue' does not match 'revue'); each
+# matcher scans a file once for all of its keywords.
+DB_KEYWORDS = [
+    # Python ORM/Database Libraries
+    'sqlalchemy', 'sqlite3', 'psycopg2', 'pymongo', 'pymysql', 'mysqlclient',
+    'django.db', 'peewee', 'tortoise', 'pony.orm', 'sqlmodel', 'databases',
+    'asyncpg', 'motor', 'redis.py', 'cassandra-driver', 'cx_oracle',
+    'pyodbc', 'aiomysql', 'aiopg',
+
+    # JavaScript/TypeScript ORM/Database Libraries
+    'mongoose', 'sequelize', 'knex', 'typeorm', 'prisma', 'mongodb',
+    'pg', 'mysql2', 'better-sqlite3', 'node-postgres', 'bookshelf',
+    'objection', 'waterline', 'mikro-orm', 'drizzle', 'kysely',
+
+    # Java Database Libraries
+    'jdbc', 'hibernate', 'jpa', 'mybatis', 'spring.data', 'jdbctemplate',
+    'connection.preparestatement', 'entitymanager', 'repository',
+
+    # .NET Database Libraries
+    'system.data.sqlclient', 'entityframeworkcore', 'entityframework',
+    'dapper', 'nhibernate', 'ado.net', 'microsoft.data.sqlclient',
+    'system.data.sqlite', 'npgsql', 'mysql.data',
+
+    # Go Database Libraries
+    'database/sql', 'gorm', 'sqlx', 'pgx', 'go-redis', 'mongo-go-driver',
+    'db.query', 'db.exec',
+
+    # Rust Database Libraries
+    'diesel', 'sqlx', 'tokio-postgres', 'rusqlite', 'sea-orm',
+
+    # PHP Database Libraries
+    'mysqli', 'pdo', 'eloquent', 'doctrine', 'propel',
+
+    # Ruby Database Libraries
+    'activerecord', 'sequel', 'datamapper', 'mongoid',
+
+    # Python async database
+    'tortoise-orm', 'piccolo', 'encode/databases',
+
+    # Cloud/Managed Database Services
+    'dynamodb', 'cosmosdb', 'firestore', 'supabase', 'planetscale',
+    'aws.rds', 'azure.sql', 'cloudsql',
+
+    # NoSQL Databases
+    'mongodb', 'cassandra', 'couchdb', 'neo4j', 'redis', 'memcached',
+    'elasticsearch', 'influxdb', 'timescaledb', 'clickhouse',
+
+    # SQL Keywords (case-insensitive matches)
+    'create table', 'create database', 'alter table', 'drop table',
+    'select ', 'select*', 'from ', 'where ', 'join ',
+    'insert into', 'update ', 'delete from',
+    'group by', 'order by', 'having ',
+    'inner join', 'left join', 'right join', 'outer join',
+    'primary key', 'foreign key', 'unique constraint',
+    'create index', 'begin transaction', 'commit', 'rollback',
+
+    # Database Connection Patterns
+    'database', 'dbconnection', 'sqlconnection', 'connection.open',
+    'connection.close', 'createconnection', 'getconnection',
+    'connectionstring', 'datasource', 'db.connect', 'connectdb',
+
+    # Query Builders
+    'query(', 'execute(', 'executesql', 'rawquery', 'queryraw',
+    'prepared statement', 'preparestatement', 'executemany',
+
+    # Migration Tools
+    'alembic', 'flyway', 'liquibase', 'knex migrate', 'prisma migrate',
+    'rails db:migrate', 'django.db.migrations',
+
+    # Database Schema
+    'schema.', 'model.', 'entity.', 'table.', 'collection.',
+    '@entity', '@table', '@column', 'models.model',
+
+    # Connection Pools
+    'connection pool', 'pooling', 'dbpool', 'hikaricp', 'c3p0',
+
+    # Specific Database Clients
+    'pg.client', 'pg.pool', 'mysql.createconnection', 'sqlite.database',
+    'mongoclient', 'redisclient', 'cassandraclient',
+
+    # Transaction Management
+    'begintransaction', 'committransaction', 'session.commit',
+    'transaction.rollback', 'with transaction', 'db.transaction',
+
+    # Common Database File Extensions (for file-based DBs)
+    '.db', '.sqlite', '.sqlite3', '.mdb', '.accdb',
+
+    # iOS (Swift/Objective-C)
+    'coredata', 'fmdb', 'realm', 'sqlite3.h', 'nscoredata', 'nsfetchrequest',
+    'nsmanagedcontext', 'grdb', 'sqlcipher',
+
+    # Android (Java/Kotlin)
+    'room', 'sqlitedatabase', 'contentprovider', 'contentresolver',
+    'roomdatabase', 'android.database', 'sqliteopenhelper', 'rawquery',
+    'realm.android', 'greendao', 'objectbox',
+
+    # Flutter/Dart
+    'sqflite', 'drift', 'moor', 'hive', 'isar', 'sembast',
+
+    # React Native
+    'realm-react', 'asyncstorage', 'watermelondb', 'expo-sqlite',
+
+    # C/C++ Database Libraries
+    'libpq', 'libmysqlclient', 'sqlite3_', 'odbc', 'sqlapi',
+    'ocilib', 'soci', 'otl', 'mysql_', 'pqxx', 'rocksdb',
+    'leveldb', 'lmdb', 'berkeleydb', 'unixodbc',
+]
+DB_KEYWORD_MATCHER = KeywordMatcher({"database": DB_KEYWORDS}, whole_words=True)
+
+UI_KEYWORDS = [
+    # Python
+    'pyside6', 'pyqt5', 'tkinter', 'kivy', 'wxpython',
+    # JS/TS Frameworks
+    'react', 'angular', 'vue', 'svelte',
+    # .NET
+    'wpf', 'winforms', 'avalonia', 'maui',
+    # Java
+    'javafx', 'swing',
+    # General
+    'user interface', 'gui'
+]
+UI_KEYWORD_MATCHER = KeywordMatcher({"ui": UI_KEYWORDS}, whole_words=True)
+
+# Bounds on the file content handed to the DB schema prompt.
+SCHEMA_FILE_MAX_CHARS = 200_000
+DB_EVIDENCE_HITS_PER_FILE = 5
+
+# One worker per independent brownfield spec (Application, Technical, UX/UI, DB Schema).
+SPEC_SYNTHESIS_WORKERS = 4
+
 
 class SpecSynthesisAgent:
     """
@@ -45,7 +178,9 @@ class SpecSynthesisAgent:
 
         Returns:
             A tuple containing the stage of detection ('SCHEMA_FILE', 'KEYWORD')
-            or None, and a dictionary mapping file paths to their content.
+            or None, and a dictionary mapping file paths to their content: the
+            (size-capped) schema files, or the keyword hits with their
+            surrounding lines for source files.
         """
         logging.info("Starting 3-stage database usage detection...")
 
@@ -57,116 +192,12 @@ class SpecSynthesisAgent:
 
         if schema_files:
             logging.info(f"DB Detection Stage 1: Found {len(schema_files)} dedicated schema file(s).")
-            file_content = {str(p.relative_to(project_root)): p.read_text(encoding='utf-8', errors='ignore') for p in schema_files}
+            file_content = {str(p.relative_to(project_root)): content
+                            for p, content in read_heads(sorted(schema_files), SCHEMA_FILE_MAX_CHARS).items()}
             return "SCHEMA_FILE", file_content
 
         # Stage 2: Keyword Heuristic Analysis [cite: 199]
         logging.info("DB Detection Stage 2: Searching for database keywords in source files...")
-        db_keywords = [
-            # Python ORM/Database Libraries
-            'sqlalchemy', 'sqlite3', 'psycopg2', 'pymongo', 'pymysql', 'mysqlclient',
-            'django.db', 'peewee', 'tortoise', 'pony.orm', 'sqlmodel', 'databases',
-            'asyncpg', 'motor', 'redis.py', 'cassandra-driver', 'cx_oracle',
-            'pyodbc', 'aiomysql', 'aiopg',
-
-            # JavaScript/TypeScript ORM/Database Libraries
-            'mongoose', 'sequelize', 'knex', 'typeorm', 'prisma', 'mongodb',
-            'pg', 'mysql2', 'better-sqlite3', 'node-postgres', 'bookshelf',
-            'objection', 'waterline', 'mikro-orm', 'drizzle', 'kysely',
-
-            # Java Database Libraries
-            'jdbc', 'hibernate', 'jpa', 'mybatis', 'spring.data', 'jdbctemplate',
-            'connection.preparestatement', 'entitymanager', 'repository',
-
-            # .NET Database Libraries
-            'system.data.sqlclient', 'entityframeworkcore', 'entityframework',
-            'dapper', 'nhibernate', 'ado.net', 'microsoft.data.sqlclient',
-            'system.data.sqlite', 'npgsql', 'mysql.data',
-
-            # Go Database Libraries
-            'database/sql', 'gorm', 'sqlx', 'pgx', 'go-redis', 'mongo-go-driver',
-            'db.query', 'db.exec',
-
-            # Rust Database Libraries
-            'diesel', 'sqlx', 'tokio-postgres', 'rusqlite', 'sea-orm',
-
-            # PHP Database Libraries
-            'mysqli', 'pdo', 'eloquent', 'doctrine', 'propel',
-
-            # Ruby Database Libraries
-            'activerecord', 'sequel', 'datamapper', 'mongoid',
-
-            # Python async database
-            'tortoise-orm', 'piccolo', 'encode/databases',
-
-            # Cloud/Managed Database Services
-            'dynamodb', 'cosmosdb', 'firestore', 'supabase', 'planetscale',
-            'aws.rds', 'azure.sql', 'cloudsql',
-
-            # NoSQL Databases
-            'mongodb', 'cassandra', 'couchdb', 'neo4j', 'redis', 'memcached',
-            'elasticsearch', 'influxdb', 'timescaledb', 'clickhouse',
-
-            # SQL Keywords (case-insensitive matches)
-            'create table', 'create database', 'alter table', 'drop table',
-            'select ', 'select*', 'from ', 'where ', 'join ',
-            'insert into', 'update ', 'delete from',
-            'group by', 'order by', 'having ',
-            'inner join', 'left join', 'right join', 'outer join',
-            'primary key', 'foreign key', 'unique constraint',
-            'create index', 'begin transaction', 'commit', 'rollback',
-
-            # Database Connection Patterns
-            'database', 'dbconnection', 'sqlconnection', 'connection.open',
-            'connection.close', 'createconnection', 'getconnection',
-            'connectionstring', 'datasource', 'db.connect', 'connectdb',
-
-            # Query Builders
-            'query(', 'execute(', 'executesql', 'rawquery', 'queryraw',
-            'prepared statement', 'preparestatement', 'executemany',
-
-            # Migration Tools
-            'alembic', 'flyway', 'liquibase', 'knex migrate', 'prisma migrate',
-            'rails db:migrate', 'django.db.migrations',
-
-            # Database Schema
-            'schema.', 'model.', 'entity.', 'table.', 'collection.',
-            '@entity', '@table', '@column', 'models.model',
-
-            # Connection Pools
-            'connection pool', 'pooling', 'dbpool', 'hikaricp', 'c3p0',
-
-            # Specific Database Clients
-            'pg.client', 'pg.pool', 'mysql.createconnection', 'sqlite.database',
-            'mongoclient', 'redisclient', 'cassandraclient',
-
-            # Transaction Management
-            'begintransaction', 'committransaction', 'session.commit',
-            'transaction.rollback', 'with transaction', 'db.transaction',
-
-            # Common Database File Extensions (for file-based DBs)
-            '.db', '.sqlite', '.sqlite3', '.mdb', '.accdb',
-
-            # iOS (Swift/Objective-C)
-            'coredata', 'fmdb', 'realm', 'sqlite3.h', 'nscoredata', 'nsfetchrequest',
-            'nsmanagedcontext', 'grdb', 'sqlcipher',
-
-            # Android (Java/Kotlin)
-            'room', 'sqlitedatabase', 'contentprovider', 'contentresolver',
-            'roomdatabase', 'android.database', 'sqliteopenhelper', 'rawquery',
-            'realm.android', 'greendao', 'objectbox',
-
-            # Flutter/Dart
-            'sqflite', 'drift', 'moor', 'hive', 'isar', 'sembast',
-
-            # React Native
-            'realm-react', 'asyncstorage', 'watermelondb', 'expo-sqlite',
-
-            # C/C++ Database Libraries
-            'libpq', 'libmysqlclient', 'sqlite3_', 'odbc', 'sqlapi',
-            'ocilib', 'soci', 'otl', 'mysql_', 'pqxx', 'rocksdb',
-            'leveldb', 'lmdb', 'berkeleydb', 'unixodbc',
-        ]
         source_extensions = [
             # Backend Languages (most likely to have DB code)
             '.py',      # Python
@@ -243,18 +274,19 @@ class SpecSynthesisAgent:
             '.gradle',      # Gradle (may have DB dependencies)
             '.sbt',         # SBT (Scala Build Tool)
         ]
-        candidate_files = {}
-
+        source_files = []
         for dirpath, _, filenames in os.walk(project_root):
             for filename in filenames:
                 file_path = Path(dirpath) / filename
                 if file_path.suffix.lower() in source_extensions:
-                    try:
-                        content = file_path.read_text(encoding='utf-8', errors='ignore')
-                        if any(keyword in content.lower() for keyword in db_keywords):
-                            candidate_files[str(file_path.relative_to(project_root))] = content
-                    except Exception as e:
-                        logging.warning(f"Could not read file {file_path} during DB keyword scan: {e}")
+                    source_files.append(file_path)
+
+        # Each file is read in chunks until its first few hits; only those hits and their surrounding lines are kept.
+        candidate_files = {
+            str(file_path.relative_to(project_root)): format_hits(hits)
+            for file_path, hits in scan_files(sorted(source_files), DB_KEYWORD_MATCHER,
+                                              max_hits=DB_EVIDENCE_HITS_PER_FILE).items()
+        }
 
         if candidate_files:
             logging.info(f"DB Detection Stage 2: Found {len(candidate_files)} candidate file(s) with keywords.")
@@ -402,10 +434,16 @@ class SpecSynthesisAgent:
 
         return final_spec
 
-    def synthesize_all_specs(self, project_id: str):
+    def synthesize_all_specs(self, project_id: str, concurrent: bool = True):
         """
         Orchestrates the generation of all relevant specification documents,
         now with conditional logic for UX/UI and Database Schema specs, and template support.
+
+        With concurrent=True the Application, Technical, UX/UI and Database
+        Schema specs (and the UI/DB detections they depend on) are generated in
+        parallel, so the synthesis takes about as long as the slowest spec.
+        Files and database fields are still written in the same order as in
+        the sequential mode.
         """
         logging.info(f"Starting specification synthesis for project {project_id}.")
 
@@ -443,43 +481,80 @@ class SpecSynthesisAgent:
                     logging.warning(f"Could not load template '{template_name}': {e}")
                 return None
 
-            # Generate App Spec with template
             app_spec_template = get_template("Default Application Specification")
-            app_spec = self._generate_spec(summaries_context, "Application", project_name, template_content=app_spec_template)
-            self._save_and_update_spec(project_id, app_spec, "Application Specification", "application_spec", "final_spec_text", docs_dir, project_name)
-
-            # Generate Tech Spec with template
             tech_spec_template = get_template("Default Technical Specification")
-            tech_spec = self._generate_spec(summaries_context, "Technical", project_name, template_content=tech_spec_template)
-            self._save_and_update_spec(project_id, tech_spec, "Technical Specification", "technical_spec", "tech_spec_text", docs_dir, project_name)
-
-            # Now that tech spec exists, detect and save all technologies
+            ux_spec_template = get_template("Default UX/UI Specification")
+
+            # The four spec jobs only read the summaries and the project files, so they
+            # can run side by side; their results are committed below in a fixed order.
+            def generate_app_spec():
+                return self._generate_spec(summaries_context, "Application", project_name, template_content=app_spec_template)
+
+            def generate_tech_spec():
+                tech_spec = self._generate_spec(summaries_context, "Technical", project_name, template_content=tech_spec_template)
+                return tech_spec, self.orchestrator.detect_technologies_in_spec(tech_spec)
+
+            def generate_ux_spec():
+                has_ui = self._detect_ui_presence(all_artifacts, project_root)
+                if not has_ui:
+                    return False, None
+                return True, self._generate_spec(summaries_context, "UX/UI", project_name, template_content=ux_spec_template)
+
+            def generate_db_schema_spec():
+                detection_stage, db_files_content = self._detect_database_usage(project_root)
+                if not db_files_content:
+                    return None
+                return self._generate_db_schema_spec(detection_stage, db_files_content, project_name)
+
+            jobs = {
+                "application": generate_app_spec,
+                "technical": generate_tech_spec,
+                "ux_ui": generate_ux_spec,
+                "db_schema": generate_db_schema_spec,
+            }
+            executor = ThreadPoolExecutor(max_workers=SPEC_SYNTHESIS_WORKERS, thread_name_prefix="spec-synthesis") if concurrent else None
             try:
-                technologies = self.orchestrator.detect_technologies_in_spec(tech_spec)
-                if technologies:
-                    self.db_manager.update_project_field(project_id, "detected_technologies", json.dumps(technologies))
-                    logging.info(f"Detected and saved technologies for brownfield project: {technologies}")
-            except Exception as e:
-                logging.error(f"Failed to detect technologies during brownfield synthesis: {e}")
-
-            # Conditionally generate UX/UI spec with template
-            has_ui = self._detect_ui_presence(all_artifacts, project_root)
-            self.db_manager.update_project_field(project_id, "is_gui_project", 1 if has_ui else 0)
-            if has_ui:
-                ux_spec_template = get_template("Default UX/UI Specification")
-                ux_spec = self._generate_spec(summaries_context, "UX/UI", project_name, template_content=ux_spec_template)
-                self._save_and_update_spec(project_id, ux_spec, "UX/UI Specification", "ux_ui_spec", "ux_spec_text", docs_dir, project_name)
-            else:
-                logging.info("Skipping UX/UI Specification generation as no UI components were detected.")
-
-            # Conditionally generate Database Schema spec (no template for this one)
-            detection_stage, db_files_content = self._detect_database_usage(project_root)
-            if db_files_content:
-                db_schema_spec = self._generate_db_schema_spec(detection_stage, db_files_content, project_name)
-                self._save_and_update_spec(project_id, db_schema_spec, "Database Schema Specification", "db_schema_spec", "db_schema_spec_text", docs_dir, project_name)
-            else:
-                logging.info("Skipping Database Schema Specification generation as no database usage was detected.")
+                futures = {name: executor.submit(job) for name, job in jobs.items()} if executor else {}
+
+                def result_of(name):
+                    return futures[name].result() if executor else jobs[name]()
+
+                # Generate App Spec with template
+                app_spec = result_of("application")
+                self._save_and_update_spec(project_id, app_spec, "Application Specification", "application_spec", "final_spec_text", docs_dir, project_name)
 
+                # Generate Tech Spec with template
+                tech_spec, technologies = result_of("technical")
+                self._save_and_update_spec(project_id, tech_spec, "Technical Specification", "technical_spec", "tech_spec_text", docs_dir, project_name)
+
+                # Now that tech spec exists, save all detected technologies
+                try:
+                    if technologies:
+                        self.db_manager.update_project_field(project_id, "detected_technologies", json.dumps(technologies))
+                        logging.info(f"Detected and saved technologies for brownfield project: {technologies}")
+                except Exception as e:
+                    logging.error(f"Failed to save detected technologies during brownfield synthesis: {e}")
+
+                # Conditionally generate UX/UI spec with template
+                has_ui, ux_spec = result_of("ux_ui")
+                self.db_manager.update_project_field(project_id, "is_gui_project", 1 if has_ui else 0)
+                if has_ui:
+                    self._save_and_update_spec(project_id, ux_spec, "UX/UI Specification", "ux_ui_spec", "ux_spec_text", docs_dir, project_name)
+                else:
+                    logging.info("Skipping UX/UI Specification generation as no UI components were detected.")
+
+                # Conditionally generate Database Schema spec (no template for this one)
+                db_schema_spec = result_of("db_schema")
+                if db_schema_spec:
+                    self._save_and_update_spec(project_id, db_schema_spec, "Database Schema Specification", "db_schema_spec", "db_schema_spec_text", docs_dir, project_name)
+                else:
+                    logging.info("Skipping Database Schema Specification generation as no database usage was detected.")
+            finally:
+                if executor:
+                    # On failure, drop jobs that have not started; running LLM calls finish in the background.
+                    executor.shutdown(wait=False, cancel_futures=True)
+
+            self.orchestrator._index_spec_sections(project_id)
             logging.info("Specification synthesis complete.")
             return True
 
@@ -557,30 +632,14 @@ class SpecSynthesisAgent:
 
         # Level 2: Content Heuristic Analysis [cite: 2242]
         logging.info("UI Detection Level 2: Searching for UI keywords in source files...")
-        ui_keywords = [
-            # Python
-            'pyside6', 'pyqt5', 'tkinter', 'kivy', 'wxpython',
-            # JS/TS Frameworks
-            'react', 'angular', 'vue', 'svelte',
-            # .NET
-            'wpf', 'winforms', 'avalonia', 'maui',
-            # Java
-            'javafx', 'swing',
-            # General
-            'user interface', 'gui'
-        ]
 
-        for art in all_artifacts:
-            try:
-                # We need the full path to read the file content
-                file_path = project_root / art['file_path']
-                if file_path.exists() and file_path.is_file():
-                    content = file_path.read_text(encoding='utf-8', errors='ignore')
-                    if any(keyword in content.lower() for keyword in ui_keywords):
-                        logging.info(f"UI Detection Level 2: Found UI keyword in '{art['file_path']}'.")
-                        return True
-            except Exception as e:
-                logging.warning(f"Could not read file {art['file_path']} during UI keyword scan: {e}")
+        # We need the full path to read the file content; the scan stops at the first file with a UI keyword.
+        artifact_paths = {project_root / art['file_path']: art['file_path'] for art in all_artifacts}
+        found = scan_files([path for path in artifact_paths if path.is_file()], UI_KEYWORD_MATCHER, stop_at_first=True)
+        if found:
+            file_path, hits = next(iter(found.items()))
+            logging.info(f"UI Detection Level 2: Found UI keyword '{hits[0].keyword}' in '{artifact_paths[file_path]}'.")
+            return True
 
         logging.info("UI Detection Complete: No UI components detected.")
         return False
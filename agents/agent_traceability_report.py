@@ -1,11 +1,37 @@
 # agents/agent_traceability_report.py
 
+import itertools
 import logging
 import json
-from klyve_db_manager import KlyveDBManager
+from klyve_db_manager import KlyveDBManager, TRACE_SOURCE_DEV_PLAN
 # Import MasterOrchestrator to access the hierarchical numbering method
 # from master_orchestrator import MasterOrchestrator
 
+def plan_trace_links(plan_tasks: list) -> list[tuple[int, str]]:
+    """Returns the (cr_id, micro_spec_id) pairs linking the tasks of a parsed plan to the backlog items they implement."""
+    links = set()
+    for task in plan_tasks:
+        if not isinstance(task, dict):
+            continue
+        micro_spec_id = task.get("micro_spec_id")
+        if not micro_spec_id:
+            continue
+        for cr_id in task.get("parent_cr_ids") or []:
+            try:
+                links.add((int(cr_id), str(micro_spec_id)))
+            except (TypeError, ValueError):
+                logging.debug(f"Ignoring non-numeric parent_cr_id '{cr_id}' of task {micro_spec_id}.")
+    return sorted(links)
+
+
+def backlog_id_sort_key(backlog_id: str) -> tuple:
+    """
+    Sort key for hierarchical backlog IDs ("2.10" after "2.9"). Numeric parts
+    compare as numbers; fallback IDs such as "CR-17" sort after all numbered items.
+    """
+    return tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in str(backlog_id).split('.'))
+
+
 class RequirementTraceabilityAgent:
     """
     Agent responsible for gathering data to trace requirements from the backlog
@@ -55,10 +81,36 @@ class RequirementTraceabilityAgent:
             logging.error(f"Unexpected error parsing plan JSON: {e}", exc_info=True)
             return []
 
+    def _index_missing_plans(self, project_id: str):
+        """
+        Records the trace links of any saved plan not yet indexed. Plans are
+        indexed when they are saved; this covers projects whose plans predate
+        the index or were restored from an archive. A plan without links is
+        still marked as indexed, so each plan is parsed only once.
+        """
+        indexed_sources = self.db_manager.get_trace_link_sources(project_id)
+        plan_sources = []
+        if TRACE_SOURCE_DEV_PLAN not in indexed_sources:
+            project_row = self.db_manager.get_project_by_id(project_id)
+            if project_row and project_row['development_plan_text']:
+                plan_sources.append((TRACE_SOURCE_DEV_PLAN, project_row['development_plan_text']))
+        for sprint in self.db_manager.get_all_sprints_for_project(project_id):
+            if sprint['sprint_id'] not in indexed_sources and sprint['sprint_plan_json']:
+                plan_sources.append((sprint['sprint_id'], sprint['sprint_plan_json']))
+
+        for source, plan_json in plan_sources:
+            self.db_manager.replace_trace_links(project_id, source, plan_trace_links(self._parse_plan_json(plan_json)))
+        if plan_sources:
+            logging.debug(f"Indexed trace links for {len(plan_sources)} plan(s) of project {project_id}.")
+
     def generate_trace_data(self, project_id: str) -> list:
         """
         Generates the traceability data by linking backlog items to artifacts.
 
+        The links come from a single indexed join of the backlog, the
+        TraceLinks recorded when plans were saved, and the artifacts written
+        for each task; no plan JSON is parsed here.
+
         Args:
             project_id (str): The ID of the project.
 
@@ -71,93 +123,36 @@ class RequirementTraceabilityAgent:
         trace_results = []
 
         try:
-            # 1. Get full backlog with hierarchical IDs from the orchestrator
-            # We need the orchestrator instance to call this method
-            full_backlog_hierarchy = self.orchestrator._get_backlog_with_hierarchical_numbers()
-            if not full_backlog_hierarchy:
+            self._index_missing_plans(project_id)
+
+            # 1. Hierarchical IDs for every backlog item, from the parent links alone
+            hierarchical_ids = self.orchestrator._get_hierarchical_id_map()
+
+            # 2. One row per (item, artifact); items without artifacts come last in their group
+            rows = self.db_manager.get_trace_matrix_rows(project_id)
+            if not rows:
                 logging.warning("No backlog items found for traceability report.")
                 return []
 
-            # Flatten the hierarchy for easier lookup
-            flat_backlog = {item['cr_id']: item for item in self.orchestrator._flatten_hierarchy(full_backlog_hierarchy)}
-
-            # 2. Get all relevant plan JSONs
-            plan_jsons = self.db_manager.get_all_plan_jsons_for_project(project_id)
-            all_tasks = []
-            if plan_jsons.get('dev_plan'):
-                all_tasks.extend(self._parse_plan_json(plan_jsons['dev_plan']))
-            for sprint_plan in plan_jsons.get('sprint_plans', []):
-                all_tasks.extend(self._parse_plan_json(sprint_plan))
-
-            logging.debug(f"Parsed a total of {len(all_tasks)} tasks from all plans.")
-
-            # 3. Create a map from cr_id to relevant task micro_spec_ids
-            cr_to_micro_spec_ids = {}
-            for task in all_tasks:
-                micro_spec_id = task.get("micro_spec_id")
-                parent_cr_ids = task.get("parent_cr_ids", [])
-                if micro_spec_id and parent_cr_ids:
-                    for cr_id in parent_cr_ids:
-                        if cr_id not in cr_to_micro_spec_ids:
-                            cr_to_micro_spec_ids[cr_id] = set()
-                        cr_to_micro_spec_ids[cr_id].add(micro_spec_id)
-
-            logging.debug(f"Mapped {len(cr_to_micro_spec_ids)} cr_ids to micro_spec_ids.")
-
-            # 4. Get all potentially relevant micro_spec_ids and query artifacts
-            all_relevant_micro_spec_ids = list(set.union(*cr_to_micro_spec_ids.values())) if cr_to_micro_spec_ids else []
-            artifacts = []
-            if all_relevant_micro_spec_ids:
-                artifacts = self.db_manager.get_artifacts_by_micro_spec_ids(project_id, all_relevant_micro_spec_ids)
-
-            # 5. Create a map from micro_spec_id to artifact(s)
-            micro_spec_id_to_artifacts = {}
-            for art in artifacts:
-                ms_id = art['micro_spec_id']
-                if ms_id:
-                    if ms_id not in micro_spec_id_to_artifacts:
-                        micro_spec_id_to_artifacts[ms_id] = []
-                    micro_spec_id_to_artifacts[ms_id].append(dict(art)) # Store as dict
-
-            logging.debug(f"Mapped {len(micro_spec_id_to_artifacts)} micro_spec_ids to {len(artifacts)} artifacts.")
-
-            # 6. Build the final trace results, iterating through the original flat backlog
-            for cr_id, backlog_item in flat_backlog.items():
-                found_artifact = False
-                micro_spec_ids_for_item = cr_to_micro_spec_ids.get(cr_id, set())
-
-                if micro_spec_ids_for_item:
-                    for ms_id in micro_spec_ids_for_item:
-                        linked_artifacts = micro_spec_id_to_artifacts.get(ms_id, [])
-                        if linked_artifacts:
-                            for artifact in linked_artifacts:
-                                trace_results.append({
-                                    'backlog_id': backlog_item.get('hierarchical_id', f'CR-{cr_id}'),
-                                    'backlog_title': backlog_item.get('title', 'N/A'),
-                                    'backlog_status': backlog_item.get('status', 'N/A'),
-                                    'artifact_path': artifact.get('file_path', 'N/A'),
-                                    'artifact_name': artifact.get('artifact_name', 'N/A')
-                                })
-                                found_artifact = True
-                        else:
-                             # Task existed, but no artifact found (maybe skipped or failed?)
-                             pass # We'll add the backlog item row below if no artifacts were ever found
-
+            for cr_id, item_rows in itertools.groupby(rows, key=lambda row: row['cr_id']):
+                item_rows = list(item_rows)
+                backlog_id = hierarchical_ids.get(cr_id, f'CR-{cr_id}')
+                linked = [row for row in item_rows if row['artifact_id'] is not None]
                 # If no artifacts were linked *at all* for this backlog item, add a row indicating that
-                if not found_artifact:
+                for row in linked or item_rows[:1]:
                     trace_results.append({
-                        'backlog_id': backlog_item.get('hierarchical_id', f'CR-{cr_id}'),
-                        'backlog_title': backlog_item.get('title', 'N/A'),
-                        'backlog_status': backlog_item.get('status', 'N/A'),
-                        'artifact_path': 'N/A', # Indicate not implemented
-                        'artifact_name': 'N/A'
+                        'backlog_id': backlog_id,
+                        'backlog_title': row['title'] or 'N/A',
+                        'backlog_status': row['status'] or 'N/A',
+                        'artifact_path': (row['file_path'] or 'N/A') if linked else 'N/A', # Indicate not implemented
+                        'artifact_name': (row['artifact_name'] or 'N/A') if linked else 'N/A'
                     })
 
             logging.info(f"Generated {len(trace_results)} traceability report entries.")
             # Sort results by hierarchical backlog ID for consistent display
-            trace_results.sort(key=lambda x: tuple(map(int, x['backlog_id'].split('.'))) if '.' in x['backlog_id'] else (int(x['backlog_id']),))
+            trace_results.sort(key=lambda x: backlog_id_sort_key(x['backlog_id']))
             return trace_results
 
         except Exception as e:
             logging.error(f"Failed during traceability data generation for project {project_id}: {e}", exc_info=True)
-            return [] # Return empty list on failure
\ No newline at end of file
+            return [] # Return empty list on failure
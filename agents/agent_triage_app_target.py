@@ -6,6 +6,7 @@ from klyve_db_manager import KlyveDBManager
 import textwrap
 import json
 from llm_service import LLMService, parse_llm_json
+from stack_trace_parser import parse_stack_trace_locally
 import vault
 
 class TriageAgent_AppTarget:
@@ -25,12 +26,30 @@ class TriageAgent_AppTarget:
         self.llm_service = llm_service
         self.db_manager = db_manager
 
-    def parse_stack_trace(self, stack_trace_log: str) -> list[str]:
+    def parse_stack_trace(self, stack_trace_log: str, project_root: str = None, project_id: str = None) -> list[str]:
         """
-        Uses an LLM to parse a raw stack trace and extract a list of file paths.
+        Parses a raw stack trace and extracts a list of file paths.
+
+        Python, Node, Java, .NET, Go and Rust traces are parsed locally, with
+        paths resolved against the project root and the RoWD file paths and
+        ranked so project-owned frames nearest the error come first. The LLM
+        is only used when no recognizable frames resolve to project files.
         """
         logging.info("TriageAgent: Performing Tier 1 Analysis - Parsing stack trace.")
 
+        known_file_paths = []
+        if project_id:
+            try:
+                known_file_paths = [row['file_path'] for row in self.db_manager.get_all_artifacts_for_project(project_id) if row['file_path']]
+            except Exception as e:
+                logging.warning(f"Could not load RoWD file paths for stack trace resolution: {e}")
+
+        local_paths = parse_stack_trace_locally(stack_trace_log, project_root=project_root, known_file_paths=known_file_paths)
+        if local_paths is not None:
+            logging.info(f"Stack trace parsed locally; identified {len(local_paths)} relevant project files.")
+            return local_paths
+
+        logging.info("No stack frames resolved to project files. Falling back to LLM stack trace analysis.")
         prompt = vault.get_prompt("agent_triage_app_target__prompt_33").format(stack_trace_log=stack_trace_log)
 
         try:
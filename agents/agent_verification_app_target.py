@@ -1,7 +1,6 @@
 # agent_verification_app_target.py
 
 import logging
-import subprocess
 import textwrap
 import json
 import sys
@@ -9,6 +8,8 @@ from pathlib import Path
 from typing import Optional, Tuple, Dict, List
 from llm_service import LLMService, parse_llm_json
 import vault
+from process_runner import (run_streaming_command, DEFAULT_WALL_CLOCK_TIMEOUT_SECONDS,
+                            DEFAULT_IDLE_TIMEOUT_SECONDS)
 
 class VerificationAgent_AppTarget:
     """
@@ -59,9 +60,15 @@ class VerificationAgent_AppTarget:
             logging.error(f"Failed to get test execution details from LLM: {e}")
             return {"command": "pytest", "required_tools": []}
 
-    def run_all_tests(self, project_root: str | Path, test_command_str: str) -> tuple[str, str]:
+    def run_all_tests(self, project_root: str | Path, test_command_str: str, progress_callback=None,
+                      wall_clock_timeout: float = DEFAULT_WALL_CLOCK_TIMEOUT_SECONDS,
+                      idle_timeout: float = DEFAULT_IDLE_TIMEOUT_SECONDS) -> tuple[str, str]:
         """
         Executes the entire test suite for the project using a provided command.
+        Output is streamed line by line to the optional progress_callback, and
+        only a bounded head/tail/failure-section capture is returned. A run that
+        exceeds the wall-clock or no-output timeout is killed and reported as a
+        'CODE_FAILURE'.
 
         Returns:
             A tuple containing a status string ('SUCCESS', 'CODE_FAILURE',
@@ -97,20 +104,18 @@ class VerificationAgent_AppTarget:
                 command_to_run = f'bash -c "{full_command}"'
 
             logging.info(f"Executing full insulated command: '{command_to_run}'")
-            # Prepare suppression flags for Windows
-            run_kwargs = {}
-            if sys.platform == "win32":
-                run_kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
-            result = subprocess.run(
+            result = run_streaming_command(
                 test_command_str,
-                shell=True,
                 cwd=project_root,
-                capture_output=True,
-                text=True,
-                check=False,
-                **run_kwargs
+                progress_callback=progress_callback,
+                wall_clock_timeout=wall_clock_timeout,
+                idle_timeout=idle_timeout
             )
-            output = result.stdout + "\n" + result.stderr
+            output = result.output
+
+            if result.timed_out:
+                logging.error(f"Test command '{test_command_str}' timed out: {result.timeout_reason}")
+                return 'CODE_FAILURE', output
 
             if result.returncode == 127 or "is not recognized" in output or "command not found" in output:
                 logging.error(f"Environment Failure: Test command '{test_command_str}' not found.")
@@ -1,13 +1,11 @@
 """
 This module contains the BuildAndCommitAgentAppTarget class.
 """
-import subprocess
 import os
-import sys
 from pathlib import Path
 import logging
-import git
 import watermarker
+from process_runner import run_streaming_command
 from agents.agent_verification_app_target import VerificationAgent_AppTarget
 from llm_service import LLMService
 
@@ -78,9 +76,10 @@ class BuildAndCommitAgentAppTarget:
 
         return path
 
-    def build_and_commit_component(self, component_path_str: str, component_code: str, test_path_str: str, test_code: str, test_command: str, llm_service: LLMService, version_control_enabled: bool) -> tuple[str, str]:
+    def build_and_commit_component(self, component_path_str: str, component_code: str, test_path_str: str, test_code: str, test_command: str, llm_service: LLMService, version_control_enabled: bool, progress_callback=None) -> tuple[str, str]:
         """
         Writes files, runs tests, and conditionally commits on success.
+        Test runner output is streamed to the optional progress_callback.
         Returns a tuple of (status, message), where status is 'SUCCESS',
         'CODE_FAILURE', 'ENVIRONMENT_FAILURE', or 'AGENT_ERROR'.
         """
@@ -108,7 +107,7 @@ class BuildAndCommitAgentAppTarget:
 
             logging.info(f"Running test suite with command: '{test_command}'")
             verification_agent = VerificationAgent_AppTarget(llm_service=llm_service)
-            status, test_output = verification_agent.run_all_tests(self.repo_path, test_command)
+            status, test_output = verification_agent.run_all_tests(self.repo_path, test_command, progress_callback=progress_callback)
 
             if status != 'SUCCESS':
                 logging.error(f"Test run failed with status {status}. Aborting commit.")
@@ -138,27 +137,19 @@ class BuildAndCommitAgentAppTarget:
             logging.error(error_message, exc_info=True)
             return "AGENT_ERROR", error_message
 
-    def run_command(self, command_to_run: str) -> tuple[bool, str]:
+    def run_command(self, command_to_run: str, progress_callback=None) -> tuple[bool, str]:
         """
         Runs the specified command in the root of the project repository.
+        Output is streamed to the optional progress_callback and a bounded
+        capture is returned; hung commands are killed after the default timeouts.
         """
         try:
-            # CORRECTED: Changed 'build_command' to the correct parameter name 'command_to_run'
-            result = subprocess.run(
-                command_to_run,
-                shell=True,
-                capture_output=True,
-                text=True,
-                cwd=self.repo_path,
-                check=False
-            )
-
-            combined_output = f"--- STDOUT ---\n{result.stdout}\n--- STDERR ---\n{result.stderr}"
-
-            if result.returncode == 0:
-                return True, combined_output
+            result = run_streaming_command(command_to_run, cwd=self.repo_path, progress_callback=progress_callback)
+
+            if result.returncode == 0 and not result.timed_out:
+                return True, result.output
             else:
-                return False, combined_output
+                return False, result.output
 
         except Exception as e:
             error_message = f"An unexpected error occurred while running the command: {e}"
@@ -178,6 +169,8 @@ class BuildAndCommitAgentAppTarget:
                               - A boolean indicating success (True) or failure (False).
                               - The new commit hash as a string on success, or an error message on failure.
         """
+        import git
+
         try:
             # The repo object was initialized in the constructor.
             index = self.repo.index
@@ -199,41 +192,28 @@ class BuildAndCommitAgentAppTarget:
             error_message = f"An unexpected error occurred during commit: {e}"
             return False, error_message
 
-    def run_test_suite_only(self, test_command: str) -> tuple[bool, str]:
+    def run_test_suite_only(self, test_command: str, progress_callback=None) -> tuple[bool, str]:
         """
-        Runs the provided test command and captures the output.
+        Runs the provided test command and captures a bounded view of the output.
 
         Args:
             test_command (str): The command to execute to run the test suite.
+            progress_callback: Optional callable that receives each output line.
 
         Returns:
             A tuple containing a boolean for success and the captured output.
         """
         try:
             logging.info(f"Running test suite with command: '{test_command}'")
-            # For Windows, create a startupinfo object to hide the console window
-            # Prepare suppression flags for Windows
-            run_kwargs = {}
-            if sys.platform == "win32":
-                run_kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
-
-            result = subprocess.run(
-                test_command.split(),
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                check=False,
-                **run_kwargs
-            )
-
-            if result.returncode == 0:
+            result = run_streaming_command(test_command.split(), cwd=self.repo_path,
+                                           progress_callback=progress_callback, shell=False)
+
+            if result.returncode == 0 and not result.timed_out:
                 logging.info("Test suite passed.")
-                return True, result.stdout
+                return True, result.output
             else:
                 logging.warning("Test suite failed.")
-                # Combine stdout and stderr for a complete failure log
-                failure_output = f"--- STDOUT ---\n{result.stdout}\n\n--- STDERR ---\n{result.stderr}"
-                return False, failure_output
+                return False, result.output
 
         except FileNotFoundError:
             error_msg = f"Error: The command '{test_command.split()[0]}' was not found. Please ensure it is installed and in your system's PATH."
@@ -253,6 +233,8 @@ class BuildAndCommitAgentAppTarget:
         Returns:
             A tuple containing a boolean for success and a status message.
         """
+        import git
+
         try:
             repo = git.Repo(self.repo_path)
 
@@ -11,6 +11,7 @@ import subprocess
 import sys
 from pathlib import Path
 from llm_service import LLMService, parse_llm_json
+from search_index import ProjectSearchIndex
 import vault
 
 class DocUpdateAgentRoWD:
@@ -104,7 +105,10 @@ class DocUpdateAgentRoWD:
             return original_spec
 
     def update_artifact_record(self, artifact_data: dict) -> bool:
-        """Creates or updates a record for a single software artifact in the RoWD."""
+        """
+        Creates or updates a record for a single software artifact in the RoWD,
+        and refreshes its entry in the local search index.
+        """
         try:
             artifact_data.pop('status', None)
             artifact_data.setdefault('version', 1)
@@ -112,7 +116,13 @@ class DocUpdateAgentRoWD:
             artifact_data.setdefault('dependencies', None)
             artifact_data.setdefault('unit_test_status', 'PENDING_GENERATION')
             self.db_manager.add_or_update_artifact(artifact_data)
-            return True
         except Exception as e:
             logging.error(f"Error updating RoWD for artifact: {artifact_data.get('artifact_id')}. Error: {e}")
             return False
+
+        try:
+            ProjectSearchIndex(self.db_manager).index_artifact(artifact_data)
+        except Exception as e:
+            # The index is rebuilt lazily on the next search, so this is not fatal.
+            logging.warning(f"Could not update search index for artifact {artifact_data.get('artifact_id')}: {e}")
+        return True
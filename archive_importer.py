@@ -0,0 +1,229 @@
+# archive_importer.py
+
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional
+
+from project_archive import (
+    BLOB_REF_KEY, TABLE_ARTIFACT, TABLE_CR, TABLE_KEYS, TABLE_PROJECT, iter_archive_chain
+)
+
+# Rows per executemany() call.
+IMPORT_BATCH_SIZE = 1000
+
+# How often (in rows) throughput is reported while importing.
+PROGRESS_INTERVAL_ROWS = 5000
+
+# Read size for the incremental JSON array parser used for legacy archives.
+JSON_READ_CHUNK_SIZE = 1 << 16
+
+# Archived table -> database table.
+DB_TABLES = {
+    TABLE_PROJECT: "Projects",
+    TABLE_ARTIFACT: "Artifacts",
+    TABLE_CR: "ChangeRequestRegister",
+}
+
+
+@dataclass
+class ImportStats:
+    """Counters for a single archive import."""
+    rows_inserted: dict[str, int] = field(default_factory=dict)
+    rows_deleted: int = 0
+    batches: int = 0
+    duration_seconds: float = 0.0
+
+    @property
+    def total_rows(self) -> int:
+        return sum(self.rows_inserted.values())
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.total_rows / self.duration_seconds if self.duration_seconds else 0.0
+
+    def summary(self) -> str:
+        counts = ", ".join(f"{count} {table}" for table, count in self.rows_inserted.items())
+        return (f"Imported {self.total_rows} rows ({counts or 'none'}) in {self.duration_seconds:.2f}s "
+                f"({self.rows_per_second:,.0f} rows/s, {self.batches} batches).")
+
+
+def iter_json_array(path: Path, chunk_size: int = JSON_READ_CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Yields the elements of a top-level JSON array one at a time, reading the
+    file in chunks so that only one element is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+    with open(path, "r", encoding="utf-8") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            buffer = buffer[position:] + chunk
+            position = 0
+            while True:
+                # Skip whitespace and the array punctuation between elements.
+                while position < len(buffer) and buffer[position] in " \t\r\n,":
+                    position += 1
+                if not started:
+                    if position >= len(buffer):
+                        break
+                    if buffer[position] != "[":
+                        raise ValueError(f"{path} does not contain a JSON array.")
+                    started = True
+                    position += 1
+                    continue
+                if position < len(buffer) and buffer[position] == "]":
+                    return
+                try:
+                    element, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    # The element continues in the next chunk.
+                    break
+                yield element
+                position = end
+            if not chunk:
+                if buffer[position:].strip():
+                    raise ValueError(f"{path} ends in the middle of a JSON array.")
+                return
+
+
+class _BatchedImporter:
+    """Collects rows into executemany() batches on an open import transaction."""
+
+    def __init__(self, conn, stats: ImportStats, progress_callback=None):
+        self.conn = conn
+        self.stats = stats
+        self.progress_callback = progress_callback
+        self.started = time.perf_counter()
+        self._pending: dict[str, tuple[tuple[str, ...], list[tuple]]] = {}
+        self._rows_since_report = 0
+        self._has_blobs = False
+
+    def add_blob(self, blob_hash: str, text: str):
+        if not self._has_blobs:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS import_blobs (hash TEXT PRIMARY KEY, content TEXT NOT NULL)")
+            self._has_blobs = True
+        self.conn.execute("INSERT OR IGNORE INTO temp.import_blobs (hash, content) VALUES (?, ?)", (blob_hash, text))
+
+    def _resolve(self, value):
+        if isinstance(value, dict) and BLOB_REF_KEY in value:
+            row = self.conn.execute("SELECT content FROM temp.import_blobs WHERE hash = ?", (value[BLOB_REF_KEY],)).fetchone()
+            if row is None:
+                raise ValueError(f"Archive references missing blob {value[BLOB_REF_KEY]}.")
+            return row[0]
+        return value
+
+    def add_row(self, table: str, row: dict):
+        columns = tuple(row.keys())
+        pending = self._pending.get(table)
+        if pending and (pending[0] != columns or len(pending[1]) >= IMPORT_BATCH_SIZE):
+            self.flush(table)
+            pending = None
+        if pending is None:
+            pending = (columns, [])
+            self._pending[table] = pending
+        values = tuple(row.values())
+        if self._has_blobs and any(isinstance(value, dict) for value in values):
+            values = tuple(self._resolve(value) for value in values)
+        pending[1].append(values)
+
+    def delete(self, table: str, key):
+        # Earlier rows for the same key may still be waiting in the batch.
+        self.flush(table)
+        self.conn.execute(f"DELETE FROM {DB_TABLES[table]} WHERE {TABLE_KEYS[table]} = ?", (key,))
+        self.stats.rows_deleted += 1
+
+    def flush(self, table: Optional[str] = None):
+        for name in [table] if table else list(self._pending):
+            pending = self._pending.pop(name, None)
+            if not pending or not pending[1]:
+                continue
+            columns, rows = pending
+            placeholders = ", ".join("?" for _ in columns)
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO {DB_TABLES[name]} ({', '.join(columns)}) VALUES ({placeholders})", rows
+            )
+            self.stats.batches += 1
+            self.stats.rows_inserted[name] = self.stats.rows_inserted.get(name, 0) + len(rows)
+            self._report(len(rows))
+
+    def _report(self, row_count: int):
+        self._rows_since_report += row_count
+        if self._rows_since_report < PROGRESS_INTERVAL_ROWS:
+            return
+        self._rows_since_report = 0
+        elapsed = time.perf_counter() - self.started
+        message = f"Importing archive: {self.stats.total_rows} rows loaded ({self.stats.total_rows / elapsed:,.0f} rows/s)..."
+        logging.info(message)
+        if self.progress_callback:
+            self.progress_callback(("INFO", message))
+
+    def close(self):
+        self.flush()
+        if self._has_blobs:
+            self.conn.execute("DROP TABLE IF EXISTS temp.import_blobs")
+
+
+def _run_import(db_manager, records: Iterator[tuple], progress_callback=None) -> ImportStats:
+    """
+    Applies ("blob", hash, text), ("row", table, row) and ("delete", table, key)
+    records to the database in a single transaction.
+    """
+    stats = ImportStats()
+    started = time.perf_counter()
+    with db_manager.bulk_import_transaction([DB_TABLES[TABLE_ARTIFACT], DB_TABLES[TABLE_CR]]) as conn:
+        importer = _BatchedImporter(conn, stats, progress_callback)
+        for kind, first, second in records:
+            if kind == "blob":
+                importer.add_blob(first, second)
+            elif kind == "row":
+                importer.add_row(first, second)
+            elif kind == "delete":
+                importer.delete(first, second)
+        importer.close()
+    stats.duration_seconds = time.perf_counter() - started
+    logging.info(stats.summary())
+    if progress_callback:
+        progress_callback(("SUCCESS", stats.summary()))
+    return stats
+
+
+def _archive_records(archive_path: Path) -> Iterator[tuple]:
+    for record in iter_archive_chain(archive_path):
+        record_type = record.get("type")
+        if record_type == "blob":
+            yield "blob", record["hash"], record["text"]
+        elif record_type == "row":
+            yield "row", record["table"], record["row"]
+        elif record_type == "delete":
+            yield "delete", record["table"], record["key"]
+
+
+def _legacy_records(rowd_file: Path) -> Iterator[tuple]:
+    project_file = rowd_file.with_name(rowd_file.name.replace("_rowd.json", "_project.json"))
+    cr_file = rowd_file.with_name(rowd_file.name.replace("_rowd.json", "_cr.json"))
+    if project_file.exists():
+        with open(project_file, "r", encoding="utf-8") as f:
+            yield "row", TABLE_PROJECT, json.load(f)
+    for table, path in ((TABLE_ARTIFACT, rowd_file), (TABLE_CR, cr_file)):
+        if path.exists():
+            for row in iter_json_array(path):
+                yield "row", table, row
+
+
+def import_project_archive(db_manager, archive_path: Path, progress_callback=None) -> ImportStats:
+    """
+    Streams a compressed archive chain (see project_archive) into the database.
+    Records are parsed one at a time, so memory use does not grow with the
+    size of the archive.
+    """
+    return _run_import(db_manager, _archive_records(Path(archive_path)), progress_callback)
+
+
+def import_legacy_archive(db_manager, rowd_file: Path, progress_callback=None) -> ImportStats:
+    """Streams an archive in the original three-file JSON format into the database."""
+    return _run_import(db_manager, _legacy_records(Path(rowd_file)), progress_callback)
@@ -107,6 +107,20 @@ def run_nuitka(staged_root):
         "--include-module=master_orchestrator",
         "--include-module=klyve_db_manager",
         "--include-module=llm_service",
+        "--include-module=process_runner",
+        "--include-module=runner_output_parsers",
+        "--include-module=stack_trace_parser",
+        "--include-module=rowd_context",
+        "--include-module=search_index",
+        "--include-module=orchestration_state_store",
+        "--include-module=project_archive",
+        "--include-module=archive_importer",
+        "--include-module=startup_profiler",
+        "--include-module=xlsx_export",
+        "--include-module=report_jobs",
+        "--include-module=markdown_docx",
+        "--include-module=keyword_matcher",
+        "--include-module=content_scanner",
         "--include-package=agents",
         "--include-package=gui",
         "--include-module=sqlcipher3",
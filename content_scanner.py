@@ -0,0 +1,145 @@
+# content_scanner.py
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from keyword_matcher import KeywordMatcher
+
+CONTENT_SCAN_WORKERS = 8
+CONTENT_SCAN_CHUNK_CHARS = 256 * 1024
+EXCERPT_CONTEXT_CHARS = 300
+
+
+@dataclass(frozen=True)
+class ContentHit:
+    """A keyword found in a file, with the lines around it."""
+    keyword: str
+    line: int
+    excerpt: str
+
+
+def format_hits(hits: list[ContentHit]) -> str:
+    """Renders the hits of one file as text evidence for a prompt."""
+    return "\n...\n".join(f"[line {hit.line}, keyword '{hit.keyword}']\n{hit.excerpt}" for hit in hits)
+
+
+def _excerpt_bounds(text: str, start: int, end: int, context_chars: int) -> tuple[int, int]:
+    # Widen the match by context_chars on each side, then drop the partial first and last lines.
+    low = max(0, start - context_chars)
+    high = min(len(text), end + context_chars)
+    if low > 0:
+        newline = text.find("\n", low, start)
+        if newline != -1:
+            low = newline + 1
+    if high < len(text):
+        newline = text.rfind("\n", end, high)
+        if newline != -1:
+            high = newline
+    return low, high
+
+
+def scan_file(path: Path, matcher: KeywordMatcher, max_hits: int = 1, stop_event: Optional[threading.Event] = None,
+              chunk_chars: int = CONTENT_SCAN_CHUNK_CHARS, context_chars: int = EXCERPT_CONTEXT_CHARS) -> list[ContentHit]:
+    """
+    Reads a file in chunks and returns up to `max_hits` keyword hits, stopping
+    as soon as they are found (or when stop_event is set). Only a chunk plus a
+    short tail of the previous one is held in memory at a time.
+
+    Matching is the same as matcher.search on the whole lowercased file: a
+    match is only accepted once enough text follows it to settle the longest
+    keyword, the whole-word check and the excerpt; otherwise the search
+    resumes at the same position when the next chunk arrives.
+    """
+    hits: list[ContentHit] = []
+    lookahead = matcher.max_keyword_length + 1
+    window = ""
+    pos = 0
+    line_offset = 0
+    with open(path, encoding='utf-8', errors='ignore') as handle:
+        while len(hits) < max_hits:
+            if stop_event is not None and stop_event.is_set():
+                break
+            chunk = handle.read(chunk_chars)
+            at_eof = len(chunk) < chunk_chars
+            window += chunk
+            lowered = window.lower()
+            if len(lowered) != len(window):
+                # A few characters change length when lowercased; keep positions aligned.
+                window = lowered
+            while len(hits) < max_hits:
+                match = matcher.search(lowered, pos)
+                if match is None:
+                    pos = len(window) if at_eof else max(pos, len(window) - lookahead)
+                    break
+                start, end = match.start(1), match.end(1)
+                if not at_eof and start + lookahead + context_chars > len(window):
+                    pos = start
+                    break
+                low, high = _excerpt_bounds(window, start, end, context_chars)
+                line = line_offset + window.count("\n", 0, start) + 1
+                hits.append(ContentHit(match.group(1), line, window[low:high]))
+                pos = max(high, end)
+            if at_eof:
+                break
+            # Keep one character before `pos` for the whole-word check, plus the excerpt context.
+            base = max(0, pos - context_chars - 1)
+            line_offset += window.count("\n", 0, base)
+            window = window[base:]
+            pos -= base
+    return hits
+
+
+def _scan_or_skip(path: Path, matcher: KeywordMatcher, max_hits: int, stop_event: Optional[threading.Event]) -> list[ContentHit]:
+    try:
+        return scan_file(path, matcher, max_hits=max_hits, stop_event=stop_event)
+    except OSError as e:
+        logging.warning(f"Could not read file {path} during content scan: {e}")
+        return []
+
+
+def scan_files(paths: Iterable[Path], matcher: KeywordMatcher, max_hits: int = 1, stop_at_first: bool = False,
+               max_workers: int = CONTENT_SCAN_WORKERS) -> dict[Path, list[ContentHit]]:
+    """
+    Scans files on a thread pool and returns {path: hits} for the files with
+    at least one hit, in the order the paths were given.
+
+    With stop_at_first=True the scan ends once any file has a hit: queued files
+    are cancelled and running ones stop at their next chunk. Which file is
+    reported then depends on timing, but whether one is found does not.
+    """
+    paths = list(paths)
+    stop_event = threading.Event() if stop_at_first else None
+    found: dict[Path, list[ContentHit]] = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="content-scan") as executor:
+        futures = {executor.submit(_scan_or_skip, path, matcher, max_hits, stop_event): path for path in paths}
+        for future in as_completed(futures):
+            hits = future.result()
+            if not hits:
+                continue
+            found[futures[future]] = hits
+            if stop_event is not None:
+                stop_event.set()
+                for pending in futures:
+                    pending.cancel()
+                break
+    return {path: found[path] for path in paths if path in found}
+
+
+def read_head(path: Path, max_chars: int) -> str:
+    """Reads at most max_chars characters of a file, noting when it was cut."""
+    with open(path, encoding='utf-8', errors='ignore') as handle:
+        text = handle.read(max_chars + 1)
+    if len(text) > max_chars:
+        return text[:max_chars] + f"\n... [truncated after {max_chars} characters]"
+    return text
+
+
+def read_heads(paths: Iterable[Path], max_chars: int, max_workers: int = CONTENT_SCAN_WORKERS) -> dict[Path, str]:
+    """Reads the head of each file on a thread pool, keeping the order of the paths."""
+    paths = list(paths)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="content-scan") as executor:
+        return dict(zip(paths, executor.map(lambda path: read_head(path, max_chars), paths)))
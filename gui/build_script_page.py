@@ -2,7 +2,6 @@
 
 import logging
 import json
-import markdown
 import html
 import warnings
 from pathlib import Path
@@ -0,0 +1,327 @@
+# gui/chart_renderer.py
+
+import hashlib
+import html
+import logging
+import math
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+DEFAULT_CHART_WIDTH = 700
+DEFAULT_CHART_HEIGHT = 500
+
+# Rendered charts kept in memory, keyed by the hash of the figure spec and size.
+CHART_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Plotly's default trace colours, used by the native renderer.
+DEFAULT_COLORWAY = ['#636efa', '#EF553B', '#00cc96', '#ab63fa', '#FFA15A',
+                    '#19d3f3', '#FF6692', '#B6E880', '#FF97FF', '#FECB52']
+
+# Most x-axis labels the native renderer draws before thinning them out.
+MAX_X_LABELS = 10
+
+
+class ChartRenderer:
+    """
+    Renders Plotly figures to PNG through one long-lived Kaleido renderer.
+
+    Kaleido keeps its Chromium process alive between calls, so only the first
+    render pays its startup cost; warm() pays it in the background ahead of
+    time. Calls are serialized, as Kaleido handles one figure at a time.
+    Results are cached by a hash of the figure spec, so an unchanged chart is
+    never rendered twice. When Kaleido is unavailable, simple line, area and
+    bar charts are drawn as SVG directly (native_svg) and rasterized.
+    """
+
+    def __init__(self, cache_max_bytes: int = CHART_CACHE_MAX_BYTES):
+        self.cache_max_bytes = cache_max_bytes
+        self._cache: OrderedDict[str, bytes] = OrderedDict()
+        self._cache_bytes = 0
+        self._cache_lock = threading.Lock()
+        self._kaleido_lock = threading.Lock()
+        self._kaleido_ready = False
+        self._warm_thread: Optional[threading.Thread] = None
+
+    def warm(self):
+        """Starts the Kaleido renderer on a background thread, if it is not running yet."""
+        if self._kaleido_ready or (self._warm_thread and self._warm_thread.is_alive()):
+            return
+        self._warm_thread = threading.Thread(target=self._warm_kaleido, name="ChartRendererWarmup", daemon=True)
+        self._warm_thread.start()
+
+    def _warm_kaleido(self):
+        try:
+            import plotly.graph_objects as go
+            self._kaleido_png(go.Figure(go.Scatter(x=[0, 1], y=[0, 1])), 10, 10)
+        except Exception as e:
+            logging.debug(f"Chart renderer warm-up skipped: {e}")
+
+    def _kaleido_png(self, plotly_fig, width: Optional[int], height: Optional[int]) -> bytes:
+        import plotly.io as pio
+
+        with self._kaleido_lock:
+            if not self._kaleido_ready:
+                scope = getattr(getattr(pio, "kaleido", None), "scope", None)
+                if scope is not None:
+                    # No maths in our charts; loading MathJax only slows the renderer's start.
+                    scope.mathjax = None
+            image_bytes = plotly_fig.to_image(format="png", engine="kaleido", width=width, height=height)
+            self._kaleido_ready = True
+            return image_bytes
+
+    @staticmethod
+    def figure_key(figure_spec: str, fmt: str, width: Optional[int], height: Optional[int]) -> str:
+        return hashlib.sha256(f"{fmt}:{width}x{height}\0{figure_spec}".encode("utf-8")).hexdigest()
+
+    def _cached(self, key: str) -> Optional[bytes]:
+        with self._cache_lock:
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+            return data
+
+    def _store(self, key: str, data: bytes):
+        with self._cache_lock:
+            if key in self._cache:
+                return
+            self._cache[key] = data
+            self._cache_bytes += len(data)
+            while self._cache_bytes > self.cache_max_bytes and len(self._cache) > 1:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= len(evicted)
+
+    def render_png(self, plotly_fig, width: Optional[int] = None, height: Optional[int] = None) -> bytes:
+        """
+        Returns the figure as PNG data, from the cache when the same figure was
+        rendered before. Falls back to the native renderer when Kaleido fails
+        and the chart is simple enough for it; otherwise Kaleido's error is raised.
+        Without an explicit size, the figure's layout size (or Plotly's default) is used.
+        """
+        key = self.figure_key(plotly_fig.to_json(), "png", width, height)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        try:
+            image_bytes = self._kaleido_png(plotly_fig, width, height)
+        except Exception as kaleido_error:
+            figure = plotly_fig.to_plotly_json()
+            width, height = _figure_size(figure, width, height)
+            svg = native_svg(figure, width, height)
+            if svg is None:
+                raise
+            logging.warning(f"Kaleido could not render the chart ({kaleido_error}); using the native renderer.")
+            image_bytes = rasterize_svg(svg, width, height)
+
+        self._store(key, image_bytes)
+        return image_bytes
+
+
+def _figure_size(figure: dict, width: Optional[int], height: Optional[int]) -> tuple[int, int]:
+    layout = figure.get("layout") or {}
+    return (width or layout.get("width") or DEFAULT_CHART_WIDTH, height or layout.get("height") or DEFAULT_CHART_HEIGHT)
+
+
+def _text(value) -> str:
+    if isinstance(value, dict):
+        value = value.get("text")
+    return "" if value is None else str(value)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _format_tick(value: float) -> str:
+    return f"{value:.0f}" if abs(value - round(value)) < 1e-9 else f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _nice_ticks(upper: float, count: int = 5) -> list[float]:
+    if upper <= 0:
+        return [0.0]
+    raw_step = upper / count
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw_step)
+    ticks = [0.0]
+    while ticks[-1] < upper - step * 1e-9:
+        ticks.append(ticks[-1] + step)
+    return ticks
+
+
+def native_svg(figure: dict, width: int = DEFAULT_CHART_WIDTH, height: int = DEFAULT_CHART_HEIGHT) -> Optional[str]:
+    """
+    Draws a simple Plotly figure (its to_plotly_json() dict) as SVG without
+    Kaleido: vertical bar traces and scatter traces drawn as lines, markers or
+    stacked areas ('tonexty' / 'tozeroy' fills). Returns None for anything else,
+    such as pie charts, horizontal bars or secondary axes.
+    """
+    traces = figure.get("data") or []
+    layout = figure.get("layout") or {}
+    if not traces:
+        return None
+    for trace in traces:
+        trace_type = trace.get("type", "scatter")
+        if trace_type not in ("scatter", "bar") or trace.get("orientation") == "h":
+            return None
+        if trace.get("xaxis", "x") != "x" or trace.get("yaxis", "y") != "y":
+            return None
+        if not all(_is_number(y) for y in trace.get("y") or []):
+            return None
+
+    template_layout = (layout.get("template") or {}).get("layout") or {}
+    background = layout.get("paper_bgcolor") or template_layout.get("paper_bgcolor") or "white"
+    plot_background = layout.get("plot_bgcolor") or template_layout.get("plot_bgcolor") or background
+    font_color = (layout.get("font") or {}).get("color") or (template_layout.get("font") or {}).get("color") or "#444"
+    colorway = layout.get("colorway") or template_layout.get("colorway") or DEFAULT_COLORWAY
+
+    # Category or numeric x axis
+    all_x = [x for trace in traces for x in (trace.get("x") or range(len(trace.get("y") or [])))]
+    numeric_x = all(_is_number(x) for x in all_x)
+    if numeric_x:
+        x_min, x_max = (min(all_x), max(all_x)) if all_x else (0, 1)
+        categories = []
+    else:
+        categories = list(dict.fromkeys(str(x) for x in all_x))
+
+    bar_traces = [trace for trace in traces if trace.get("type") == "bar"]
+    y_values = [y for trace in traces for y in trace.get("y") or []]
+    stacked_bars = layout.get("barmode") in ("stack", "relative")
+    y_upper = max(y_values, default=0)
+    if stacked_bars and bar_traces:
+        totals = {}
+        for trace in bar_traces:
+            for x, y in zip(trace.get("x") or range(len(trace["y"])), trace.get("y") or []):
+                totals[str(x)] = totals.get(str(x), 0) + y
+        y_upper = max([y_upper] + list(totals.values()))
+    y_range = (layout.get("yaxis") or {}).get("range")
+    y_ticks = _nice_ticks(y_upper or 1)
+    y_lower, y_top = (y_range[0], y_range[1]) if y_range else (0.0, y_ticks[-1] or 1.0)
+
+    title = _text(layout.get("title"))
+    x_title = _text((layout.get("xaxis") or {}).get("title"))
+    y_title = _text((layout.get("yaxis") or {}).get("title"))
+    legend_names = [trace.get("name") for trace in traces if trace.get("name") and trace.get("showlegend", True)]
+    show_legend = layout.get("showlegend", len(legend_names) > 1) and legend_names
+
+    left, top = 70, 60 if title else 30
+    right = width - (150 if show_legend else 30)
+    bottom = height - (70 if x_title else 50)
+    plot_width, plot_height = max(right - left, 1), max(bottom - top, 1)
+
+    def px(index: int, x) -> float:
+        if numeric_x:
+            return left + ((x - x_min) / ((x_max - x_min) or 1)) * plot_width
+        slot = plot_width / max(len(categories), 1)
+        return left + slot * (categories.index(str(x)) + 0.5)
+
+    def py(y: float) -> float:
+        return bottom - ((y - y_lower) / ((y_top - y_lower) or 1)) * plot_height
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" '
+        f'font-family="Arial, sans-serif" font-size="12" fill="{font_color}">',
+        f'<rect width="{width}" height="{height}" fill="{background}"/>',
+        f'<rect x="{left}" y="{top}" width="{plot_width}" height="{plot_height}" fill="{plot_background}"/>',
+    ]
+    if title:
+        parts.append(f'<text x="{width / 2}" y="30" text-anchor="middle" font-size="17">{html.escape(title)}</text>')
+
+    # Grid and axes
+    for tick in y_ticks:
+        if y_lower <= tick <= y_top:
+            y = py(tick)
+            parts.append(f'<line x1="{left}" y1="{y:.1f}" x2="{right}" y2="{y:.1f}" stroke="{font_color}" stroke-opacity="0.15"/>')
+            parts.append(f'<text x="{left - 8}" y="{y + 4:.1f}" text-anchor="end">{_format_tick(tick)}</text>')
+    parts.append(f'<line x1="{left}" y1="{bottom}" x2="{right}" y2="{bottom}" stroke="{font_color}" stroke-opacity="0.6"/>')
+    x_labels = categories if not numeric_x else sorted(set(all_x))
+    label_step = max(1, -(-len(x_labels) // MAX_X_LABELS))
+    for x in x_labels[::label_step]:
+        parts.append(f'<text x="{px(0, x):.1f}" y="{bottom + 18}" text-anchor="middle">{html.escape(str(x))}</text>')
+    if x_title:
+        parts.append(f'<text x="{left + plot_width / 2}" y="{height - 20}" text-anchor="middle" font-size="14">{html.escape(x_title)}</text>')
+    if y_title:
+        parts.append(f'<text x="18" y="{top + plot_height / 2}" text-anchor="middle" font-size="14" '
+                     f'transform="rotate(-90 18 {top + plot_height / 2})">{html.escape(y_title)}</text>')
+
+    # Traces
+    slot_width = plot_width / max(len(categories) if not numeric_x else len(x_labels), 1)
+    bar_width = slot_width * 0.8 / (1 if stacked_bars else max(len(bar_traces), 1))
+    bar_bases: dict[str, float] = {}
+    previous_line: list[tuple[float, float]] = []
+    legend_entries = []
+    for index, trace in enumerate(traces):
+        color_spec = (trace.get("marker") or {}).get("color") or (trace.get("line") or {}).get("color")
+        trace_color = color_spec if isinstance(color_spec, str) else colorway[index % len(colorway)]
+        xs = list(trace.get("x") or range(len(trace.get("y") or [])))
+        ys = list(trace.get("y") or [])
+
+        if trace.get("type") == "bar":
+            bar_index = bar_traces.index(trace)
+            for point, (x, y) in enumerate(zip(xs, ys)):
+                color = color_spec[point % len(color_spec)] if isinstance(color_spec, list) else trace_color
+                base = bar_bases.get(str(x), 0.0) if stacked_bars else 0.0
+                center = px(point, x)
+                offset = -0.4 * slot_width if stacked_bars else -0.4 * slot_width + bar_index * bar_width
+                x0 = center + offset
+                y0, y1 = py(base + y), py(base)
+                parts.append(f'<rect x="{x0:.1f}" y="{min(y0, y1):.1f}" width="{bar_width:.1f}" height="{abs(y1 - y0):.1f}" fill="{color}"/>')
+                if stacked_bars:
+                    bar_bases[str(x)] = base + y
+            legend_entries.append((trace.get("name"), trace_color))
+            continue
+
+        points = [(px(point, x), py(y)) for point, (x, y) in enumerate(zip(xs, ys))]
+        mode = trace.get("mode") or "lines+markers"
+        fill = trace.get("fill")
+        if fill in ("tonexty", "tozeroy") and points:
+            lower = list(reversed(previous_line)) if fill == "tonexty" and previous_line else [(points[-1][0], bottom), (points[0][0], bottom)]
+            polygon = " ".join(f"{x:.1f},{y:.1f}" for x, y in points + lower)
+            fill_color = (trace.get("fillcolor") or trace_color)
+            parts.append(f'<polygon points="{polygon}" fill="{fill_color}" fill-opacity="0.5" stroke="none"/>')
+        if "lines" in mode and len(points) > 1:
+            dash = ' stroke-dasharray="6,4"' if (trace.get("line") or {}).get("dash") in ("dash", "dot", "dashdot") else ""
+            polyline = " ".join(f"{x:.1f},{y:.1f}" for x, y in points)
+            parts.append(f'<polyline points="{polyline}" fill="none" stroke="{trace_color}" stroke-width="2"{dash}/>')
+        if "markers" in mode:
+            parts.extend(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="3.5" fill="{trace_color}"/>' for x, y in points)
+        previous_line = points
+        legend_entries.append((trace.get("name"), trace_color))
+
+    if show_legend:
+        legend_y = top
+        for name, color in legend_entries:
+            if not name:
+                continue
+            parts.append(f'<rect x="{right + 15}" y="{legend_y}" width="12" height="12" fill="{color}"/>')
+            parts.append(f'<text x="{right + 33}" y="{legend_y + 10}">{html.escape(str(name))}</text>')
+            legend_y += 20
+
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+def rasterize_svg(svg: str, width: int, height: int) -> bytes:
+    """Converts an SVG document to PNG data with Qt's SVG renderer."""
+    from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+    from PySide6.QtGui import QImage, QPainter
+    from PySide6.QtSvg import QSvgRenderer
+
+    renderer = QSvgRenderer(QByteArray(svg.encode("utf-8")))
+    if not renderer.isValid():
+        raise ValueError("The generated chart SVG could not be parsed.")
+    image = QImage(width, height, QImage.Format.Format_ARGB32)
+    image.fill(0)
+    painter = QPainter(image)
+    try:
+        renderer.render(painter)
+    finally:
+        painter.end()
+    buffer = QBuffer()
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(buffer.data())
+
+
+# The renderer shared by all reports.
+chart_renderer = ChartRenderer()
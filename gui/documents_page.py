@@ -16,25 +16,63 @@ from gui.worker import Worker
 from gui.utils import format_timestamp_for_display, render_markdown_to_html
 
 class DocumentViewerDialog(QDialog):
-    """A simple dialog to display document content."""
+    """
+    A simple dialog to display document content.
+    Diagrams are rendered in the background and replace their placeholders as they finish.
+    """
+    diagram_rendered = Signal()
+
+    # Diagrams finishing close together are shown in a single refresh.
+    DIAGRAM_REFRESH_DELAY_MS = 150
+
     def __init__(self, title, content, parent=None):
         super().__init__(parent)
         self.setWindowTitle(title)
         self.setMinimumSize(700, 500)
+        self.content = content
 
         layout = QVBoxLayout(self)
-        text_edit = QTextEdit()
-        text_edit.setReadOnly(True)
-
-        # Use our new robust renderer
-        html_content = render_markdown_to_html(content)
-        text_edit.setHtml(html_content)
-        layout.addWidget(text_edit)
+        self.text_edit = QTextEdit()
+        self.text_edit.setReadOnly(True)
+        layout.addWidget(self.text_edit)
 
         button_box = QDialogButtonBox(QDialogButtonBox.Close)
         button_box.rejected.connect(self.reject)
         layout.addWidget(button_box)
 
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(self.DIAGRAM_REFRESH_DELAY_MS)
+        self.refresh_timer.timeout.connect(self._render_content)
+        # Emitted from renderer threads; the timer is started on the GUI thread.
+        self.diagram_rendered.connect(self.refresh_timer.start)
+        # Renders that already have a refresh callback, so each gets only one.
+        self.watched_renders = set()
+
+        self._render_content()
+
+    def _render_content(self):
+        scrollbar = self.text_edit.verticalScrollBar()
+        scroll_position = scrollbar.value()
+        # Use our new robust renderer
+        placeholder_renders = []
+        html_content = render_markdown_to_html(self.content, wait_for_diagrams=False,
+                                               placeholder_renders=placeholder_renders)
+        self.text_edit.setHtml(html_content)
+        scrollbar.setValue(scroll_position)
+
+        # Runs straight away for a render that finished after its placeholder was drawn.
+        for render in placeholder_renders:
+            if render not in self.watched_renders:
+                self.watched_renders.add(render)
+                render.add_done_callback(self._on_diagram_rendered)
+
+    def _on_diagram_rendered(self, _render):
+        try:
+            self.diagram_rendered.emit()
+        except RuntimeError:
+            pass # The dialog was closed before the diagram finished
+
 class DocumentsPage(QWidget):
     """
     Logic handler for the Document Hub page.
@@ -2,7 +2,7 @@
 
 import logging
 from PySide6.QtWidgets import QWidget, QMessageBox
-from PySide6.QtCore import Signal, QThreadPool, QTimer
+from PySide6.QtCore import Signal, QThreadPool
 
 from gui.ui_genesis_page import Ui_GenesisPage
 from gui.worker import Worker
@@ -136,31 +136,19 @@ class GenesisPage(QWidget):
 
     def on_progress_update(self, progress_data):
         """
-        Appends a progress message to the log in a thread-safe manner,
-        applying color based on the status.
+        Queues a progress message for the log panel. Safe to call from worker
+        threads; the panel renders queued lines in batches, coloured by status.
         """
         try:
             if isinstance(progress_data, tuple) and len(progress_data) == 2:
                 status, message = progress_data
             else:
                 status, message = "INFO", str(progress_data)
-
-            color_map = {
-                "SUCCESS": "#6A8759", # Green
-                "INFO": "#A9B7C6",    # Light Gray
-                "WARNING": "#FFC66D", # Amber
-                "ERROR": "#CC7832"     # Red/Orange
-            }
-
-            color = color_map.get(status, "#A9B7C6")
-            # Ensure message is properly escaped for HTML
-            escaped_message = message.replace('<', '&lt;').replace('>', '&gt;')
-            html_message = f'<font color="{color}">{escaped_message}</font>'
-            QTimer.singleShot(0, lambda: self.ui.logOutputTextEdit.append(html_message))
+            self.ui.logOutputTextEdit.add_entry(status, str(message))
 
         except Exception as e:
             # Fallback for any unexpected data format
-            QTimer.singleShot(0, lambda: self.ui.logOutputTextEdit.append(str(progress_data)))
+            self.ui.logOutputTextEdit.add_entry("INFO", str(progress_data))
             logging.error(f"Error processing progress update: {e}")
 
     def update_processing_display(self, simple_status_message: str = None):
@@ -0,0 +1,112 @@
+# gui/log_translation.py
+
+import logging
+import re
+from typing import Optional
+
+# Internal names that are replaced in every message shown to the user.
+SANITIZED_NAMES = {
+    "BuildAndCommitAgent": "Automated Builder",
+    "TriageAgent": "Diagnostic System",
+}
+
+# Translation Map: Technical Substring -> User Friendly Message.
+# When several substrings occur in one message, the earliest entry wins.
+FRIENDLY_MESSAGES = {
+    "Invoking FixPlannerAgent": "AI is analyzing the failure...",
+    "TriageAgent": "Diagnosing root cause...",
+    "Stack trace analysis": "Parsing error logs...",
+    "Auto-discovered context": "Reading relevant source files...",
+    "Generating detailed code fix": "Generating fix implementation...",
+    "Successfully generated a fix plan": "Fix plan created. Starting repairs...",
+    "CodeReviewAgent": "Performing safety code review...",
+    "Wrote source code": "Applying fix to source files...",
+    "Wrote unit tests": "Saving new unit tests...",
+    "Running test suite": "Verifying fix with regression tests...",
+    "Verification execution finished": "Testing complete.",
+    "CodeSummarizationAgent: Generating code summary": "Summarizing changes...",
+    "Automated fix plan executed successfully": "Automated fix applied successfully."
+}
+
+# Noise Filter: messages containing ANY of these strings are not shown.
+IGNORED_PATTERNS = (
+    "HTTP Request",
+    "AFC is enabled",
+    "Project marked as dirty",
+    "Transitioning to phase",
+    "Attempting to save state",
+    "Project '", # Matches "Project 'test1' state automatically saved"
+    "Calculated SHA-256",
+    "No coding standard",
+    "missing 'relevant_languages' key",
+    "DEBUG PRE-FLIGHT",
+    "VerificationAgent initialized",
+    "CodeSummarizationAgent initialized",
+    "Running full test suite for project at", # Redundant with "Verifying fix..."
+    "Executing verification command",
+    "Executing full insulated command",
+    "Version control is disabled",
+    "Skipping commit"
+)
+
+# Loggers whose records are HTTP transport noise and are dropped before formatting.
+IGNORED_LOGGERS = ("httpx", "httpcore", "urllib3")
+
+# Records below this level never reach the user-facing log.
+MIN_LEVEL = logging.INFO
+
+
+def _alternation(strings) -> str:
+    return "|".join(re.escape(s) for s in strings)
+
+
+class LogTranslator:
+    """
+    Turns technical log messages into the short status lines shown while the
+    automated fix runs, or filters them out as noise.
+
+    A single precompiled scan over all noise patterns and translatable phrases
+    decides whether a message needs any further work; most messages do not.
+    """
+
+    def __init__(self, friendly_messages: dict = FRIENDLY_MESSAGES, ignored_patterns=IGNORED_PATTERNS,
+                 sanitized_names: dict = SANITIZED_NAMES, ignored_loggers=IGNORED_LOGGERS, min_level: int = MIN_LEVEL):
+        self.friendly_messages = dict(friendly_messages)
+        self.sanitized_names = dict(sanitized_names)
+        self.ignored_loggers = tuple(ignored_loggers)
+        self.min_level = min_level
+
+        self.ignored_patterns = tuple(ignored_patterns)
+        # A single scan tells whether a message contains any known phrase at all,
+        # which is the uncommon case; most messages are passed through as-is.
+        phrases = list(self.ignored_patterns) + list(self.friendly_messages)
+        self._phrase_pattern = re.compile(_alternation(phrases)) if phrases else None
+
+    def accepts(self, record: logging.LogRecord) -> bool:
+        """Cheap checks that run before a record is formatted."""
+        if record.levelno < self.min_level:
+            return False
+        return not (self.ignored_loggers and record.name.startswith(self.ignored_loggers))
+
+    def sanitize(self, message: str) -> str:
+        # A handful of names: str.replace is cheaper here than any regex.
+        for name, replacement in self.sanitized_names.items():
+            message = message.replace(name, replacement)
+        return message
+
+    def translate(self, message: str) -> Optional[str]:
+        """
+        Returns the message to show: the friendly text for the highest-priority
+        phrase it contains, or the sanitized message itself. Returns None for noise.
+        """
+        message = self.sanitize(message)
+        if not self._phrase_pattern or not self._phrase_pattern.search(message):
+            return message
+
+        # Some phrase is present: resolve noise and priority exactly.
+        if any(pattern in message for pattern in self.ignored_patterns):
+            return None
+        for phrase, friendly_text in self.friendly_messages.items():
+            if phrase in message:
+                return friendly_text
+        return message
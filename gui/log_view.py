@@ -0,0 +1,126 @@
+# gui/log_view.py
+
+import threading
+from collections import deque
+
+from PySide6.QtWidgets import QPlainTextEdit
+from PySide6.QtGui import QColor, QTextCharFormat, QTextCursor
+from PySide6.QtCore import Signal, QTimer
+
+# Buffered entries are rendered at most this often (roughly one frame at 20 fps).
+LOG_FLUSH_INTERVAL_MS = 50
+
+# Lines kept in the view; the oldest lines are discarded beyond this.
+MAX_LOG_BLOCKS = 5000
+
+# Entries waiting to be rendered. If producers outpace the view, the oldest
+# waiting entries are dropped and a single notice is shown in their place.
+MAX_PENDING_ENTRIES = 20000
+
+LOG_COLORS = {
+    "SUCCESS": "#6A8759", # Green
+    "INFO": "#A9B7C6",    # Light Gray
+    "WARNING": "#FFC66D", # Amber
+    "ERROR": "#CC7832"     # Red/Orange
+}
+
+
+class LogView(QPlainTextEdit):
+    """
+    A read-only log panel for high-volume progress output.
+
+    Entries can be added from any thread. They are buffered and rendered in
+    batches on a timer, as plain text with a per-status colour, and the
+    document is capped at MAX_LOG_BLOCKS lines, so thousands of streamed lines
+    neither flood the event loop nor grow memory without bound.
+    """
+    _entries_pending = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(MAX_LOG_BLOCKS)
+
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._dropped = 0
+        self._flush_scheduled = False
+
+        self._formats = {}
+        for status, color in LOG_COLORS.items():
+            text_format = QTextCharFormat()
+            text_format.setForeground(QColor(color))
+            self._formats[status] = text_format
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush)
+        # Emitted from worker threads, so the timer is always started on the GUI thread.
+        self._entries_pending.connect(self._flush_timer.start)
+
+    def add_entry(self, status: str, message: str):
+        """Queues a log line for display. Safe to call from any thread."""
+        with self._lock:
+            if len(self._pending) >= MAX_PENDING_ENTRIES:
+                self._pending.popleft()
+                self._dropped += 1
+            self._pending.append((status, message))
+            schedule = not self._flush_scheduled
+            self._flush_scheduled = True
+        if schedule:
+            self._entries_pending.emit()
+
+    def append(self, text: str):
+        """Queues a plain informational line, keeping it in order with buffered entries."""
+        self.add_entry("INFO", text)
+
+    def setText(self, text: str):
+        self.clear()
+        self.add_entry("INFO", text)
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            self._dropped = 0
+        super().clear()
+
+    def flush(self):
+        """Renders any buffered entries immediately."""
+        self._flush_timer.stop()
+        self._flush()
+
+    def _flush(self):
+        with self._lock:
+            entries = list(self._pending)
+            self._pending.clear()
+            dropped, self._dropped = self._dropped, 0
+            self._flush_scheduled = False
+        if not entries:
+            return
+
+        scrollbar = self.verticalScrollBar()
+        follow_tail = scrollbar.value() >= scrollbar.maximum() - 2
+
+        # Only the newest lines would survive the block cap anyway.
+        if len(entries) > MAX_LOG_BLOCKS:
+            dropped += len(entries) - MAX_LOG_BLOCKS
+            entries = entries[-MAX_LOG_BLOCKS:]
+        if dropped:
+            entries.insert(0, ("WARNING", f"... {dropped} earlier log lines were skipped ..."))
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        needs_new_block = not self.document().isEmpty()
+        default_format = self._formats["INFO"]
+        for status, message in entries:
+            if needs_new_block:
+                cursor.insertBlock()
+            cursor.insertText(message, self._formats.get(status, default_format))
+            needs_new_block = True
+        cursor.endEditBlock()
+
+        if follow_tail:
+            scrollbar.setValue(scrollbar.maximum())
@@ -4,7 +4,6 @@ import logging
 from pathlib import Path
 import shutil
 from datetime import datetime
-import docx
 from PySide6.QtWidgets import QWidget, QMessageBox, QFileDialog
 from PySide6.QtCore import Signal, QThreadPool
 
@@ -115,6 +114,7 @@ class ManualUITestingPage(QWidget):
             # Step 2: Read the file content for processing (existing logic).
             content = ""
             if file_path.endswith('.docx'):
+                import docx
                 doc = docx.Document(file_path)
                 content = "\n".join([p.text for p in doc.paragraphs])
             else: # For .txt and .md files
@@ -1,46 +1,66 @@
 # In gui/rendering_utils.py
 import logging
 import subprocess
-import tempfile
-import atexit
+import hashlib
+import threading
 import os
 import html
 import re
 import base64
-import requests
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from io import BytesIO
-import graphviz
+from typing import Optional
 
-# Create a persistent temp directory for this session
-TEMP_IMAGE_DIR = Path(tempfile.gettempdir()) / "klyve_session_images"
-TEMP_IMAGE_DIR.mkdir(exist_ok=True)
+# Rendered diagrams are stored here under the SHA-256 of their format and
+# source, so a diagram is only ever rendered once, across sessions too.
+DIAGRAM_CACHE_DIR = Path.home() / ".klyve" / "cache" / "diagrams"
 
-def _cleanup_temp_images():
-    """Remove temp images on application exit."""
+# When the cache grows beyond this, the least recently used files are removed
+# until it is back under DIAGRAM_CACHE_TARGET_BYTES.
+DIAGRAM_CACHE_MAX_BYTES = 128 * 1024 * 1024
+DIAGRAM_CACHE_TARGET_BYTES = 96 * 1024 * 1024
+
+# Long-lived threads that run the Graphviz renders for cache misses.
+DIAGRAM_RENDER_WORKERS = 2
+
+DIAGRAM_FORMATS = ("png", "svg")
+
+_render_lock = threading.Lock()
+_render_pool: ThreadPoolExecutor | None = None
+# Renders that are running, or that failed this session (so a broken diagram is not retried on every redisplay).
+_active_renders: dict[str, Future] = {}
+_cache_size_bytes: int | None = None
+
+
+def _diagram_cache_path(dot_text: str, fmt: str) -> Path:
+    digest = hashlib.sha256(f"{fmt}\0{dot_text}".encode("utf-8")).hexdigest()
+    return DIAGRAM_CACHE_DIR / digest[:2] / f"{digest}.{fmt}"
+
+
+def get_cached_diagram(dot_text: str, fmt: str = "png") -> Path | None:
+    """Returns the cached render of a DOT diagram, or None if it has not been rendered yet."""
+    path = _diagram_cache_path(dot_text, fmt)
     try:
-        for f in TEMP_IMAGE_DIR.glob("*.png"):
-            if f.exists():
-                os.remove(f)
-    except Exception as e:
-        logging.warning(f"Could not clean up temp images: {e}")
+        os.utime(path) # Marks the entry as recently used for eviction
+        return path
+    except OSError:
+        return None
 
-atexit.register(_cleanup_temp_images)
 
-def generate_dot_png(dot_text: str) -> BytesIO:
-    """
-    Creates a PNG from a Graphviz DOT text block.
-    """
+def _render_dot(dot_text: str, fmt: str) -> bytes:
+    """Runs Graphviz on a DOT text block and returns the rendered image data."""
+    import graphviz
+
     try:
-        # Create a Graphviz object from the DOT source
-        # We specify 'png' as the format and get the raw bytes
-        png_data = graphviz.Source(dot_text).pipe(format='png')
+        # Create a Graphviz object from the DOT source and get the raw bytes
+        image_data = graphviz.Source(dot_text).pipe(format=fmt)
 
-        if not png_data:
+        if not image_data:
             raise Exception("Graphviz returned empty image data.")
 
         logging.debug("Successfully rendered DOT diagram via Graphviz")
-        return BytesIO(png_data)
+        return image_data
 
     except graphviz.backend.execute.CalledProcessError as e:
         # This error means the 'dot' command failed.
@@ -54,17 +74,105 @@ def generate_dot_png(dot_text: str) -> BytesIO:
         logging.error(error_msg)
         raise Exception(error_msg)
     except Exception as e:
-        logging.error(f"Failed to generate DOT PNG: {e}")
+        logging.error(f"Failed to generate DOT {fmt.upper()}: {e}")
         raise
 
+
+def _store_diagram(path: Path, image_data: bytes):
+    """Writes a render into the cache atomically and evicts old entries if the cache is full."""
+    global _cache_size_bytes
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    temp_path.write_bytes(image_data)
+    os.replace(temp_path, path)
+
+    with _render_lock:
+        if _cache_size_bytes is None:
+            _cache_size_bytes = sum(f.stat().st_size for f in DIAGRAM_CACHE_DIR.glob("*/*.*") if f.suffix != ".tmp")
+        else:
+            _cache_size_bytes += len(image_data)
+        if _cache_size_bytes > DIAGRAM_CACHE_MAX_BYTES:
+            _cache_size_bytes = _evict_diagram_cache(DIAGRAM_CACHE_TARGET_BYTES)
+
+
+def _evict_diagram_cache(target_bytes: int) -> int:
+    """Removes the least recently used renders until the cache fits in target_bytes. Returns the new size."""
+    entries = []
+    for f in DIAGRAM_CACHE_DIR.glob("*/*.*"):
+        try:
+            stat = f.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, f))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, f in sorted(entries):
+        if total <= target_bytes:
+            break
+        try:
+            f.unlink()
+            total -= size
+            removed += 1
+        except OSError:
+            continue
+    logging.info(f"Diagram cache: evicted {removed} renders, {total // 1024} KB remain.")
+    return total
+
+
+def _render_to_cache(dot_text: str, fmt: str, path: Path) -> Path:
+    _store_diagram(path, _render_dot(dot_text, fmt))
+    with _render_lock:
+        _active_renders.pop(str(path), None)
+    return path
+
+
+def render_dot_async(dot_text: str, fmt: str = "png") -> Future:
+    """
+    Returns a Future for the cached file of a rendered DOT diagram. Cached
+    diagrams resolve immediately; otherwise the render is queued on the
+    renderer pool, and concurrent requests for the same diagram share it.
+    """
+    if fmt not in DIAGRAM_FORMATS:
+        raise ValueError(f"Unsupported diagram format: {fmt}")
+    global _render_pool
+    cached = get_cached_diagram(dot_text, fmt)
+    if cached:
+        future = Future()
+        future.set_result(cached)
+        return future
+
+    path = _diagram_cache_path(dot_text, fmt)
+    with _render_lock:
+        future = _active_renders.get(str(path))
+        if future is None:
+            if _render_pool is None:
+                _render_pool = ThreadPoolExecutor(max_workers=DIAGRAM_RENDER_WORKERS, thread_name_prefix="DiagramRenderer")
+            future = _render_pool.submit(_render_to_cache, dot_text, fmt, path)
+            _active_renders[str(path)] = future
+    return future
+
+
+def render_dot_to_file(dot_text: str, fmt: str = "png") -> Path:
+    """Renders a DOT diagram (or reuses its cached render) and returns the image file."""
+    return render_dot_async(dot_text, fmt).result()
+
+
+def generate_dot_png(dot_text: str) -> BytesIO:
+    """
+    Creates a PNG from a Graphviz DOT text block.
+    """
+    return BytesIO(render_dot_to_file(dot_text, "png").read_bytes())
+
 def generate_plotly_png(plotly_fig) -> BytesIO:
     """
     Creates a PNG from a Plotly figure object using kaleido.
     This is the correct way to use kaleido.
     """
+    from gui.chart_renderer import chart_renderer
+
     try:
-        # Use plotly's built-in kaleido integration
-        image_bytes = plotly_fig.to_image(format="png", engine="kaleido")
+        # Rendered by the shared, long-lived Kaleido renderer (cached per figure)
+        image_bytes = chart_renderer.render_png(plotly_fig)
         return BytesIO(image_bytes)
     except ValueError as e:
         if "kaleido" in str(e):
@@ -77,22 +185,49 @@ def generate_plotly_png(plotly_fig) -> BytesIO:
         logging.error(f"Error during Plotly to PNG conversion: {e}")
         raise
 
-def preprocess_markdown_for_display(markdown_text: str) -> str:
+# A fenced ```dot block in Markdown; group 1 is the DOT source.
+DOT_BLOCK_PATTERN = re.compile(r"```dot\s*(.*?)```", re.DOTALL)
+
+DIAGRAM_PLACEHOLDER_HTML = '<div align="center"><i>Rendering diagram...</i></div>'
+
+
+def extract_dot_blocks(markdown_text: str) -> list[str]:
+    """Returns the distinct DOT sources of all ```dot blocks in a Markdown document, in order."""
+    return list(dict.fromkeys(DOT_BLOCK_PATTERN.findall(markdown_text or "")))
+
+
+def prerender_dot_blocks(dot_blocks: list[str], fmt: str = "png") -> dict[str, Future]:
+    """
+    Starts rendering every given diagram at once and returns {dot_text: Future}.
+    Cached diagrams resolve immediately; the rest render concurrently on the
+    renderer pool, so a document costs its slowest diagram rather than the
+    sum of all of them.
+    """
+    return {dot_text: render_dot_async(dot_text, fmt) for dot_text in dict.fromkeys(dot_blocks)}
+
+
+def preprocess_markdown_for_display(markdown_text: str, wait_for_diagrams: bool = True,
+                                    placeholder_renders: Optional[list[Future]] = None) -> str:
     """
     Scans Markdown for DOT blocks, renders them as images,
     and replaces the block with a CENTERED <img> tag.
+
+    All diagrams are rendered concurrently before they are spliced in. With
+    wait_for_diagrams=False, diagrams that are not rendered yet are replaced by
+    a placeholder instead, and the renders behind those placeholders are added
+    to `placeholder_renders`; call again once they finish.
     """
-    import re
+    renders = prerender_dot_blocks(extract_dot_blocks(markdown_text))
 
     def render_dot_block(match):
         code_text = match.group(1)
+        render = renders[code_text]
+        if not wait_for_diagrams and not render.done():
+            if placeholder_renders is not None and render not in placeholder_renders:
+                placeholder_renders.append(render)
+            return DIAGRAM_PLACEHOLDER_HTML
         try:
-            image_bytes_io = generate_dot_png(code_text)
-            img_hash = hash(code_text)
-            img_path = TEMP_IMAGE_DIR / f"dot_{img_hash}.png"
-            with open(img_path, "wb") as f:
-                f.write(image_bytes_io.getbuffer())
-            img_src = img_path.as_uri()
+            img_src = render.result().as_uri()
             # CHANGED: Added <div align="center"> wrapper
             return f'<div align="center"><img src="{img_src}" alt="DOT Diagram"></div>'
         except Exception as e:
@@ -105,6 +240,6 @@ def preprocess_markdown_for_display(markdown_text: str) -> str:
 </pre>
 """
 
-    pattern = re.compile(r"```dot\s*(.*?)```", re.DOTALL)
-    markdown_text = re.sub(pattern, render_dot_block, markdown_text)
-    return markdown_text
\ No newline at end of file
+    markdown_text = DOT_BLOCK_PATTERN.sub(render_dot_block, markdown_text)
+    return markdown_text
+
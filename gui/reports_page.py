@@ -10,6 +10,7 @@ from master_orchestrator import MasterOrchestrator
 from gui.worker import Worker
 from gui.utils import show_status_message
 from gui.utils import format_timestamp_for_display
+from gui.chart_renderer import chart_renderer
 import os # Import os for showing the file
 
 class ReportsPage(QWidget):
@@ -48,14 +49,21 @@ class ReportsPage(QWidget):
 
     def connect_signals(self):
         """Connects all UI signals to their slots."""
-        self.ui.backButton.clicked.connect(self.back_to_workflow.emit)
+        self.ui.backButton.clicked.connect(self._on_back_clicked)
         # Connect the tree view selection change to the details panel update
         self.ui.reportTreeView.selectionModel().currentChanged.connect(self._on_report_selection_changed)
         # The generate button's connection will be handled dynamically
 
+    def _on_back_clicked(self):
+        """Leaves the hub, dropping any report requests that have not started yet."""
+        self.orchestrator.cancel_pending_reports()
+        self.back_to_workflow.emit()
+
     def prepare_for_display(self):
         """Called when the page is shown, populates the report tree."""
         logging.debug("Reports Hub prepared for display. Populating tree...")
+        # Start the chart renderer now so the first chart report does not wait for it.
+        chart_renderer.warm()
         self.tree_model.clear() # Clear previous items
         self.ui.reportTreeView.setHeaderHidden(True) # Ensure header is hidden
 
@@ -326,11 +334,17 @@ class ReportsPage(QWidget):
                 return
             kwargs['sprint_id'] = sprint_id
 
+        # An unchanged report is already cached: no need for a worker at all.
+        cached_report = self.orchestrator.get_cached_report(report_name, **kwargs)
+        if cached_report is not None:
+            self._on_report_success(cached_report, report_name, meta['file_type'])
+            return
+
         # Get the generation function from metadata
         generation_func = meta["generation_function"]
 
         # Pass the report name and file type to the success handler
-        worker = Worker(generation_func, **kwargs)
+        worker = Worker(self.orchestrator.generate_report, report_name, generation_func, **kwargs)
         worker.signals.result.connect(lambda result, rn=report_name, ft=meta['file_type']: self._on_report_success(result, rn, ft))
         worker.signals.error.connect(self._on_report_failure)
         self.worker_thread_pool.start(worker)
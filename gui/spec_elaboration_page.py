@@ -5,7 +5,6 @@ from pathlib import Path
 import json
 import re
 from datetime import datetime
-import markdown
 from gui.utils import render_markdown_to_html
 import warnings
 from PySide6.QtWidgets import QWidget, QMessageBox, QFileDialog, QApplication
@@ -193,6 +192,8 @@ class SpecElaborationPage(QWidget):
 
     def _handle_draft_generation_result(self, draft_text: str):
         """Handles the result of the draft generation and shows the first review page."""
+        import markdown
+
         try:
             self.ui.headerLabel.setText("Draft Application Specification")
             self.spec_draft = draft_text
@@ -376,6 +377,8 @@ class SpecElaborationPage(QWidget):
             self._set_ui_busy(False)
 
     def on_confirm_analysis_clicked(self):
+        import markdown
+
         self.ui.headerLabel.setText("Draft Application Specification")
         self.ui.pmReviewTextEdit.setHtml(markdown.markdown(self.spec_draft, extensions=['fenced_code', 'extra']))
         self.ui.pmFeedbackTextEdit.clear()
@@ -2,7 +2,6 @@
 
 import logging
 import json
-import markdown
 from PySide6.QtWidgets import (QWidget, QDialog, QVBoxLayout, QTextEdit,
                                QDialogButtonBox, QAbstractItemView, QHeaderView)
 from PySide6.QtCore import Signal
@@ -1,7 +1,6 @@
 # gui/test_env_page.py
 
 import logging
-import markdown
 from gui.utils import render_markdown_to_html, validate_security_input
 import re
 from pathlib import Path
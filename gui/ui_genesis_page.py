@@ -17,8 +17,9 @@ from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
     QPalette, QPixmap, QRadialGradient, QTransform)
 from PySide6.QtWidgets import (QApplication, QFormLayout, QFrame, QHBoxLayout,
     QLabel, QProgressBar, QPushButton, QSizePolicy,
-    QSpacerItem, QStackedWidget, QTextEdit, QVBoxLayout,
-    QWidget)
+    QSpacerItem, QStackedWidget, QVBoxLayout, QWidget)
+
+from gui.log_view import LogView
 
 class Ui_GenesisPage(object):
     def setupUi(self, GenesisPage):
@@ -152,7 +153,7 @@ class Ui_GenesisPage(object):
 
         self.verticalLayout_3.addWidget(self.contextLabel)
 
-        self.logOutputTextEdit = QTextEdit(self.processingPage)
+        self.logOutputTextEdit = LogView(self.processingPage)
         self.logOutputTextEdit.setObjectName(u"logOutputTextEdit")
         self.logOutputTextEdit.setReadOnly(True)
 
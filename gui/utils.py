@@ -1,9 +1,10 @@
 # gui/utils.py
 
 import logging
-import markdown
 import html
 import re
+from concurrent.futures import Future
+from typing import Optional
 from PySide6.QtCore import QDateTime, QLocale, Qt
 from PySide6.QtWidgets import QMainWindow, QMessageBox
 from .rendering_utils import preprocess_markdown_for_display
@@ -64,16 +65,22 @@ def show_status_message(window: QMainWindow, message: str, level: str = "info",
     else:
         logging.info(f"Status Bar: {message}")
 
-def render_markdown_to_html(markdown_text: str) -> str:
+def render_markdown_to_html(markdown_text: str, wait_for_diagrams: bool = True,
+                            placeholder_renders: Optional[list[Future]] = None) -> str:
     """
     Renders markdown content to HTML, robustly fixing common LLM list errors.
     Includes extensions for tables and fenced code blocks.
+    With wait_for_diagrams=False, diagrams still rendering are shown as placeholders
+    and their renders are added to `placeholder_renders`.
     """
     if not markdown_text:
         return ""
+    import markdown
+
     try:
         # First, preprocess the text to convert Mermaid blocks to <img> tags
-        text_with_images = preprocess_markdown_for_display(markdown_text)
+        text_with_images = preprocess_markdown_for_display(markdown_text, wait_for_diagrams=wait_for_diagrams,
+                                                            placeholder_renders=placeholder_renders)
         # Unescape any remaining HTML entities
         text = html.unescape(text_with_images)
 
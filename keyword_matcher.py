@@ -0,0 +1,120 @@
+# keyword_matcher.py
+
+import re
+from collections import Counter
+from typing import Iterable, Mapping, Optional
+
+
+def _is_word_char(char: str) -> bool:
+    # Underscores do not end a word here, so prefix keywords such as 'sqlite3_' still match 'sqlite3_open'.
+    return char.isalnum()
+
+
+class KeywordMatcher:
+    """
+    Counts or finds many keywords in one pass over a text.
+
+    The keywords of all categories are compiled into a single regular
+    expression shaped as a trie, wrapped in a lookahead so that every position
+    of the text is tried once: occurrences overlapping each other (e.g. 'field'
+    inside 'input field') are all found, as with a separate str.count per
+    keyword. Matching is case-insensitive.
+
+    With whole_words=True a keyword only matches where it is not part of a
+    longer word: an alphanumeric first or last character must not touch
+    another alphanumeric character ('vue' does not match 'revue'). Keywords
+    with punctuation at an edge ('select ', '.db', 'query(') keep plain
+    substring matching at that edge.
+
+    A keyword listed more than once in a category counts that many times.
+    """
+
+    def __init__(self, categories: Mapping[str, Iterable[str]], whole_words: bool = False):
+        self.whole_words = whole_words
+        self._weights: dict[str, Counter] = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                self._weights.setdefault(keyword.lower(), Counter())[category] += 1
+        self.categories = list(categories)
+        keywords = sorted(self._weights)
+        self.max_keyword_length = max(map(len, keywords), default=0)
+
+        # The regex reports the longest keyword at each position; the shorter
+        # keywords it starts with are credited from this table.
+        self._credits: dict[str, Counter] = {}
+        for keyword in keywords:
+            credit = Counter(self._weights[keyword])
+            for end in range(1, len(keyword)):
+                prefix = keyword[:end]
+                if prefix in self._weights and self._ends_match(prefix, keyword[end]):
+                    credit.update(self._weights[prefix])
+            self._credits[keyword] = credit
+
+        self._pattern = re.compile(self._build_pattern(keywords)) if keywords else None
+
+    def _ends_match(self, keyword: str, next_char: str) -> bool:
+        return not (self.whole_words and _is_word_char(keyword[-1]) and _is_word_char(next_char))
+
+    def _trie_pattern(self, keywords: list[str]) -> str:
+        trie: dict = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[None] = keyword
+
+        def build(node) -> str:
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items(), key=lambda item: item[0] or "")
+                        if char is not None]
+            if None in node:
+                # The empty alternative goes last so longer keywords are preferred.
+                keyword = node[None]
+                branches.append(r"(?![^\W_])" if self.whole_words and _is_word_char(keyword[-1]) else "")
+            if len(branches) == 1:
+                return branches[0]
+            return "(?:" + "|".join(branches) + ")"
+
+        return build(trie)
+
+    def _build_pattern(self, keywords: list[str]) -> str:
+        if not self.whole_words:
+            return f"(?=({self._trie_pattern(keywords)}))"
+        bounded = [keyword for keyword in keywords if _is_word_char(keyword[0])]
+        unbounded = [keyword for keyword in keywords if not _is_word_char(keyword[0])]
+        alternatives = []
+        if bounded:
+            alternatives.append(r"(?<![^\W_])" + self._trie_pattern(bounded))
+        if unbounded:
+            alternatives.append(self._trie_pattern(unbounded))
+        return f"(?=({'|'.join(alternatives)}))"
+
+    def keyword_counts(self, text: str) -> Counter:
+        """Occurrences of each longest keyword found at a position, before crediting shorter prefixes."""
+        if not self._pattern or not text:
+            return Counter()
+        return Counter(self._pattern.findall(text.lower()))
+
+    def count(self, text: str) -> dict[str, int]:
+        """Returns {category: number of keyword occurrences} for the text."""
+        totals = Counter()
+        for keyword, occurrences in self.keyword_counts(text).items():
+            for category, weight in self._credits[keyword].items():
+                totals[category] += weight * occurrences
+        return {category: totals.get(category, 0) for category in self.categories}
+
+    def search(self, lowered_text: str, pos: int = 0) -> Optional[re.Match]:
+        """
+        Finds the first keyword at or after `pos` in text that is already
+        lowercase; group(1) of the match is the keyword. Characters before
+        `pos` still count for the whole-word check.
+        """
+        if not self._pattern:
+            return None
+        return self._pattern.search(lowered_text, pos)
+
+    def first_match(self, text: str) -> Optional[str]:
+        """Returns the first keyword found in the text, or None."""
+        if not text:
+            return None
+        match = self.search(text.lower())
+        return match.group(1) if match else None
@@ -1,23 +1,32 @@
 # main.py
 
+# Imported first so that the startup trace covers the imports below.
+import startup_profiler
+from startup_profiler import profiler
+
 import sys
 import os
 import platform
 import ctypes
 from pathlib import Path
-from PySide6.QtWidgets import QApplication, QMessageBox, QSplashScreen, QDialog, QWidget, QStyle
-from PySide6.QtGui import QIcon, QPixmap
-from PySide6.QtCore import Qt, QTimer
 import logging
 from datetime import datetime, timezone
 
-# Import the new config module
-import config
-from klyve_db_manager import KlyveDBManager
-from master_orchestrator import MasterOrchestrator
-from main_window import KlyveMainWindow
-from gui.legal_dialog import LegalDialog
-from gui.utils import center_window
+with profiler.span(startup_profiler.SPAN_IMPORT):
+    from PySide6.QtWidgets import QApplication, QMessageBox, QSplashScreen, QDialog, QWidget, QStyle
+    from PySide6.QtGui import QIcon, QPixmap
+    from PySide6.QtCore import Qt, QTimer, QObject, QEvent
+
+    # Import the new config module
+    import config
+    from klyve_db_manager import KlyveDBManager
+    from master_orchestrator import MasterOrchestrator
+    from main_window import KlyveMainWindow
+    from gui.legal_dialog import LegalDialog
+    from gui.utils import center_window
+
+# How long the splash screen is shown before the main window is built.
+SPLASH_DURATION_MS = 3000
 
 # =========================================================================
 # GLOBAL FIX: Monkey Patch QMessageBox for Linux Centering
@@ -113,6 +122,26 @@ else:
 
 # =========================================================================
 
+class _FirstPaintWatcher(QObject):
+    """
+    Records the first paint of the main window in the startup trace, then
+    writes the trace. In benchmark mode the application quits afterwards.
+    """
+    def __init__(self, window, app, shown_at: float):
+        super().__init__(window)
+        self.app = app
+        self.shown_at = shown_at
+        window.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Paint:
+            watched.removeEventFilter(self)
+            profiler.mark(startup_profiler.SPAN_FIRST_PAINT, since=self.shown_at)
+            profiler.write_trace()
+            if profiler.exit_after_trace:
+                QTimer.singleShot(0, self.app.quit)
+        return False
+
 def initialize_database(db_manager: KlyveDBManager):
     """
     Ensures the database is created and populated with all necessary defaults.
@@ -260,18 +289,21 @@ def _initialize_klyve(app, splash, splash_anchor):
         user_data_dir = Path.home() / ".klyve" / "data"
         user_data_dir.mkdir(parents=True, exist_ok=True)
         db_path = user_data_dir / "klyve.db"
-        db_manager = KlyveDBManager(db_path=str(db_path))
+        with profiler.span(startup_profiler.SPAN_DB_OPEN):
+            db_manager = KlyveDBManager(db_path=str(db_path))
 
-        initialize_database(db_manager)
-        _setup_logging(db_manager)
+        with profiler.span(startup_profiler.SPAN_CONFIG_LOAD):
+            initialize_database(db_manager)
+            _setup_logging(db_manager)
 
-        try:
-            style_file = Path(config.get_resource_path("gui/style.qss"))
-            if style_file.exists():
-                with open(style_file, "r") as f:
-                    app.setStyleSheet(f.read())
-        except Exception as e:
-            logging.error(f"Failed to load stylesheet: {e}")
+        with profiler.span(startup_profiler.SPAN_STYLESHEET):
+            try:
+                style_file = Path(config.get_resource_path("gui/style.qss"))
+                if style_file.exists():
+                    with open(style_file, "r") as f:
+                        app.setStyleSheet(f.read())
+            except Exception as e:
+                logging.error(f"Failed to load stylesheet: {e}")
 
         # --- 5. Legal Guardrail (EULA Check) ---
         if not db_manager.get_config_value("EULA_ACCEPTED_TIMESTAMP"):
@@ -303,13 +335,19 @@ def _initialize_klyve(app, splash, splash_anchor):
                 splash.show()
 
         # --- 6. Initialize Core Components ---
-        orchestrator = MasterOrchestrator(db_manager=db_manager)
+        with profiler.span(startup_profiler.SPAN_ORCHESTRATOR):
+            orchestrator = MasterOrchestrator(db_manager=db_manager)
+        # Make sure a debounced state save is not lost on exit.
+        app.aboutToQuit.connect(orchestrator.flush_state)
 
         # Attach to app so _resolve_parent finds it
-        app._main_window = KlyveMainWindow(orchestrator=orchestrator)
+        with profiler.span(startup_profiler.SPAN_WINDOW_BUILD):
+            app._main_window = KlyveMainWindow(orchestrator=orchestrator)
         window = app._main_window
 
         # --- 7. Launch ---
+        if profiler.enabled:
+            _FirstPaintWatcher(window, app, profiler.now())
         window.showMaximized()
         app.setQuitOnLastWindowClosed(True)
 
@@ -342,6 +380,7 @@ if __name__ == "__main__":
                 pass
 
     try:
+        qt_app_started = profiler.now()
         QApplication.setAttribute(Qt.AA_DontShowIconsInMenus, False)
         app = QApplication(sys.argv)
         sys.excepthook = global_exception_handler
@@ -392,8 +431,11 @@ if __name__ == "__main__":
             except Exception as e:
                 print(f"Failed to load splash screen: {e}")
 
-        # Pass splash_anchor to init for cleanup
-        QTimer.singleShot(3000, lambda: _initialize_klyve(app, splash, splash_anchor))
+        profiler.mark(startup_profiler.SPAN_QT_APP, since=qt_app_started)
+
+        # Pass splash_anchor to init for cleanup. Benchmark runs skip the splash delay.
+        splash_delay = 0 if profiler.exit_after_trace else SPLASH_DURATION_MS
+        QTimer.singleShot(splash_delay, lambda: _initialize_klyve(app, splash, splash_anchor))
 
         sys.exit(app.exec())
 
@@ -15,11 +15,38 @@ else:
         import sqlite3
         logging.critical("CRITICAL: Production mode active but 'sqlcipher3' module not found. Falling back to standard sqlite3 (UNENCRYPTED).")
 from pathlib import Path
+from contextlib import contextmanager
 from dataclasses import dataclass, asdict
-from typing import Optional, List
+from typing import Optional, List, Iterable, Iterator
 import json
 import uuid
-from datetime import datetime, timezone
+from collections import defaultdict
+from datetime import datetime, timezone, timedelta
+
+# Streams of the daily status rollup (see _record_status_changes).
+STATUS_STREAM_BACKLOG = "BACKLOG"                   # CR status, excluding Epics/Features
+STATUS_STREAM_ARTIFACTS = "ARTIFACTS"               # Artifacts.status
+STATUS_STREAM_COMPONENT_TESTS = "COMPONENT_TESTS"   # Artifacts.unit_test_status of code components
+STATUS_STREAM_PHASES = "PHASES"                     # Factory phase entries
+
+# Request types that group other CRs and are not counted as backlog items.
+CONTAINER_REQUEST_TYPES = ('Epic', 'Feature')
+
+# TraceLinks source of the links taken from the project's development plan;
+# links from a sprint plan use the sprint_id as their source.
+TRACE_SOURCE_DEV_PLAN = "DEV_PLAN"
+
+# Tables whose changes bump a project's data version (see get_data_version),
+# with the SQL expression giving the project of a changed {row}.
+DATA_VERSION_SOURCES = {
+    "Projects": "{row}.project_id",
+    "Sprints": "{row}.project_id",
+    "SprintItems": "(SELECT project_id FROM Sprints WHERE sprint_id = {row}.sprint_id)",
+    "ChangeRequestRegister": "{row}.project_id",
+    "Artifacts": "{row}.project_id",
+    "StatusEvents": "{row}.project_id",
+    "TraceLinks": "{row}.project_id",
+}
 
 @dataclass
 class Artifact:
@@ -95,6 +122,57 @@ class KlyveDBManager:
             logging.error(f"Database query failed: {e}\nQuery: {query}")
             raise
 
+    def iter_query_rows(self, query: str, params: tuple = (), batch_size: int = 500) -> Iterator[sqlite3.Row]:
+        """
+        Yields the rows of a read-only query in batches from a dedicated
+        connection, so large result sets never have to be held in memory.
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        except sqlite3.Error as e:
+            logging.error(f"Database query failed: {e}\nQuery: {query}")
+            raise
+        finally:
+            conn.close()
+
+    @contextmanager
+    def bulk_import_transaction(self, tables: list[str]):
+        """
+        Yields a connection for a bulk import, holding the database lock and a
+        single transaction for the whole import. Explicit indexes on the given
+        tables are dropped first and rebuilt once all rows are in, so they are
+        built in one pass instead of being updated row by row.
+        """
+        with self._lock:
+            conn = self._get_connection()
+            try:
+                placeholders = ', '.join('?' for _ in tables)
+                index_rows = conn.execute(
+                    f"SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({placeholders})",
+                    tuple(tables)
+                ).fetchall()
+                conn.execute("BEGIN")
+                for index_row in index_rows:
+                    conn.execute(f"DROP INDEX IF EXISTS {index_row['name']}")
+
+                yield conn
+
+                for index_row in index_rows:
+                    conn.execute(index_row['sql'])
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logging.error(f"Bulk import failed and was rolled back: {e}")
+                raise
+            finally:
+                conn.close()
+
     def create_tables(self):
         create_projects_table = """
         CREATE TABLE IF NOT EXISTS Projects (
@@ -200,6 +278,29 @@ class KlyveDBManager:
         );"""
         self._execute_query(create_orchestration_state_table)
 
+        create_orchestration_state_fields_table = """
+        CREATE TABLE IF NOT EXISTS OrchestrationStateFields (
+            project_id TEXT NOT NULL, field_name TEXT NOT NULL,
+            value_json TEXT, blob_hash TEXT,
+            PRIMARY KEY (project_id, field_name)
+        );"""
+        self._execute_query(create_orchestration_state_fields_table)
+
+        create_orchestration_state_blobs_table = """
+        CREATE TABLE IF NOT EXISTS OrchestrationStateBlobs (
+            project_id TEXT NOT NULL, blob_hash TEXT NOT NULL, content TEXT NOT NULL,
+            PRIMARY KEY (project_id, blob_hash)
+        );"""
+        self._execute_query(create_orchestration_state_blobs_table)
+
+        create_orchestration_journal_table = """
+        CREATE TABLE IF NOT EXISTS OrchestrationJournal (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT, project_id TEXT NOT NULL,
+            event_type TEXT NOT NULL, payload TEXT, timestamp TEXT NOT NULL
+        );"""
+        self._execute_query(create_orchestration_journal_table)
+        self._execute_query("CREATE INDEX IF NOT EXISTS idx_orchestration_journal_project ON OrchestrationJournal (project_id, seq);")
+
         create_factory_config_table = "CREATE TABLE IF NOT EXISTS FactoryConfig ( key TEXT PRIMARY KEY, value TEXT, description TEXT );"
         self._execute_query(create_factory_config_table)
 
@@ -219,6 +320,108 @@ class KlyveDBManager:
         );"""
         self._execute_query(create_factory_templates_table)
 
+        # Local BM25 search index over artifacts and spec sections
+        create_search_documents_table = """
+        CREATE TABLE IF NOT EXISTS SearchDocuments (
+            doc_key TEXT PRIMARY KEY,
+            project_id TEXT NOT NULL,
+            doc_type TEXT NOT NULL,
+            ref_id TEXT NOT NULL,
+            title TEXT,
+            term_count INTEGER NOT NULL DEFAULT 0,
+            content_hash TEXT,
+            FOREIGN KEY (project_id) REFERENCES Projects (project_id)
+        );"""
+        self._execute_query(create_search_documents_table)
+        self._execute_query("CREATE INDEX IF NOT EXISTS idx_search_documents_project ON SearchDocuments (project_id, doc_type);")
+
+        create_search_postings_table = """
+        CREATE TABLE IF NOT EXISTS SearchPostings (
+            project_id TEXT NOT NULL,
+            term TEXT NOT NULL,
+            doc_key TEXT NOT NULL,
+            term_frequency INTEGER NOT NULL,
+            PRIMARY KEY (project_id, term, doc_key)
+        );"""
+        self._execute_query(create_search_postings_table)
+        self._execute_query("CREATE INDEX IF NOT EXISTS idx_search_postings_doc ON SearchPostings (doc_key);")
+
+        # Append-only status history, with a per-day rollup maintained alongside it for reports
+        create_status_events_table = """
+        CREATE TABLE IF NOT EXISTS StatusEvents (
+            event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id TEXT NOT NULL,
+            entity_type TEXT NOT NULL,
+            entity_id TEXT NOT NULL,
+            stream TEXT,
+            old_status TEXT,
+            new_status TEXT,
+            timestamp TEXT NOT NULL
+        );"""
+        self._execute_query(create_status_events_table)
+        self._execute_query("CREATE INDEX IF NOT EXISTS idx_status_events_entity ON StatusEvents (entity_type, entity_id, event_id);")
+        self._execute_query("CREATE INDEX IF NOT EXISTS idx_status_events_project ON StatusEvents (project_id, stream, timestamp);")
+
+        create_status_daily_rollup_table = """
+        CREATE TABLE IF NOT EXISTS StatusDailyRollup (
+            project_id TEXT NOT NULL,
+            stream TEXT NOT NULL,
+            bucket_date TEXT NOT NULL,
+            status TEXT NOT NULL,
+            entered_count INTEGER NOT NULL DEFAULT 0,
+            exited_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (project_id, stream, bucket_date, status)
+        );"""
+        self._execute_query(create_status_daily_rollup_table)
+
+        # Which backlog items each planned task (micro_spec_id) implements, taken from the saved plans
+        create_trace_links_table = """
+        CREATE TABLE IF NOT EXISTS TraceLinks (
+            project_id TEXT NOT NULL,
+            source TEXT NOT NULL,
+            cr_id INTEGER NOT NULL,
+            micro_spec_id TEXT NOT NULL,
+            PRIMARY KEY (project_id, source, cr_id, micro_spec_id)
+        );"""
+        self._execute_query(create_trace_links_table)
+        self._execute_query("CREATE INDEX IF NOT EXISTS idx_trace_links_cr ON TraceLinks (project_id, cr_id);")
+
+        # The plan sources already indexed into TraceLinks, including plans that yielded no links
+        create_trace_link_sources_table = """
+        CREATE TABLE IF NOT EXISTS TraceLinkSources (
+            project_id TEXT NOT NULL,
+            source TEXT NOT NULL,
+            PRIMARY KEY (project_id, source)
+        );"""
+        self._execute_query(create_trace_link_sources_table)
+        self._execute_query("CREATE INDEX IF NOT EXISTS idx_artifacts_micro_spec ON Artifacts (project_id, micro_spec_id);")
+
+        # Per-project change counter, maintained by triggers, used to key cached reports
+        create_data_version_table = """
+        CREATE TABLE IF NOT EXISTS DataVersion (
+            project_id TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        );"""
+        self._execute_query(create_data_version_table)
+        for table, project_expression in DATA_VERSION_SOURCES.items():
+            for operation, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+                self._execute_query(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_data_version_{table.lower()}_{operation.lower()}
+                AFTER {operation} ON {table}
+                BEGIN
+                    INSERT INTO DataVersion (project_id, version)
+                    SELECT {project_expression.format(row=row)} AS changed_project_id, 1 WHERE changed_project_id IS NOT NULL
+                    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+                END;""")
+        # Report styling comes from the factory config, so a config change invalidates every project.
+        for operation in ("INSERT", "UPDATE"):
+            self._execute_query(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_data_version_factoryconfig_{operation.lower()}
+            AFTER {operation} ON FactoryConfig
+            BEGIN
+                UPDATE DataVersion SET version = version + 1;
+            END;""")
+
         logging.info("Finished creating/verifying database tables.")
 
     def create_project(self, project_id: str, project_name: str, project_root: str, creation_timestamp: str) -> str:
@@ -249,6 +452,10 @@ class KlyveDBManager:
     def get_all_artifacts_for_project(self, project_id: str) -> List[sqlite3.Row]:
         return self._execute_query("SELECT * FROM Artifacts WHERE project_id = ? ORDER BY artifact_name", (project_id,), fetch="all")
 
+    def iter_artifacts_for_project(self, project_id: str) -> Iterator[sqlite3.Row]:
+        """Streams all artifacts for a project without loading them into memory at once."""
+        return self.iter_query_rows("SELECT * FROM Artifacts WHERE project_id = ? ORDER BY artifact_id", (project_id,))
+
     def get_artifact_by_path(self, project_id: str, file_path: str) -> Optional[sqlite3.Row]:
         """Retrieves a single artifact record by its unique file path for a given project."""
         return self._execute_query(
@@ -330,7 +537,36 @@ class KlyveDBManager:
     def add_or_update_artifact(self, artifact_data: dict):
         if 'artifact_id' not in artifact_data: raise ValueError("artifact_data must contain 'artifact_id'.")
         columns, placeholders = ', '.join(artifact_data.keys()), ', '.join('?' * len(artifact_data))
-        self._execute_query(f"INSERT OR REPLACE INTO Artifacts ({columns}) VALUES ({placeholders})", tuple(artifact_data.values()))
+        try:
+            with self._lock:
+                conn = self._get_connection()
+                with conn:
+                    previous = conn.execute(
+                        "SELECT project_id, status, unit_test_status FROM Artifacts WHERE artifact_id = ?",
+                        (artifact_data['artifact_id'],)
+                    ).fetchone()
+                    conn.execute(f"INSERT OR REPLACE INTO Artifacts ({columns}) VALUES ({placeholders})", tuple(artifact_data.values()))
+                    self._record_status_changes(conn, self._artifact_status_changes(artifact_data, previous),
+                                                artifact_data.get('last_modified_timestamp') or datetime.now(timezone.utc).isoformat())
+        except sqlite3.Error as e:
+            logging.error(f"Failed to save artifact {artifact_data['artifact_id']}: {e}")
+            raise
+
+    @staticmethod
+    def _artifact_status_changes(artifact_data: dict, previous: Optional[sqlite3.Row]) -> list[tuple]:
+        """The status history entries implied by upserting an artifact over its previous row (if any)."""
+        project_id = artifact_data.get('project_id') or (previous['project_id'] if previous else None)
+        if not project_id:
+            return []
+        artifact_id = artifact_data['artifact_id']
+        changes = []
+        if 'status' in artifact_data:
+            changes.append((project_id, 'ARTIFACT', artifact_id, STATUS_STREAM_ARTIFACTS,
+                            previous['status'] if previous else None, artifact_data['status']))
+        if 'unit_test_status' in artifact_data and artifact_data.get('artifact_type') == 'code':
+            changes.append((project_id, 'ARTIFACT_TESTS', artifact_id, STATUS_STREAM_COMPONENT_TESTS,
+                            previous['unit_test_status'] if previous else None, artifact_data['unit_test_status']))
+        return changes
 
     def add_brownfield_artifact(self, artifact_data: dict):
         """
@@ -426,6 +662,13 @@ class KlyveDBManager:
     def add_project_to_history(self, project_id: str, project_name: str, root_folder: str, archive_path: str, timestamp: str):
         self._execute_query("INSERT INTO ProjectHistory (project_id, project_name, project_root_folder, archive_file_path, last_stop_timestamp) VALUES (?, ?, ?, ?, ?)", (project_id, project_name, root_folder, archive_path, timestamp))
 
+    def get_latest_history_for_project(self, project_id: str) -> Optional[sqlite3.Row]:
+        """Retrieves the most recent archive history record for a project."""
+        return self._execute_query(
+            "SELECT * FROM ProjectHistory WHERE project_id = ? ORDER BY last_stop_timestamp DESC, history_id DESC LIMIT 1",
+            (project_id,), fetch="one"
+        )
+
     def get_project_history(self) -> list[sqlite3.Row]:
         return self._execute_query("SELECT * FROM ProjectHistory ORDER BY last_stop_timestamp DESC", fetch="all")
 
@@ -460,6 +703,10 @@ class KlyveDBManager:
     def get_all_change_requests_for_project(self, project_id: str) -> list:
         return self._execute_query("SELECT * FROM ChangeRequestRegister WHERE project_id = ? ORDER BY display_order ASC", (project_id,), fetch="all")
 
+    def iter_change_requests_for_project(self, project_id: str) -> Iterator[sqlite3.Row]:
+        """Streams all CRs for a project without loading them into memory at once."""
+        return self.iter_query_rows("SELECT * FROM ChangeRequestRegister WHERE project_id = ? ORDER BY cr_id", (project_id,))
+
     def get_top_level_items_for_project(self, project_id: str) -> list:
         """Retrieves all top-level items (those without a parent) for a project."""
         return self._execute_query(
@@ -701,7 +948,9 @@ class KlyveDBManager:
         logging.info(f"Removed all item links for sprint {sprint_id}.")
 
     def delete_sprint(self, sprint_id: str):
-        """Deletes a sprint record from the Sprints table."""
+        """Deletes a sprint record from the Sprints table, with the trace links of its plan."""
+        self._execute_query("DELETE FROM TraceLinks WHERE source = ?", (sprint_id,))
+        self._execute_query("DELETE FROM TraceLinkSources WHERE source = ?", (sprint_id,))
         query = "DELETE FROM Sprints WHERE sprint_id = ?"
         self._execute_query(query, (sprint_id,))
         logging.info(f"Deleted sprint record for sprint {sprint_id}.")
@@ -783,10 +1032,15 @@ class KlyveDBManager:
             query = f"UPDATE ChangeRequestRegister SET status = ?, last_modified_timestamp = ? WHERE cr_id IN ({placeholders})"
             params = (new_status, timestamp) + tuple(cr_ids)
 
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                conn.commit()
+            with self._lock:
+                conn = self._get_connection()
+                with conn:
+                    previous_rows = conn.execute(
+                        f"SELECT cr_id, project_id, status, request_type FROM ChangeRequestRegister WHERE cr_id IN ({placeholders})",
+                        tuple(cr_ids)
+                    ).fetchall()
+                    conn.execute(query, params)
+                    self._record_status_changes(conn, [self._cr_status_change(row, new_status) for row in previous_rows], timestamp)
                 logging.info(f"Successfully batch-updated status to '{new_status}' for {len(cr_ids)} items.")
         except sqlite3.Error as e:
             logging.error(f"Failed to batch-update CR status: {e}")
@@ -809,8 +1063,89 @@ class KlyveDBManager:
         return self._execute_query("SELECT * FROM OrchestrationState WHERE project_id = ?", (project_id,), fetch="one")
 
     def delete_orchestration_state_for_project(self, project_id: str):
+        self._execute_query("DELETE FROM OrchestrationJournal WHERE project_id = ?", (project_id,))
+        self._execute_query("DELETE FROM OrchestrationStateFields WHERE project_id = ?", (project_id,))
+        self._execute_query("DELETE FROM OrchestrationStateBlobs WHERE project_id = ?", (project_id,))
         self._execute_query("DELETE FROM OrchestrationState WHERE project_id = ?", (project_id,))
 
+    def upsert_orchestration_state(self, project_id: str, current_phase: str, current_step: str, timestamp: str,
+                                   changed_fields: list[tuple[str, Optional[str], Optional[str]]], new_blobs: dict[str, str],
+                                   compact_through_seq: Optional[int] = None):
+        """
+        Updates the saved orchestration state in a single transaction, writing
+        only the fields that changed.
+
+        Args:
+            changed_fields: (field_name, value_json, blob_hash) tuples. Exactly one of
+                value_json / blob_hash is used for each field.
+            new_blobs: {blob_hash: content} for blob fields. Blobs that already exist
+                are left untouched; blobs no longer referenced are removed.
+            compact_through_seq: If given, journal events up to and including this
+                sequence number are removed, as the snapshot now covers them.
+        """
+        try:
+            with self._lock:
+                conn = self._get_connection()
+                with conn:
+                    conn.execute(
+                        """INSERT INTO OrchestrationState (project_id, current_phase, current_step, state_details, last_updated)
+                           VALUES (?, ?, ?, NULL, ?)
+                           ON CONFLICT(project_id) DO UPDATE SET current_phase = excluded.current_phase,
+                               current_step = excluded.current_step, state_details = NULL, last_updated = excluded.last_updated""",
+                        (project_id, current_phase, current_step, timestamp)
+                    )
+                    if new_blobs:
+                        conn.executemany(
+                            "INSERT OR IGNORE INTO OrchestrationStateBlobs (project_id, blob_hash, content) VALUES (?, ?, ?)",
+                            [(project_id, blob_hash, content) for blob_hash, content in new_blobs.items()]
+                        )
+                    if changed_fields:
+                        conn.executemany(
+                            """INSERT INTO OrchestrationStateFields (project_id, field_name, value_json, blob_hash) VALUES (?, ?, ?, ?)
+                               ON CONFLICT(project_id, field_name) DO UPDATE SET value_json = excluded.value_json, blob_hash = excluded.blob_hash""",
+                            [(project_id, field_name, value_json, blob_hash) for field_name, value_json, blob_hash in changed_fields]
+                        )
+                    if changed_fields:
+                        conn.execute(
+                            """DELETE FROM OrchestrationStateBlobs WHERE project_id = ? AND blob_hash NOT IN
+                               (SELECT blob_hash FROM OrchestrationStateFields WHERE project_id = ? AND blob_hash IS NOT NULL)""",
+                            (project_id, project_id)
+                        )
+                    if compact_through_seq is not None:
+                        conn.execute("DELETE FROM OrchestrationJournal WHERE project_id = ? AND seq <= ?", (project_id, compact_through_seq))
+        except sqlite3.Error as e:
+            logging.error(f"Failed to save orchestration state for project {project_id}: {e}")
+            raise
+
+    def append_orchestration_event(self, project_id: str, event_type: str, payload: str, timestamp: str) -> int:
+        """Appends an event to the orchestration journal and returns its sequence number."""
+        cursor = self._execute_query(
+            "INSERT INTO OrchestrationJournal (project_id, event_type, payload, timestamp) VALUES (?, ?, ?, ?)",
+            (project_id, event_type, payload, timestamp)
+        )
+        return cursor.lastrowid
+
+    def get_orchestration_events(self, project_id: str, after_seq: int = 0) -> List[sqlite3.Row]:
+        """Retrieves the journal events for a project newer than the given sequence number, oldest first."""
+        return self._execute_query(
+            "SELECT * FROM OrchestrationJournal WHERE project_id = ? AND seq > ? ORDER BY seq",
+            (project_id, after_seq), fetch="all"
+        )
+
+    def get_latest_orchestration_event_seq(self, project_id: str) -> int:
+        row = self._execute_query("SELECT MAX(seq) AS max_seq FROM OrchestrationJournal WHERE project_id = ?", (project_id,), fetch="one")
+        return (row['max_seq'] or 0) if row else 0
+
+    def get_orchestration_state_fields(self, project_id: str) -> List[sqlite3.Row]:
+        """Retrieves the saved state fields for a project, with blob contents resolved."""
+        query = """
+            SELECT f.field_name, f.value_json, f.blob_hash, b.content AS blob_content
+            FROM OrchestrationStateFields f
+            LEFT JOIN OrchestrationStateBlobs b ON b.project_id = f.project_id AND b.blob_hash = f.blob_hash
+            WHERE f.project_id = ?
+        """
+        return self._execute_query(query, (project_id,), fetch="all")
+
     def update_cr_impact_analysis(self, cr_id: int, rating: str, details: str, artifact_ids: list[str]):
         ids_json = json.dumps(artifact_ids)
         timestamp = datetime.now(timezone.utc).isoformat()
@@ -849,7 +1184,25 @@ class KlyveDBManager:
     def update_cr_status(self, cr_id: int, new_status: str):
         timestamp = datetime.now(timezone.utc).isoformat()
         query = "UPDATE ChangeRequestRegister SET status = ?, last_modified_timestamp = ? WHERE cr_id = ?"
-        self._execute_query(query, (new_status, timestamp, cr_id))
+        try:
+            with self._lock:
+                conn = self._get_connection()
+                with conn:
+                    previous = conn.execute(
+                        "SELECT cr_id, project_id, status, request_type FROM ChangeRequestRegister WHERE cr_id = ?", (cr_id,)
+                    ).fetchone()
+                    conn.execute(query, (new_status, timestamp, cr_id))
+                    if previous:
+                        self._record_status_changes(conn, [self._cr_status_change(previous, new_status)], timestamp)
+        except sqlite3.Error as e:
+            logging.error(f"Failed to update status of CR {cr_id}: {e}")
+            raise
+
+    @staticmethod
+    def _cr_status_change(previous: sqlite3.Row, new_status: str) -> tuple:
+        # Epics and Features keep their history but are left out of the backlog rollup.
+        stream = None if previous['request_type'] in CONTAINER_REQUEST_TYPES else STATUS_STREAM_BACKLOG
+        return (previous['project_id'], 'CR', str(previous['cr_id']), stream, previous['status'], new_status)
 
     def update_cr_field(self, cr_id: int, field_name: str, value: any):
         """Surgically updates a single field for a given CR item."""
@@ -912,16 +1265,8 @@ class KlyveDBManager:
         params = (project_id,) + tuple(statuses)
         return self._execute_query(query, params, fetch="all")
 
-    def get_change_requests_filtered(self, project_id: str, statuses: list[str] | None = None, types: list[str] | None = None) -> list:
-        """
-        Retrieves ChangeRequestRegister records for a project, optionally filtered
-        by lists of statuses and/or request types.
-        Returns items ordered by display_order.
-        """
-        if not statuses and not types:
-            # If no filters, use the existing efficient method
-            return self.get_all_change_requests_for_project(project_id)
-
+    @staticmethod
+    def _filtered_change_requests_query(project_id: str, statuses: list[str] | None, types: list[str] | None) -> tuple[str, tuple]:
         query_parts = ["SELECT * FROM ChangeRequestRegister WHERE project_id = ?"]
         params = [project_id]
 
@@ -936,18 +1281,53 @@ class KlyveDBManager:
             params.extend(types)
 
         query_parts.append("ORDER BY display_order ASC")
-        final_query = " ".join(query_parts)
+        return " ".join(query_parts), tuple(params)
 
+    def get_change_requests_filtered(self, project_id: str, statuses: list[str] | None = None, types: list[str] | None = None) -> list:
+        """
+        Retrieves ChangeRequestRegister records for a project, optionally filtered
+        by lists of statuses and/or request types.
+        Returns items ordered by display_order.
+        """
+        if not statuses and not types:
+            # If no filters, use the existing efficient method
+            return self.get_all_change_requests_for_project(project_id)
+
+        final_query, params = self._filtered_change_requests_query(project_id, statuses, types)
         logging.debug(f"Executing filtered CR query: {final_query} with params: {params}")
         try:
-            return self._execute_query(final_query, tuple(params), fetch="all")
+            return self._execute_query(final_query, params, fetch="all")
         except sqlite3.Error as e:
             logging.error(f"Failed to execute filtered CR query: {e}")
             return []
 
+    def iter_change_requests_filtered(self, project_id: str, statuses: list[str] | None = None, types: list[str] | None = None) -> Iterator[sqlite3.Row]:
+        """Streams the records of get_change_requests_filtered without loading them into memory at once."""
+        final_query, params = self._filtered_change_requests_query(project_id, statuses, types)
+        return self.iter_query_rows(final_query, params)
+
+    def get_backlog_tree_links(self, project_id: str) -> list:
+        """Returns (cr_id, parent_cr_id, display_order) for every CR of a project, ordered by cr_id."""
+        return self._execute_query(
+            "SELECT cr_id, parent_cr_id, display_order FROM ChangeRequestRegister WHERE project_id = ? ORDER BY cr_id",
+            (project_id,), fetch="all"
+        )
+
     def update_artifact_status(self, artifact_id: str, status: str, timestamp: str):
         query = "UPDATE Artifacts SET status = ?, last_modified_timestamp = ? WHERE artifact_id = ?"
-        self._execute_query(query, (status, timestamp, artifact_id))
+        try:
+            with self._lock:
+                conn = self._get_connection()
+                with conn:
+                    previous = conn.execute("SELECT project_id, status FROM Artifacts WHERE artifact_id = ?", (artifact_id,)).fetchone()
+                    conn.execute(query, (status, timestamp, artifact_id))
+                    if previous:
+                        self._record_status_changes(
+                            conn, [(previous['project_id'], 'ARTIFACT', artifact_id, STATUS_STREAM_ARTIFACTS, previous['status'], status)], timestamp
+                        )
+        except sqlite3.Error as e:
+            logging.error(f"Failed to update status of artifact {artifact_id}: {e}")
+            raise
 
     def add_document_log_entry(self, project_id: str, document_path: str, author: str, log_text: str, status: str = ""):
         """
@@ -997,4 +1377,298 @@ class KlyveDBManager:
             return [dict(row) for row in rows]
         except Exception as e:
             logging.error(f"Database error while fetching document log: {e}", exc_info=True)
-            return []
\ No newline at end of file
+            return []
+
+    # --- Status History (StatusEvents / StatusDailyRollup) ---
+
+    def _record_status_changes(self, conn, changes: list[tuple], timestamp: str):
+        """
+        Appends status-change events and folds them into the daily rollup, as
+        part of the caller's transaction.
+
+        Args:
+            changes: (project_id, entity_type, entity_id, stream, old_status, new_status)
+                tuples. Entries whose status did not change are ignored; entries with
+                no stream are kept in the event log only.
+            timestamp: ISO 8601 UTC timestamp of the change; its date is the rollup bucket.
+        """
+        changes = [change for change in changes if change[4] != change[5]]
+        if not changes:
+            return
+        conn.executemany(
+            "INSERT INTO StatusEvents (project_id, entity_type, entity_id, stream, old_status, new_status, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [change + (timestamp,) for change in changes]
+        )
+
+        deltas = defaultdict(lambda: [0, 0])
+        for project_id, _, _, stream, old_status, new_status in changes:
+            if stream is None:
+                continue
+            if new_status:
+                deltas[(project_id, stream, new_status)][0] += 1
+            if old_status:
+                deltas[(project_id, stream, old_status)][1] += 1
+        if deltas:
+            bucket_date = timestamp[:10]
+            conn.executemany(
+                """INSERT INTO StatusDailyRollup (project_id, stream, bucket_date, status, entered_count, exited_count) VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(project_id, stream, bucket_date, status) DO UPDATE SET
+                       entered_count = entered_count + excluded.entered_count, exited_count = exited_count + excluded.exited_count""",
+                [(project_id, stream, bucket_date, status, entered, exited)
+                 for (project_id, stream, status), (entered, exited) in deltas.items()]
+            )
+
+    def record_phase_change(self, project_id: str, old_phase: Optional[str], new_phase: str):
+        """Records a factory phase transition in the status history."""
+        timestamp = datetime.now(timezone.utc).isoformat()
+        try:
+            with self._lock:
+                conn = self._get_connection()
+                with conn:
+                    self._record_status_changes(
+                        conn, [(project_id, 'PHASE', project_id, STATUS_STREAM_PHASES, old_phase, new_phase)], timestamp
+                    )
+        except sqlite3.Error as e:
+            logging.error(f"Failed to record phase change for project {project_id}: {e}")
+            raise
+
+    def get_daily_status_counts(self, project_id: str, stream: str, current_counts: dict[str, int]) -> tuple[list[str], dict[str, list[int]]]:
+        """
+        Reconstructs the number of items in each status at the end of every day
+        that has recorded changes (and the day before the first one), working
+        back from the current counts through the daily rollup. Today is always
+        the last day.
+
+        Backlog items created after history starts are removed from the days
+        before their creation, so they do not appear in earlier columns.
+
+        Returns:
+            (dates, {status: [count per date]}), dates as 'YYYY-MM-DD', oldest first.
+        """
+        rows = self._execute_query(
+            "SELECT bucket_date, status, entered_count - exited_count AS net FROM StatusDailyRollup WHERE project_id = ? AND stream = ?",
+            (project_id, stream), fetch="all"
+        )
+        net_by_date = defaultdict(lambda: defaultdict(int))
+        for row in rows:
+            net_by_date[row['bucket_date']][row['status']] += row['net']
+
+        if net_by_date and stream == STATUS_STREAM_BACKLOG:
+            placeholders = ', '.join('?' for _ in CONTAINER_REQUEST_TYPES)
+            created_rows = self._execute_query(
+                f"""SELECT substr(cr.creation_timestamp, 1, 10) AS bucket_date,
+                           COALESCE((SELECT e.old_status FROM StatusEvents e
+                                     WHERE e.entity_type = 'CR' AND e.entity_id = CAST(cr.cr_id AS TEXT)
+                                     ORDER BY e.event_id LIMIT 1), cr.status) AS status,
+                           COUNT(*) AS created
+                    FROM ChangeRequestRegister cr
+                    WHERE cr.project_id = ? AND cr.request_type NOT IN ({placeholders}) AND cr.creation_timestamp >= ?
+                    GROUP BY 1, 2""",
+                (project_id,) + CONTAINER_REQUEST_TYPES + (min(net_by_date),), fetch="all"
+            )
+            for row in created_rows:
+                if row['status']:
+                    net_by_date[row['bucket_date']][row['status']] += row['created']
+
+        today = datetime.now(timezone.utc).date().isoformat()
+        dates = sorted(set(net_by_date) | {today})
+        if net_by_date:
+            # The day before the first change shows the starting point.
+            dates.insert(0, (datetime.fromisoformat(dates[0]) - timedelta(days=1)).date().isoformat())
+        statuses = sorted(set(current_counts) | {status for net in net_by_date.values() for status in net})
+
+        running = {status: current_counts.get(status, 0) for status in statuses}
+        series = {status: [0] * len(dates) for status in statuses}
+        for index in range(len(dates) - 1, -1, -1):
+            for status in statuses:
+                series[status][index] = max(running[status], 0)
+            for status, net in net_by_date.get(dates[index], {}).items():
+                running[status] -= net
+        return dates, series
+
+    def get_sprint_burndown(self, sprint_id: str, points_by_complexity: dict[str, int], done_statuses: tuple = ('COMPLETED',)) -> Optional[dict]:
+        """
+        Computes the remaining complexity points of a sprint at the end of each
+        day, from its start until it ended (or today), using the status history
+        of the sprint's items.
+
+        Returns:
+            {'sprint_id', 'total', 'dates': [...], 'remaining': [...]}, or None if
+            the sprint does not exist.
+        """
+        sprint = self._execute_query("SELECT start_timestamp, end_timestamp FROM Sprints WHERE sprint_id = ?", (sprint_id,), fetch="one")
+        if not sprint:
+            return None
+        items = self.get_items_for_sprint(sprint_id)
+        points = {str(item['cr_id']): points_by_complexity.get(item['complexity'], 0) for item in items}
+        status_by_item = {str(item['cr_id']): item['status'] for item in items}
+
+        events = []
+        if points:
+            placeholders = ', '.join('?' for _ in points)
+            events = self._execute_query(
+                f"SELECT entity_id, old_status, new_status, timestamp FROM StatusEvents WHERE entity_type = 'CR' AND entity_id IN ({placeholders}) ORDER BY event_id",
+                tuple(points), fetch="all"
+            )
+        # Each item starts in the status it had before its first recorded change.
+        for event in reversed(events):
+            status_by_item[event['entity_id']] = event['old_status']
+
+        start_date = datetime.fromisoformat(sprint['start_timestamp']).date()
+        end_date = datetime.fromisoformat(sprint['end_timestamp']).date() if sprint['end_timestamp'] else datetime.now(timezone.utc).date()
+        dates = []
+        remaining = []
+        event_index = 0
+        day = min(start_date, end_date)
+        while day <= end_date:
+            day_end = (day + timedelta(days=1)).isoformat()
+            while event_index < len(events) and events[event_index]['timestamp'][:10] < day_end:
+                status_by_item[events[event_index]['entity_id']] = events[event_index]['new_status']
+                event_index += 1
+            dates.append(day.isoformat())
+            remaining.append(sum(value for item_id, value in points.items() if status_by_item.get(item_id) not in done_statuses))
+            day += timedelta(days=1)
+
+        return {'sprint_id': sprint_id, 'total': sum(points.values()), 'dates': dates, 'remaining': remaining}
+
+    def get_status_entry_count(self, project_id: str, stream: str, status: str) -> int:
+        """How many times anything entered the given status over the project's history."""
+        row = self._execute_query(
+            "SELECT COALESCE(SUM(entered_count), 0) AS total FROM StatusDailyRollup WHERE project_id = ? AND stream = ? AND status = ?",
+            (project_id, stream, status), fetch="one"
+        )
+        return row['total'] if row else 0
+
+    def delete_status_history_for_project(self, project_id: str):
+        self._execute_query("DELETE FROM StatusDailyRollup WHERE project_id = ?", (project_id,))
+        self._execute_query("DELETE FROM StatusEvents WHERE project_id = ?", (project_id,))
+
+    # --- Traceability links (see agents/agent_traceability_report.py) ---
+
+    def replace_trace_links(self, project_id: str, source: str, links: Iterable[tuple[int, str]]):
+        """
+        Replaces the (cr_id, micro_spec_id) links recorded from one plan source
+        (TRACE_SOURCE_DEV_PLAN or a sprint_id) in a single transaction, and
+        marks the source as indexed even when it has no links.
+        """
+        try:
+            with self._lock:
+                conn = self._get_connection()
+                with conn:
+                    conn.execute("DELETE FROM TraceLinks WHERE project_id = ? AND source = ?", (project_id, source))
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO TraceLinks (project_id, source, cr_id, micro_spec_id) VALUES (?, ?, ?, ?)",
+                        ((project_id, source, cr_id, micro_spec_id) for cr_id, micro_spec_id in links)
+                    )
+                    conn.execute("INSERT OR IGNORE INTO TraceLinkSources (project_id, source) VALUES (?, ?)", (project_id, source))
+        except sqlite3.Error as e:
+            logging.error(f"Failed to save trace links from '{source}' for project {project_id}: {e}")
+            raise
+
+    def get_trace_link_sources(self, project_id: str) -> set[str]:
+        rows = self._execute_query("SELECT source FROM TraceLinkSources WHERE project_id = ?", (project_id,), fetch="all")
+        return {row['source'] for row in rows}
+
+    def get_trace_matrix_rows(self, project_id: str) -> list:
+        """
+        Returns one row per (backlog item, implemented artifact) pair, joining
+        the backlog through TraceLinks to the artifacts of the linked tasks.
+        Items with no artifact come back once, with NULL artifact columns.
+        """
+        query = """
+        SELECT cr.cr_id, cr.title, cr.status, a.artifact_id, a.file_path, a.artifact_name
+        FROM ChangeRequestRegister cr
+        LEFT JOIN (SELECT DISTINCT cr_id, micro_spec_id FROM TraceLinks WHERE project_id = ?) tl ON tl.cr_id = cr.cr_id
+        LEFT JOIN Artifacts a ON a.project_id = cr.project_id AND a.micro_spec_id = tl.micro_spec_id
+        WHERE cr.project_id = ?
+        GROUP BY cr.cr_id, a.artifact_id
+        ORDER BY cr.cr_id, a.artifact_id IS NULL, a.file_path
+        """
+        return self._execute_query(query, (project_id, project_id), fetch="all")
+
+    def delete_trace_links_for_project(self, project_id: str):
+        self._execute_query("DELETE FROM TraceLinks WHERE project_id = ?", (project_id,))
+        self._execute_query("DELETE FROM TraceLinkSources WHERE project_id = ?", (project_id,))
+
+    def get_data_version(self, project_id: str) -> int:
+        """
+        Returns the project's data version: a counter that increases with every
+        change to its backlog, sprints, artifacts, status history or project
+        record. It is never reset, so equal versions mean unchanged data.
+        """
+        row = self._execute_query("SELECT version FROM DataVersion WHERE project_id = ?", (project_id,), fetch="one")
+        return row['version'] if row else 0
+
+    # --- Search Index (see search_index.py) ---
+
+    def replace_search_document(self, doc_key: str, project_id: str, doc_type: str, ref_id: str, title: str,
+                                term_frequencies: dict[str, int], content_hash: str):
+        """
+        Replaces a document and all of its postings in the search index in a
+        single transaction.
+        """
+        try:
+            with self._lock:
+                conn = self._get_connection()
+                with conn:
+                    conn.execute("DELETE FROM SearchPostings WHERE doc_key = ?", (doc_key,))
+                    conn.execute(
+                        "INSERT OR REPLACE INTO SearchDocuments (doc_key, project_id, doc_type, ref_id, title, term_count, content_hash) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (doc_key, project_id, doc_type, ref_id, title, sum(term_frequencies.values()), content_hash)
+                    )
+                    conn.executemany(
+                        "INSERT INTO SearchPostings (project_id, term, doc_key, term_frequency) VALUES (?, ?, ?, ?)",
+                        [(project_id, term, doc_key, frequency) for term, frequency in term_frequencies.items()]
+                    )
+        except sqlite3.Error as e:
+            logging.error(f"Failed to update search index for document {doc_key}: {e}")
+            raise
+
+    def delete_search_documents(self, doc_keys: list[str]):
+        """Removes documents and their postings from the search index."""
+        if not doc_keys:
+            return
+        placeholders = ', '.join('?' for _ in doc_keys)
+        try:
+            with self._lock:
+                conn = self._get_connection()
+                with conn:
+                    conn.execute(f"DELETE FROM SearchPostings WHERE doc_key IN ({placeholders})", tuple(doc_keys))
+                    conn.execute(f"DELETE FROM SearchDocuments WHERE doc_key IN ({placeholders})", tuple(doc_keys))
+        except sqlite3.Error as e:
+            logging.error(f"Failed to delete search index documents: {e}")
+            raise
+
+    def delete_search_index_for_project(self, project_id: str):
+        self._execute_query("DELETE FROM SearchPostings WHERE project_id = ?", (project_id,))
+        self._execute_query("DELETE FROM SearchDocuments WHERE project_id = ?", (project_id,))
+
+    def get_search_document_hashes(self, project_id: str, doc_type: str) -> dict[str, str]:
+        """Returns {doc_key: content_hash} for all indexed documents of one type."""
+        rows = self._execute_query(
+            "SELECT doc_key, content_hash FROM SearchDocuments WHERE project_id = ? AND doc_type = ?",
+            (project_id, doc_type), fetch="all"
+        )
+        return {row['doc_key']: row['content_hash'] for row in rows}
+
+    def get_search_corpus_stats(self, project_id: str, doc_types: list[str]) -> tuple[int, float]:
+        """Returns (document_count, average_term_count) for the given document types."""
+        placeholders = ', '.join('?' for _ in doc_types)
+        row = self._execute_query(
+            f"SELECT COUNT(*) AS doc_count, AVG(term_count) AS avg_length FROM SearchDocuments WHERE project_id = ? AND doc_type IN ({placeholders})",
+            (project_id,) + tuple(doc_types), fetch="one"
+        )
+        return (row['doc_count'] or 0, row['avg_length'] or 0.0) if row else (0, 0.0)
+
+    def get_search_postings(self, project_id: str, terms: list[str], doc_types: list[str]) -> list:
+        """Returns the postings (joined with document metadata) for the given terms."""
+        if not terms:
+            return []
+        term_placeholders = ', '.join('?' for _ in terms)
+        type_placeholders = ', '.join('?' for _ in doc_types)
+        query = f"""
+            SELECT p.term, p.term_frequency, d.doc_key, d.doc_type, d.ref_id, d.title, d.term_count
+            FROM SearchPostings p JOIN SearchDocuments d ON d.doc_key = p.doc_key
+            WHERE p.project_id = ? AND p.term IN ({term_placeholders}) AND d.doc_type IN ({type_placeholders})
+        """
+        return self._execute_query(query, (project_id,) + tuple(terms) + tuple(doc_types), fetch="all")
@@ -63,6 +63,7 @@ from gui.codebase_analysis_page import CodebaseAnalysisPage
 from gui.project_dashboard_page import ProjectDashboardPage
 from gui.sprint_integration_test_page import SprintIntegrationTestPage
 from gui.utils import validate_security_input
+from gui.log_translation import LogTranslator
 
 class LogBridge(QObject, logging.Handler):
     """
@@ -74,64 +75,19 @@ class LogBridge(QObject, logging.Handler):
     def __init__(self):
         QObject.__init__(self)
         logging.Handler.__init__(self)
-
-        # 1. Translation Map: Technical Substring -> User Friendly Message
-        self.friendly_map = {
-            "Invoking FixPlannerAgent": "AI is analyzing the failure...",
-            "TriageAgent": "Diagnosing root cause...",
-            "Stack trace analysis": "Parsing error logs...",
-            "Auto-discovered context": "Reading relevant source files...",
-            "Generating detailed code fix": "Generating fix implementation...",
-            "Successfully generated a fix plan": "Fix plan created. Starting repairs...",
-            "CodeReviewAgent": "Performing safety code review...",
-            "Wrote source code": "Applying fix to source files...",
-            "Wrote unit tests": "Saving new unit tests...",
-            "Running test suite": "Verifying fix with regression tests...",
-            "Verification execution finished": "Testing complete.",
-            "CodeSummarizationAgent: Generating code summary": "Summarizing changes...",
-            "Automated fix plan executed successfully": "Automated fix applied successfully."
-        }
-
-        # 2. Noise Filter: Ignore logs containing ANY of these strings
-        self.ignored_patterns = [
-            "HTTP Request",
-            "AFC is enabled",
-            "Project marked as dirty",
-            "Transitioning to phase",
-            "Attempting to save state",
-            "Project '", # Matches "Project 'test1' state automatically saved"
-            "Calculated SHA-256",
-            "No coding standard",
-            "missing 'relevant_languages' key",
-            "DEBUG PRE-FLIGHT",
-            "VerificationAgent initialized",
-            "CodeSummarizationAgent initialized",
-            "Running full test suite for project at", # Redundant with "Verifying fix..."
-            "Executing verification command",
-            "Executing full insulated command",
-            "Version control is disabled",
-            "Skipping commit"
-        ]
+        self.translator = LogTranslator()
+        # Records below this level are dropped by the logging framework before emit() runs.
+        self.setLevel(self.translator.min_level)
 
     def emit(self, record):
         try:
-            raw_msg = self.format(record)
-
-            # Sanitize internal names from ALL logs ---
-            raw_msg = raw_msg.replace("BuildAndCommitAgent", "Automated Builder")
-            raw_msg = raw_msg.replace("TriageAgent", "Diagnostic System")
-            # ------------------------------------------------------------
-
-            # A. Check for noise to ignore
-            if any(pattern in raw_msg for pattern in self.ignored_patterns):
+            # Level and logger checks happen before the record is formatted.
+            if not self.translator.accepts(record):
                 return
 
-            # B. Translate to user-friendly text
-            final_msg = raw_msg # Default to raw if no mapping found
-            for tech_key, user_text in self.friendly_map.items():
-                if tech_key in raw_msg:
-                    final_msg = user_text
-                    break
+            final_msg = self.translator.translate(self.format(record))
+            if final_msg is None:
+                return
 
             # Emit as ("INFO", "Message") which genesis_page expects
             self.log_signal.emit(("INFO", final_msg))
@@ -211,64 +167,133 @@ class KlyveMainWindow(QMainWindow):
         # For all other events, let them pass through to the default handler.
         return super().eventFilter(watched, event)
 
+    # Page attribute name -> (page class, whether it takes the orchestrator).
+    # Pages are built on first use; see _get_page().
+    PAGE_REGISTRY = {
+        "env_setup_page": (EnvSetupPage, True),
+        "spec_elaboration_page": (SpecElaborationPage, True),
+        "tech_spec_page": (TechSpecPage, True),
+        "build_script_page": (BuildScriptPage, True),
+        "test_env_page": (TestEnvPage, True),
+        "coding_standard_page": (CodingStandardPage, True),
+        "dockerization_page": (DockerizationPage, True),
+        "planning_page": (PlanningPage, True),
+        "genesis_page": (GenesisPage, True),
+        "load_project_page": (LoadProjectPage, True),
+        "preflight_check_page": (PreflightCheckPage, True),
+        "decision_page": (DecisionPage, True),
+        "documents_page": (DocumentsPage, True),
+        "reports_page": (ReportsPage, True),
+        "manual_ui_testing_page": (ManualUITestingPage, True),
+        "project_complete_page": (ProjectCompletePage, False),
+        "cr_management_page": (CRManagementPage, True),
+        "ux_spec_page": (UXSpecPage, True),
+        "backlog_ratification_page": (BacklogRatificationPage, True),
+        "sprint_planning_page": (SprintPlanningPage, True),
+        "sprint_validation_page": (SprintValidationPage, False),
+        "sprint_review_page": (SprintReviewPage, True),
+        "sprint_history_page": (SprintHistoryPage, True),
+        "sprint_integration_test_page": (SprintIntegrationTestPage, True),
+        "delivery_assessment_page": (DeliveryAssessmentPage, False),
+        "codebase_analysis_page": (CodebaseAnalysisPage, True),
+        "project_dashboard_page": (ProjectDashboardPage, True),
+        "intake_assessment_page": (IntakeAssessmentPage, True),
+    }
+
+    # Pages whose completion signals trigger a full UI refresh and page transition.
+    FULL_REFRESH_PAGES = {
+        "env_setup_page", "spec_elaboration_page", "tech_spec_page", "build_script_page", "test_env_page",
+        "coding_standard_page", "planning_page", "genesis_page", "load_project_page", "preflight_check_page",
+        "ux_spec_page",
+    }
+
+    # Pages whose state_changed signal triggers a partial UI refresh (no page transition).
+    PARTIAL_REFRESH_PAGES = {
+        "spec_elaboration_page", "tech_spec_page", "build_script_page", "test_env_page",
+        "coding_standard_page", "planning_page", "genesis_page",
+    }
+
+    # Page shown -> pages the user is likely to need next. These are built in
+    # the background while the application is idle.
+    PAGE_PREWARM_MAP = {
+        "load_project_page": ["preflight_check_page", "project_dashboard_page"],
+        "preflight_check_page": ["project_dashboard_page", "cr_management_page"],
+        "intake_assessment_page": ["spec_elaboration_page", "codebase_analysis_page"],
+        "codebase_analysis_page": ["project_dashboard_page"],
+        "project_dashboard_page": ["cr_management_page", "genesis_page"],
+        "env_setup_page": ["spec_elaboration_page", "intake_assessment_page"],
+        "spec_elaboration_page": ["ux_spec_page", "tech_spec_page"],
+        "ux_spec_page": ["tech_spec_page"],
+        "tech_spec_page": ["build_script_page", "test_env_page"],
+        "build_script_page": ["test_env_page", "dockerization_page"],
+        "test_env_page": ["dockerization_page", "coding_standard_page"],
+        "dockerization_page": ["coding_standard_page"],
+        "coding_standard_page": ["decision_page", "backlog_ratification_page"],
+        "backlog_ratification_page": ["cr_management_page"],
+        "cr_management_page": ["sprint_validation_page", "sprint_planning_page"],
+        "sprint_validation_page": ["sprint_planning_page"],
+        "sprint_planning_page": ["genesis_page", "decision_page"],
+        "genesis_page": ["decision_page", "sprint_review_page", "sprint_integration_test_page"],
+        "sprint_review_page": ["cr_management_page"],
+    }
+
+    # Delay between two idle-time page builds, so the event loop stays responsive.
+    PAGE_PREWARM_INTERVAL_MS = 250
+
     def _create_pages(self):
-        """Creates and adds all page widgets to the stacked widget."""
-        self.env_setup_page = EnvSetupPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.env_setup_page)
-        self.spec_elaboration_page = SpecElaborationPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.spec_elaboration_page)
-        self.tech_spec_page = TechSpecPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.tech_spec_page)
-        self.build_script_page = BuildScriptPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.build_script_page)
-        self.test_env_page = TestEnvPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.test_env_page)
-        self.coding_standard_page = CodingStandardPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.coding_standard_page)
-        self.dockerization_page = DockerizationPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.dockerization_page)
-        self.planning_page = PlanningPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.planning_page)
-        self.genesis_page = GenesisPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.genesis_page)
-        self.load_project_page = LoadProjectPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.load_project_page)
-        self.preflight_check_page = PreflightCheckPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.preflight_check_page)
-        self.decision_page = DecisionPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.decision_page)
-        self.documents_page = DocumentsPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.documents_page)
-        self.reports_page = ReportsPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.reports_page)
-        self.manual_ui_testing_page = ManualUITestingPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.manual_ui_testing_page)
-        self.project_complete_page = ProjectCompletePage(self)
-        self.ui.mainContentArea.addWidget(self.project_complete_page)
-        self.cr_management_page = CRManagementPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.cr_management_page)
-        self.ux_spec_page = UXSpecPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.ux_spec_page)
-        self.backlog_ratification_page = BacklogRatificationPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.backlog_ratification_page)
-        self.sprint_planning_page = SprintPlanningPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.sprint_planning_page)
-        self.sprint_validation_page = SprintValidationPage(self)
-        self.ui.mainContentArea.addWidget(self.sprint_validation_page)
-        self.sprint_review_page = SprintReviewPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.sprint_review_page)
-        self.sprint_history_page = SprintHistoryPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.sprint_history_page)
-        self.sprint_integration_test_page = SprintIntegrationTestPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.sprint_integration_test_page)
-        self.delivery_assessment_page = DeliveryAssessmentPage(self)
-        self.ui.mainContentArea.addWidget(self.delivery_assessment_page)
-        self.codebase_analysis_page = CodebaseAnalysisPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.codebase_analysis_page)
-        self.project_dashboard_page = ProjectDashboardPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.project_dashboard_page)
-        self.intake_assessment_page = IntakeAssessmentPage(self.orchestrator, self)
-        self.ui.mainContentArea.addWidget(self.intake_assessment_page)
+        """
+        Sets up the lazy page registry. Page widgets are only constructed when
+        first shown or accessed, so startup does not pay for pages a session
+        never visits.
+        """
+        self._pages = {}
+        self._prewarm_queue = []
+        self._prewarm_timer = QTimer(self)
+        self._prewarm_timer.setSingleShot(True)
+        self._prewarm_timer.setInterval(self.PAGE_PREWARM_INTERVAL_MS)
+        self._prewarm_timer.timeout.connect(self._prewarm_next_page)
+
+    def __getattr__(self, name):
+        # Only reached when normal lookup fails, i.e. for pages not built yet.
+        if name in KlyveMainWindow.PAGE_REGISTRY and "_pages" in self.__dict__:
+            return self._get_page(name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def _get_page(self, name: str):
+        """Returns the named page, constructing and wiring it on first use."""
+        page = self._pages.get(name)
+        if page is not None:
+            return page
+
+        page_class, takes_orchestrator = self.PAGE_REGISTRY[name]
+        page = page_class(self.orchestrator, self) if takes_orchestrator else page_class(self)
+        self._pages[name] = page
+        setattr(self, name, page)
+        self.ui.mainContentArea.addWidget(page)
+        self._connect_page_signals(name, page)
+        logging.debug(f"Created page '{name}' on first use.")
+        return page
+
+    def _schedule_page_prewarm(self, shown_page_name: str):
+        """Queues the pages likely to follow `shown_page_name` for idle-time construction."""
+        for name in self.PAGE_PREWARM_MAP.get(shown_page_name, []):
+            if name not in self._pages and name not in self._prewarm_queue:
+                self._prewarm_queue.append(name)
+        if self._prewarm_queue and not self._prewarm_timer.isActive():
+            self._prewarm_timer.start()
+
+    def _prewarm_next_page(self):
+        """Builds one queued page, then yields back to the event loop."""
+        while self._prewarm_queue:
+            name = self._prewarm_queue.pop(0)
+            if name not in self._pages:
+                try:
+                    self._get_page(name)
+                except Exception as e:
+                    logging.warning(f"Could not prewarm page '{name}': {e}")
+                break
+        if self._prewarm_queue:
+            self._prewarm_timer.start()
 
     def _setup_file_tree(self):
         """Initializes the file system model and view."""
@@ -483,8 +508,11 @@ class KlyveMainWindow(QMainWindow):
 
         self.ui.actionManage_CRs_Bugs.triggered.connect(self.on_manage_crs)
 
-        # Connect signals that trigger a FULL UI refresh and page transition
-        for page in [self.env_setup_page, self.spec_elaboration_page, self.tech_spec_page, self.build_script_page, self.test_env_page, self.coding_standard_page, self.planning_page, self.genesis_page, self.load_project_page, self.preflight_check_page, self.ux_spec_page]:
+        self.ui.projectFilesTreeView.customContextMenuRequested.connect(self.on_file_tree_context_menu)
+
+    def _connect_page_signals(self, name: str, page):
+        """Connects a page's signals to their slots. Called once, when the page is created."""
+        if name in self.FULL_REFRESH_PAGES:
             if hasattr(page, 'setup_complete'): page.setup_complete.connect(self.update_ui_after_state_change)
             if hasattr(page, 'spec_elaboration_complete'): page.spec_elaboration_complete.connect(self.update_ui_after_state_change)
             if hasattr(page, 'project_cancelled'): page.project_cancelled.connect(self.update_ui_after_state_change)
@@ -498,73 +526,82 @@ class KlyveMainWindow(QMainWindow):
             if hasattr(page, 'project_load_finalized'): page.project_load_finalized.connect(self.update_ui_after_state_change)
             if hasattr(page, 'ux_spec_complete'): page.ux_spec_complete.connect(self.update_ui_after_state_change)
 
-        self.dockerization_page.dockerization_complete.connect(self.update_ui_after_state_change)
-        self.codebase_analysis_page.analysis_complete.connect(self.update_ui_after_state_change)
-        self.project_dashboard_page.maintain_selected.connect(self.on_brownfield_maintain_selected)
-        self.project_dashboard_page.quickfix_selected.connect(self.on_brownfield_quickfix_selected)
-        self.intake_assessment_page.full_lifecycle_selected.connect(self.on_intake_full_lifecycle_selected)
-        self.intake_assessment_page.direct_to_development_selected.connect(self.on_intake_direct_to_dev_selected)
-        self.intake_assessment_page.back_selected.connect(self.on_intake_back_selected)
-
-        # Connect signals that trigger a PARTIAL UI refresh (no page transition)
-        for page in [self.spec_elaboration_page, self.tech_spec_page, self.build_script_page, self.test_env_page, self.coding_standard_page, self.planning_page, self.genesis_page]:
+        if name in self.PARTIAL_REFRESH_PAGES:
             if hasattr(page, 'state_changed'): page.state_changed.connect(self.update_static_ui_elements)
 
-        self.load_project_page.back_to_main.connect(self.on_back_from_load_project)
-        self.preflight_check_page.project_load_failed.connect(self.reset_to_idle)
-        self.decision_page.option1_selected.connect(self.on_decision_option1)
-        self.decision_page.option2_selected.connect(self.on_decision_option2)
-        self.decision_page.option3_selected.connect(self.on_decision_option3)
-        self.delivery_assessment_page.assessment_approved.connect(self.on_assessment_approved)
-        self.delivery_assessment_page.project_cancelled.connect(self.on_close_project)
-        self.ui.projectFilesTreeView.customContextMenuRequested.connect(self.on_file_tree_context_menu)
+        if name == "dockerization_page":
+            page.dockerization_complete.connect(self.update_ui_after_state_change)
+        elif name == "codebase_analysis_page":
+            page.analysis_complete.connect(self.update_ui_after_state_change)
+        elif name == "project_dashboard_page":
+            page.maintain_selected.connect(self.on_brownfield_maintain_selected)
+            page.quickfix_selected.connect(self.on_brownfield_quickfix_selected)
+        elif name == "intake_assessment_page":
+            page.full_lifecycle_selected.connect(self.on_intake_full_lifecycle_selected)
+            page.direct_to_development_selected.connect(self.on_intake_direct_to_dev_selected)
+            page.back_selected.connect(self.on_intake_back_selected)
+        elif name == "load_project_page":
+            page.back_to_main.connect(self.on_back_from_load_project)
+        elif name == "preflight_check_page":
+            page.project_load_failed.connect(self.reset_to_idle)
+        # decision_page gets no default handlers: update_ui_after_state_change connects
+        # the ones each decision needs (connecting defaults here would fire them as well
+        # when the page is first built by one of those connect calls).
+        elif name == "delivery_assessment_page":
+            page.assessment_approved.connect(self.on_assessment_approved)
+            page.project_cancelled.connect(self.on_close_project)
         # --- UPDATED: Redirect 'Back' buttons to the smart unified return logic ---
-        self.documents_page.back_to_workflow.connect(self.on_unified_return_clicked)
-        self.reports_page.back_to_workflow.connect(self.on_unified_return_clicked)
-        self.sprint_history_page.back_to_workflow.connect(self.on_unified_return_clicked)
+        elif name in ("documents_page", "reports_page", "sprint_history_page"):
+            page.back_to_workflow.connect(self.on_unified_return_clicked)
         # ------------------------------------------------------------------------
-        self.manual_ui_testing_page.go_to_documents.connect(self.on_view_documents)
-        self.manual_ui_testing_page.testing_complete.connect(self.update_ui_after_state_change)
-        self.project_complete_page.export_project.connect(self.on_stop_export_project)
-        self.cr_management_page.delete_cr.connect(self.on_cr_delete_action)
-        self.cr_management_page.analyze_cr.connect(self.on_cr_analyze_action)
-        self.cr_management_page.implement_cr.connect(self.on_cr_implement_action)
-        self.cr_management_page.import_from_tool.connect(self.on_import_from_tool)
-        self.cr_management_page.sync_items_to_tool.connect(self.on_sync_items_to_tool)
-        self.cr_management_page.save_new_order.connect(self.orchestrator.handle_save_cr_order)
-        self.cr_management_page.request_ui_refresh.connect(self.update_ui_after_state_change)
-
-        self.backlog_ratification_page.backlog_ratified.connect(self.on_backlog_ratified)
-        self.sprint_planning_page.sprint_cancelled.connect(self.on_sprint_cancelled)
-        self.sprint_planning_page.sprint_started.connect(self.on_start_sprint)
-        self.sprint_review_page.return_to_backlog.connect(self.on_return_to_backlog)
-
-        self.sprint_integration_test_page.run_test_clicked.connect(self.on_sprint_integration_run)
-        self.sprint_integration_test_page.skip_clicked.connect(self.on_sprint_integration_skip)
-        self.sprint_integration_test_page.pause_clicked.connect(self.on_sprint_integration_pause)
-
-        self.sprint_validation_page.proceed_to_planning.connect(self.on_validation_proceed)
-        self.sprint_validation_page.return_to_backlog.connect(self.on_validation_cancel)
-        self.sprint_validation_page.rerun_stale_analysis.connect(self.on_validation_rerun_stale)
+        elif name == "manual_ui_testing_page":
+            page.go_to_documents.connect(self.on_view_documents)
+            page.testing_complete.connect(self.update_ui_after_state_change)
+        elif name == "project_complete_page":
+            page.export_project.connect(self.on_stop_export_project)
+        elif name == "cr_management_page":
+            page.delete_cr.connect(self.on_cr_delete_action)
+            page.analyze_cr.connect(self.on_cr_analyze_action)
+            page.implement_cr.connect(self.on_cr_implement_action)
+            page.import_from_tool.connect(self.on_import_from_tool)
+            page.sync_items_to_tool.connect(self.on_sync_items_to_tool)
+            page.save_new_order.connect(self.orchestrator.handle_save_cr_order)
+            page.request_ui_refresh.connect(self.update_ui_after_state_change)
+        elif name == "backlog_ratification_page":
+            page.backlog_ratified.connect(self.on_backlog_ratified)
+        elif name == "sprint_planning_page":
+            page.sprint_cancelled.connect(self.on_sprint_cancelled)
+            page.sprint_started.connect(self.on_start_sprint)
+        elif name == "sprint_review_page":
+            page.return_to_backlog.connect(self.on_return_to_backlog)
+        elif name == "sprint_integration_test_page":
+            page.run_test_clicked.connect(self.on_sprint_integration_run)
+            page.skip_clicked.connect(self.on_sprint_integration_skip)
+            page.pause_clicked.connect(self.on_sprint_integration_pause)
+        elif name == "sprint_validation_page":
+            page.proceed_to_planning.connect(self.on_validation_proceed)
+            page.return_to_backlog.connect(self.on_validation_cancel)
+            page.rerun_stale_analysis.connect(self.on_validation_rerun_stale)
 
     def _reset_all_pages_for_new_project(self):
         """Iterates through all page widgets and calls their reset method if it exists."""
         logging.info("Resetting all UI pages for new project.")
-        pages = [
-            self.env_setup_page,
-            self.spec_elaboration_page,
-            self.tech_spec_page,
-            self.build_script_page,
-            self.test_env_page,
-            self.coding_standard_page,
-            self.planning_page,
-            self.genesis_page,
-            self.preflight_check_page,
-            self.decision_page,
-            self.manual_ui_testing_page,
-            self.cr_management_page
+        page_names = [
+            "env_setup_page",
+            "spec_elaboration_page",
+            "tech_spec_page",
+            "build_script_page",
+            "test_env_page",
+            "coding_standard_page",
+            "planning_page",
+            "genesis_page",
+            "preflight_check_page",
+            "decision_page",
+            "manual_ui_testing_page",
+            "cr_management_page"
         ]
-        for page in pages:
+        # Pages that have not been built yet are already in their initial state.
+        for page in (self._pages[name] for name in page_names if name in self._pages):
             if hasattr(page, 'prepare_for_new_project'):
                 page.prepare_for_new_project()
 
@@ -1199,42 +1236,43 @@ class KlyveMainWindow(QMainWindow):
 
         # This is the new, corrected dictionary
         page_display_map = {
-        "ENV_SETUP_TARGET_APP": self.env_setup_page,
-        "SPEC_ELABORATION": self.spec_elaboration_page,
-        "GENERATING_APP_SPEC_AND_RISK_ANALYSIS": self.spec_elaboration_page,
-        "AWAITING_SPEC_REFINEMENT_SUBMISSION": self.spec_elaboration_page,
-        "AWAITING_SPEC_FINAL_APPROVAL": self.spec_elaboration_page,
-        "TECHNICAL_SPECIFICATION": self.tech_spec_page,
-        "AWAITING_TECH_SPEC_GUIDELINES": self.tech_spec_page,
-        "AWAITING_TECH_SPEC_RECTIFICATION": self.tech_spec_page,
-        "BUILD_SCRIPT_SETUP": self.build_script_page,
-        "TEST_ENVIRONMENT_SETUP": self.test_env_page,
-        "DOCKERIZATION_SETUP": self.dockerization_page,
-        "CODING_STANDARD_GENERATION": self.coding_standard_page,
-        "PLANNING": self.planning_page,
-        "BACKLOG_RATIFICATION": self.backlog_ratification_page,
-        "GENESIS": self.genesis_page,
-        "SPRINT_IN_PROGRESS": self.genesis_page,
-        "BACKLOG_VIEW": self.cr_management_page,
-        "VIEWING_PROJECT_HISTORY": self.load_project_page,
-        "VIEWING_ACTIVE_PROJECTS": self.load_project_page,
-        "AWAITING_PREFLIGHT_RESOLUTION": self.preflight_check_page,
-        "VIEWING_DOCUMENTS": self.documents_page,
-        "VIEWING_REPORTS": self.reports_page,
-        "VIEWING_SPRINT_HISTORY": self.sprint_history_page,
-        "MANUAL_UI_TESTING": self.manual_ui_testing_page,
-        "PROJECT_COMPLETED": self.project_complete_page,
-        "UX_UI_DESIGN": self.ux_spec_page,
-        "SPRINT_REVIEW": self.sprint_review_page,
+        "ENV_SETUP_TARGET_APP": "env_setup_page",
+        "SPEC_ELABORATION": "spec_elaboration_page",
+        "GENERATING_APP_SPEC_AND_RISK_ANALYSIS": "spec_elaboration_page",
+        "AWAITING_SPEC_REFINEMENT_SUBMISSION": "spec_elaboration_page",
+        "AWAITING_SPEC_FINAL_APPROVAL": "spec_elaboration_page",
+        "TECHNICAL_SPECIFICATION": "tech_spec_page",
+        "AWAITING_TECH_SPEC_GUIDELINES": "tech_spec_page",
+        "AWAITING_TECH_SPEC_RECTIFICATION": "tech_spec_page",
+        "BUILD_SCRIPT_SETUP": "build_script_page",
+        "TEST_ENVIRONMENT_SETUP": "test_env_page",
+        "DOCKERIZATION_SETUP": "dockerization_page",
+        "CODING_STANDARD_GENERATION": "coding_standard_page",
+        "PLANNING": "planning_page",
+        "BACKLOG_RATIFICATION": "backlog_ratification_page",
+        "GENESIS": "genesis_page",
+        "SPRINT_IN_PROGRESS": "genesis_page",
+        "BACKLOG_VIEW": "cr_management_page",
+        "VIEWING_PROJECT_HISTORY": "load_project_page",
+        "VIEWING_ACTIVE_PROJECTS": "load_project_page",
+        "AWAITING_PREFLIGHT_RESOLUTION": "preflight_check_page",
+        "VIEWING_DOCUMENTS": "documents_page",
+        "VIEWING_REPORTS": "reports_page",
+        "VIEWING_SPRINT_HISTORY": "sprint_history_page",
+        "MANUAL_UI_TESTING": "manual_ui_testing_page",
+        "PROJECT_COMPLETED": "project_complete_page",
+        "UX_UI_DESIGN": "ux_spec_page",
+        "SPRINT_REVIEW": "sprint_review_page",
         }
 
         # Disconnect all signals from the generic decision page to prevent multiple triggers
         with warnings.catch_warnings():
             warnings.simplefilter("ignore", RuntimeWarning)
             try:
-                self.decision_page.option1_selected.disconnect()
-                self.decision_page.option2_selected.disconnect()
-                self.decision_page.option3_selected.disconnect()
+                if "decision_page" in self._pages:
+                    self.decision_page.option1_selected.disconnect()
+                    self.decision_page.option2_selected.disconnect()
+                    self.decision_page.option3_selected.disconnect()
             except TypeError:
                 pass # Still catch TypeError for other potential issues
 
@@ -1257,7 +1295,7 @@ class KlyveMainWindow(QMainWindow):
             QTimer.singleShot(100, self._task_generate_backlog) # Start task async
 
         elif current_phase_name in page_display_map:
-            page_to_show = page_display_map[current_phase_name]
+            page_to_show = self._get_page(page_display_map[current_phase_name])
             if hasattr(page_to_show, 'prepare_for_display'):
                 page_to_show.prepare_for_display()
             self.ui.mainContentArea.setCurrentWidget(page_to_show)
@@ -1532,7 +1570,7 @@ class KlyveMainWindow(QMainWindow):
             self.ui.mainContentArea.setCurrentWidget(page_to_show)
 
         elif current_phase_name in page_display_map:
-            page_to_show = page_display_map[current_phase_name]
+            page_to_show = self._get_page(page_display_map[current_phase_name])
             logging.debug(f"update_ui_after_state_change: Found page in map. About to switch to: {page_to_show.__class__.__name__}")
 
             if hasattr(page_to_show, 'prepare_for_display'):
@@ -1687,6 +1725,13 @@ class KlyveMainWindow(QMainWindow):
             self.ui.mainContentArea.setCurrentWidget(self.ui.phasePage)
             self.ui.phaseLabel.setText(f"UI for phase '{current_phase_name}' is not yet implemented.")
 
+        # Build the pages likely to come next while the user works on this one.
+        shown_page = self.ui.mainContentArea.currentWidget()
+        for name, page in self._pages.items():
+            if page is shown_page:
+                self._schedule_page_prewarm(name)
+                break
+
         # Check if the final state is a user checkpoint (IDLE or BACKLOG_VIEW)
         if current_phase in STABLE_CHECKPOINT_PHASES:
             self._show_ready_status()
@@ -0,0 +1,331 @@
+# markdown_docx.py
+
+import html
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+# Block kinds produced by iter_markdown_blocks.
+BLOCK_HEADING = "heading"
+BLOCK_PARAGRAPH = "paragraph"
+BLOCK_LIST_ITEM = "list_item"
+BLOCK_TABLE = "table"
+BLOCK_CODE = "code"
+BLOCK_QUOTE = "quote"
+BLOCK_IMAGE = "image"
+BLOCK_RULE = "rule"
+
+FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})\s*([\w+-]*)")
+HEADING_RE = re.compile(r"^ {0,3}(#{1,6})(?:\s+(.*?))?\s*#*\s*$")
+RULE_RE = re.compile(r"^ {0,3}([-*_])(?:\s*\1){2,}\s*$")
+SETEXT_RE = re.compile(r"^ {0,3}(=+|-+)\s*$")
+LIST_ITEM_RE = re.compile(r"^(\s*)([-*+]|\d+[.)])\s+(.*)$")
+TABLE_SEPARATOR_RE = re.compile(r"^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+# A pipe that separates cells: not escaped and not inside a code span.
+TABLE_CELL_SPLIT_RE = re.compile(r"((?:`[^`]*`|\\.|[^|`\\]|`)*)\|")
+IMAGE_RE = re.compile(r'^!\[([^\]]*)\]\(\s*<?([^)\s>]+)>?(?:\s+"[^"]*")?\s*\)$')
+
+# Inline markup is reduced to its text; the exported documents carry no inline formatting.
+CODE_SPAN_RE = re.compile(r"(`+)(.+?)\1", re.DOTALL)
+INLINE_MARKUP_RE = re.compile(
+    r"!?\[([^\]]*)\]\([^)]*\)"               # links and images -> their text
+    r"|<((?:https?|mailto):[^>\s]+)>"       # autolinks -> the address
+    r"|</?[A-Za-z][^>]*>"                   # raw HTML tags -> dropped
+    r"|\\([\\`*_{}\[\]()#+\-.!|>])"         # backslash escapes -> the character
+)
+STRONG_RE = re.compile(r"(\*\*|__)(?=\S)(.+?)(?<=\S)\1")
+EMPHASIS_RE = re.compile(r"(?<![\w*])\*(?=[^\s*])(.+?)(?<=[^\s*])\*(?![\w*])|(?<!\w)_(?=[^\s_])(.+?)(?<=[^\s_])_(?!\w)")
+INLINE_MARKERS = frozenset("`*_[]<>\\&!")
+
+
+def is_dot_source(code_text: str) -> bool:
+    """Whether a code block holds a Graphviz diagram rather than code."""
+    return code_text.startswith(('digraph', 'graph'))
+
+
+@dataclass
+class MarkdownBlock:
+    """
+    One block-level token of a Markdown document.
+
+    text is plain text (inline markup removed), except for code blocks where it
+    is the code verbatim. level is the heading level or the list nesting depth.
+    """
+    kind: str
+    text: str = ""
+    level: int = 0
+    ordered: bool = False
+    rows: list[list[str]] = field(default_factory=list)
+    source: str = ""
+
+
+def _strip_emphasis(text: str) -> str:
+    text = STRONG_RE.sub(r"\2", text)
+    return EMPHASIS_RE.sub(lambda match: match.group(1) or match.group(2), text)
+
+
+def _inline_markup_text(match: re.Match) -> str:
+    for group in match.groups():
+        if group is not None:
+            return group
+    return ""
+
+
+def inline_text(text: str) -> str:
+    """Returns the text of a span of inline Markdown, without its markup."""
+    if INLINE_MARKERS.isdisjoint(text):
+        return text
+    parts = []
+    position = 0
+    # Code spans are literal: nothing inside them is markup.
+    for match in CODE_SPAN_RE.finditer(text):
+        parts.append(_strip_emphasis(INLINE_MARKUP_RE.sub(_inline_markup_text, text[position:match.start()])))
+        parts.append(match.group(2).strip())
+        position = match.end()
+    parts.append(_strip_emphasis(INLINE_MARKUP_RE.sub(_inline_markup_text, text[position:])))
+    return html.unescape("".join(parts))
+
+
+def _table_cells(line: str) -> list[str]:
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if not line.endswith("|") or line.endswith("\\|"):
+        line += "|"
+    return [inline_text(cell.strip().replace("\\|", "|")) for cell in TABLE_CELL_SPLIT_RE.findall(line)]
+
+
+def _starts_block(line: str, next_line: Optional[str]) -> bool:
+    """Whether a line interrupts a paragraph or a list item's continuation."""
+    return bool(FENCE_RE.match(line) or HEADING_RE.match(line) or RULE_RE.match(line)
+                or LIST_ITEM_RE.match(line) or line.lstrip().startswith(">")
+                or ("|" in line and next_line is not None and TABLE_SEPARATOR_RE.match(next_line)))
+
+
+def iter_markdown_blocks(markdown_text: str) -> Iterator[MarkdownBlock]:
+    """
+    Tokenizes a Markdown document into block-level tokens in a single pass
+    over its lines: headings (ATX and setext), paragraphs, list items,
+    pipe tables, fenced and indented code, block quotes, standalone images and
+    horizontal rules. Covers what Python-Markdown renders with the
+    'fenced_code', 'tables' and 'sane_lists' extensions.
+    """
+    lines = (markdown_text or "").expandtabs(4).splitlines()
+    line_count = len(lines)
+    paragraph: list[str] = []
+
+    def flush_paragraph():
+        if not paragraph:
+            return None
+        source = "\n".join(paragraph)
+        paragraph.clear()
+        image = IMAGE_RE.match(source)
+        if image:
+            return MarkdownBlock(BLOCK_IMAGE, text=inline_text(image.group(1)), source=image.group(2))
+        return MarkdownBlock(BLOCK_PARAGRAPH, text=inline_text(source))
+
+    index = 0
+    while index < line_count:
+        line = lines[index]
+        stripped = line.strip()
+        next_line = lines[index + 1] if index + 1 < line_count else None
+
+        if not stripped:
+            block = flush_paragraph()
+            if block:
+                yield block
+            index += 1
+            continue
+
+        # Setext headings underline the paragraph they end.
+        if paragraph and SETEXT_RE.match(line):
+            level = 1 if stripped.startswith("=") else 2
+            yield MarkdownBlock(BLOCK_HEADING, text=inline_text(" ".join(part.strip() for part in paragraph)), level=level)
+            paragraph.clear()
+            index += 1
+            continue
+
+        # Indented code cannot interrupt a paragraph; an indented list item is a nested item.
+        if not paragraph and line.startswith("    ") and not LIST_ITEM_RE.match(line):
+            code_lines = []
+            while index < line_count and (lines[index].startswith("    ") or not lines[index].strip()):
+                code_lines.append(lines[index][4:])
+                index += 1
+            yield MarkdownBlock(BLOCK_CODE, text="\n".join(code_lines).strip())
+            continue
+
+        if not _starts_block(line, next_line):
+            paragraph.append(stripped)
+            index += 1
+            continue
+
+        block = flush_paragraph()
+        if block:
+            yield block
+
+        fence = FENCE_RE.match(line)
+        if fence:
+            marker = fence.group(1)
+            code_lines = []
+            index += 1
+            while index < line_count:
+                closing = lines[index].strip()
+                if closing.startswith(marker[0] * len(marker)) and not closing.strip(marker[0]):
+                    index += 1
+                    break
+                code_lines.append(lines[index])
+                index += 1
+            yield MarkdownBlock(BLOCK_CODE, text="\n".join(code_lines).strip(), source=fence.group(2))
+            continue
+
+        heading = HEADING_RE.match(line)
+        if heading:
+            yield MarkdownBlock(BLOCK_HEADING, text=inline_text(heading.group(2) or ""), level=len(heading.group(1)))
+            index += 1
+            continue
+
+        if RULE_RE.match(line):
+            yield MarkdownBlock(BLOCK_RULE)
+            index += 1
+            continue
+
+        if stripped.startswith(">"):
+            quote_lines = []
+            while index < line_count and lines[index].lstrip().startswith(">"):
+                quote_lines.append(lines[index].lstrip()[1:].strip())
+                index += 1
+            yield MarkdownBlock(BLOCK_QUOTE, text=inline_text("\n".join(quote_lines)))
+            continue
+
+        item = LIST_ITEM_RE.match(line)
+        if item:
+            indent = len(item.group(1))
+            item_lines = [item.group(3).strip()]
+            index += 1
+            # Continuation lines: indented text, or lazy lines that start no new block.
+            while index < line_count:
+                continuation = lines[index]
+                if not continuation.strip():
+                    following = lines[index + 1] if index + 1 < line_count else ""
+                    if following.startswith(" " * (indent + 2)) and following.strip() and not LIST_ITEM_RE.match(following):
+                        index += 1
+                        continue
+                    break
+                following = lines[index + 1] if index + 1 < line_count else None
+                if _starts_block(continuation, following):
+                    break
+                item_lines.append(continuation.strip())
+                index += 1
+            yield MarkdownBlock(BLOCK_LIST_ITEM, text=inline_text("\n".join(item_lines)), level=indent // 2,
+                                ordered=item.group(2)[0].isdigit())
+            continue
+
+        # The only block left that _starts_block recognises: a pipe table.
+        rows = [_table_cells(line)]
+        index += 2  # header and separator
+        while index < line_count and lines[index].strip() and "|" in lines[index]:
+            rows.append(_table_cells(lines[index]))
+            index += 1
+        yield MarkdownBlock(BLOCK_TABLE, rows=rows)
+
+    block = flush_paragraph()
+    if block:
+        yield block
+
+
+class MarkdownDocxEmitter:
+    """
+    Writes Markdown straight into a python-docx Document, one token at a time,
+    with no intermediate HTML.
+
+    Styles missing from the document template fall back to 'Normal'; each
+    style is looked up once per document rather than per paragraph. DOT code
+    blocks are handed to `add_diagram(document, dot_text)` when given.
+    """
+
+    HEADING_STYLES = {1: 'Heading 1', 2: 'Heading 2', 3: 'Heading 3'}
+    LIST_STYLES = {False: 'Bullet List', True: 'List Numbered'}
+    CODE_STYLE = 'Code Block'
+    QUOTE_STYLE = 'Quote'
+    TABLE_STYLE = 'Table Grid'
+    MAX_IMAGE_WIDTH_INCHES = 6.0
+
+    def __init__(self, document, add_diagram: Optional[Callable] = None):
+        self.document = document
+        self.add_diagram = add_diagram
+        self._styles: dict[str, Optional[object]] = {}
+
+    def _style(self, style_name: str):
+        if style_name not in self._styles:
+            try:
+                self._styles[style_name] = self.document.styles[style_name]
+            except KeyError:
+                logging.warning(f"Style '{style_name}' not found. Using 'Normal'.")
+                self._styles[style_name] = None if style_name == 'Normal' else self._style('Normal')
+        return self._styles[style_name]
+
+    def add_paragraph(self, text: str, style_name: str = 'Normal'):
+        if not text.strip():
+            return None
+        return self.document.add_paragraph(text, style=self._style(style_name))
+
+    def add_table(self, rows: list[list[str]]):
+        column_count = max(len(row) for row in rows)
+        table = self.document.add_table(rows=len(rows), cols=column_count)
+        try:
+            table.style = self.document.styles[self.TABLE_STYLE]
+        except KeyError:
+            pass  # Templates without the table style keep the default plain table
+        for row_index, (table_row, values) in enumerate(zip(table.rows, rows)):
+            for cell, value in zip(table_row.cells, values):
+                if not value:
+                    continue
+                run = cell.paragraphs[0].add_run(value)
+                if row_index == 0:
+                    run.bold = True
+        return table
+
+    def add_image(self, source: str, alt_text: str):
+        from docx.shared import Inches
+        image_path = Path(source)
+        if not image_path.is_file():
+            self.add_paragraph(alt_text or source)
+            return
+        try:
+            picture = self.document.add_picture(str(image_path))
+            max_width = Inches(self.MAX_IMAGE_WIDTH_INCHES)
+            if picture.width > max_width:
+                picture.height = int(picture.height * max_width / picture.width)
+                picture.width = max_width
+        except Exception as e:
+            logging.error(f"Failed to add image '{source}' to DOCX: {e}")
+            self.add_paragraph(alt_text or source)
+
+    def emit(self, blocks: Iterable[MarkdownBlock]):
+        for block in blocks:
+            kind = block.kind
+            if kind == BLOCK_PARAGRAPH:
+                self.add_paragraph(block.text)
+            elif kind == BLOCK_HEADING:
+                self.add_paragraph(block.text, self.HEADING_STYLES.get(block.level, f'Heading {block.level}'))
+            elif kind == BLOCK_LIST_ITEM:
+                self.add_paragraph(block.text, self.LIST_STYLES[block.ordered])
+            elif kind == BLOCK_TABLE:
+                self.add_table(block.rows)
+            elif kind == BLOCK_CODE:
+                if self.add_diagram and is_dot_source(block.text):
+                    self.add_diagram(self.document, block.text)
+                else:
+                    self.add_paragraph(block.text, self.CODE_STYLE)
+            elif kind == BLOCK_QUOTE:
+                self.add_paragraph(block.text, self.QUOTE_STYLE)
+            elif kind == BLOCK_IMAGE:
+                self.add_image(block.source, block.text)
+            elif kind == BLOCK_RULE:
+                self.document.add_page_break()
+
+    def write(self, markdown_text: str):
+        """Tokenizes and emits a whole Markdown document."""
+        self.emit(iter_markdown_blocks(markdown_text))
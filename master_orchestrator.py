@@ -14,7 +14,6 @@ from llm_service import (LLMService, GeminiAdapter, OpenAIAdapter,
                          OllamaAdapter, CustomEndpointAdapter)
 from pathlib import Path
 import textwrap
-import git
 import hashlib
 from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QMessageBox, QInputDialog, QLineEdit, QApplication
@@ -32,7 +31,7 @@ from agents.agent_ux_triage import UX_Triage_Agent
 from agents.agent_ux_spec import UX_Spec_Agent
 from agents.agent_report_generator import ReportGeneratorAgent
 from agents.agent_ux_spec import UX_Spec_Agent
-from klyve_db_manager import KlyveDBManager
+from klyve_db_manager import KlyveDBManager, STATUS_STREAM_BACKLOG, STATUS_STREAM_COMPONENT_TESTS, STATUS_STREAM_PHASES, TRACE_SOURCE_DEV_PLAN
 from agents.logic_agent_app_target import LogicAgent_AppTarget
 from agents.code_agent_app_target import CodeAgent_AppTarget
 from agents.test_agent_app_target import TestAgent_AppTarget
@@ -59,7 +58,20 @@ from gui.utils import format_timestamp_for_display
 from agents.agent_dev_environment_advisor import DevEnvironmentAdvisorAgent
 from agents.agent_project_intake_advisor import ProjectIntakeAdvisorAgent
 from agents.agent_sprint_integration_test import SprintIntegrationTestAgent
-from agents.agent_traceability_report import RequirementTraceabilityAgent
+from agents.agent_traceability_report import RequirementTraceabilityAgent, plan_trace_links
+from rowd_context import build_rowd_context_json
+from search_index import ProjectSearchIndex
+from project_archive import (
+    ARCHIVE_SUFFIX, TABLE_ARTIFACT, TABLE_CR, TABLE_PROJECT,
+    is_streaming_archive, write_project_archive, delete_archive_files
+)
+from archive_importer import import_project_archive, import_legacy_archive
+from orchestration_state_store import (
+    OrchestrationStateStore, EVENT_PHASE_CHANGED, EVENT_PLAN_LOADED, EVENT_FIX_PLAN_LOADED,
+    EVENT_FIX_PLAN_COMPLETED, EVENT_TASK_STARTED, EVENT_TASK_COMMITTED, EVENT_TASK_COMPLETED
+)
+from report_jobs import ReportJobKey, ReportJobQueue, wait_for_report
+from keyword_matcher import KeywordMatcher
 import vault
 
 class EnvironmentFailureException(Exception):
@@ -141,6 +153,7 @@ class MasterOrchestrator:
 
     def __init__(self, db_manager: KlyveDBManager):
         self.db_manager = db_manager
+        self.state_store = OrchestrationStateStore(db_manager)
         self.resumable_state = None # Initialize as None
 
         # Default initial state
@@ -168,6 +181,7 @@ class MasterOrchestrator:
         self.post_fix_reverification_path = None
         self.is_on_demand_test_cycle = False
         self.last_operational_phase: FactoryPhase = FactoryPhase.IDLE
+        self.report_jobs = ReportJobQueue()
         logging.info("MasterOrchestrator instance created.")
 
     def reset(self):
@@ -197,6 +211,7 @@ class MasterOrchestrator:
         self.active_sprint_goal = None
         self.post_fix_reverification_path = None
         self.last_operational_phase = FactoryPhase.IDLE
+        self.report_jobs.clear()
 
     def close_active_project(self):
         """
@@ -349,6 +364,7 @@ class MasterOrchestrator:
             if isinstance(plan, list):
                 self.active_plan = plan
                 self.active_plan_cursor = 0
+                self._record_progress_event(EVENT_PLAN_LOADED, active_plan=plan, active_plan_cursor=0)
                 logging.info(f"Successfully loaded development plan with {len(plan)} tasks.")
             else:
                 raise ValueError("Plan must be a list (JSON array).")
@@ -1007,6 +1023,7 @@ class MasterOrchestrator:
                 db = self.db_manager
                 db.update_project_field(self.project_id, "final_spec_text", app_spec)
                 db.update_project_field(self.project_id, "tech_spec_text", tech_spec)
+                self._index_spec_sections()
 
                 # Proceed to generate the backlog
                 self.handle_backlog_generation()
@@ -1493,6 +1510,7 @@ class MasterOrchestrator:
                 f"```json\n{json_blueprint}\n```"
             )
             db.update_project_field(self.project_id, "ux_spec_text", composite_spec_for_db)
+            self._index_spec_sections()
             self.active_ux_spec = {}
 
             # Hand off the PURE content to the next phase.
@@ -1736,6 +1754,7 @@ class MasterOrchestrator:
             pure_spec_content = self._strip_header_from_document(final_spec_plaintext)
             logging.debug(f"DATA PERSISTENCE: Saving PLAIN TEXT to DB: {pure_spec_content[:200]}...")
             self.db_manager.update_project_field(self.project_id, "final_spec_text", pure_spec_content)
+            self._index_spec_sections()
             logging.info(f"Successfully saved final Application Specification to database for project {self.project_id}")
 
             project_details = self.db_manager.get_project_by_id(self.project_id)
@@ -1925,6 +1944,47 @@ class MasterOrchestrator:
             logging.error(f"Failed to get health snapshot data: {e}", exc_info=True)
             return {}
 
+    def _report_job_key(self, report_type: str, options: dict) -> ReportJobKey:
+        """Keys a report request by its type, options and the project's current data version."""
+        data_version = self.db_manager.get_data_version(self.project_id)
+        return ReportJobKey.create(self.project_id, report_type, data_version, options)
+
+    @staticmethod
+    def _report_options(kwargs: dict) -> dict:
+        # Worker injects its own callbacks; they are not report options.
+        return {name: value for name, value in kwargs.items() if name not in ('progress_callback', 'worker_instance')}
+
+    def get_cached_report(self, report_type: str, **kwargs) -> BytesIO | None:
+        """
+        Returns the previously generated output for this report and options if
+        the project's data has not changed since, or None.
+        """
+        if not self.project_id:
+            return None
+        return self.report_jobs.get_cached(self._report_job_key(report_type, self._report_options(kwargs)))
+
+    def generate_report(self, report_type: str, generation_function, **kwargs) -> BytesIO | str:
+        """
+        Generates a report through the background report queue and waits for it.
+        Unchanged reports come from the cache, and a request identical to one
+        still pending joins it instead of generating the report again.
+
+        Generation functions must not write files themselves, since a cache hit
+        skips them: the caller saves the returned data (see save_report_file).
+
+        Returns:
+            Whatever generation_function returns: BytesIO data, or an error/info string.
+        """
+        if not self.project_id:
+            return "Error: No active project."
+        options = self._report_options(kwargs)
+        future = self.report_jobs.submit(self._report_job_key(report_type, options), generation_function, **options)
+        return wait_for_report(future)
+
+    def cancel_pending_reports(self) -> int:
+        """Cancels queued report jobs of the active project that have not started yet."""
+        return self.report_jobs.cancel_pending(self.project_id)
+
     def get_sprint_list_for_report(self) -> list[tuple[str, str]]:
         """
         Fetches completed and in-progress sprints for report filtering dropdowns.
@@ -1964,33 +2024,20 @@ class MasterOrchestrator:
         if not self.project_id:
             return "Error: No active project."
         try:
-            # 1. Fetch filtered flat list from DB
-            filtered_items_flat = self.db_manager.get_change_requests_filtered(self.project_id, statuses, types)
-            if not filtered_items_flat:
-                logging.warning("No backlog items matched the filters.")
-                # We still generate an empty report for consistency
-                # return "Info: No backlog items matched the selected filters."
-
-            # 2. Reconstruct hierarchy *only* with filtered items (simplified approach)
-            # A more complex approach might fetch all and filter the hierarchy in memory.
-            # For simplicity, we'll report the filtered flat list with hierarchical IDs if available.
-            # We need the full hierarchy first to get the correct IDs.
-            full_hierarchy = self._get_backlog_with_hierarchical_numbers()
-            flat_map = {item['cr_id']: item for item in self._flatten_hierarchy(full_hierarchy)}
+            # 1. Hierarchical IDs for every item, computed from the parent links alone
+            hierarchical_ids = self._get_hierarchical_id_map()
 
-            report_data = []
-            for item_row in filtered_items_flat:
-                item_dict = dict(item_row)
-                full_item_data = flat_map.get(item_dict['cr_id'])
-                if full_item_data:
-                    item_dict['hierarchical_id'] = full_item_data.get('hierarchical_id', f"CR-{item_dict['cr_id']}")
-                else:
-                    item_dict['hierarchical_id'] = f"CR-{item_dict['cr_id']}" # Fallback
-                report_data.append(item_dict)
+            # 2. Stream the filtered items from the DB straight into the workbook.
+            # An empty result still produces a report, for consistency.
+            def report_rows():
+                for item_row in self.db_manager.iter_change_requests_filtered(self.project_id, statuses, types):
+                    item_dict = dict(item_row)
+                    item_dict['hierarchical_id'] = hierarchical_ids.get(item_dict['cr_id'], f"CR-{item_dict['cr_id']}")
+                    yield item_dict
 
             # 3. Call ReportGeneratorAgent
             report_agent = ReportGeneratorAgent(self.db_manager)
-            xlsx_bytes_io = report_agent.generate_backlog_xlsx(report_data) # Use existing method with potentially filtered data
+            xlsx_bytes_io = report_agent.generate_backlog_xlsx(report_rows())
             if not xlsx_bytes_io:
                 raise Exception("ReportGeneratorAgent failed to create XLSX data.")
             return xlsx_bytes_io
@@ -2095,18 +2142,11 @@ class MasterOrchestrator:
         if not sprint_id: return "Error: No sprint selected."
         try:
             complexity_map = {"Small": 1, "Medium": 3, "Large": 5}
-            sprint_items = self.db_manager.get_items_for_sprint(sprint_id)
-            if not sprint_items: return "Info: No items found for this sprint."
-
-            total_points = sum(complexity_map.get(item['complexity'], 0) for item in sprint_items)
-            # Placeholder: Need actual completion history (timestamps/task order)
-            # For now, simulate based on current status
-            completed_points = sum(complexity_map.get(item['complexity'], 0) for item in sprint_items if item['status'] == 'COMPLETED')
-            remaining_points = total_points - completed_points
-            burndown_data = {'total': total_points, 'remaining': remaining_points, 'sprint_id': sprint_id}
+            burndown_data = self.db_manager.get_sprint_burndown(sprint_id, complexity_map)
+            if not burndown_data or not burndown_data['total']: return "Info: No items found for this sprint."
 
             report_agent = ReportGeneratorAgent(self.db_manager)
-            image_bytes_io = report_agent.generate_burndown_chart_image(burndown_data) # New method needed
+            image_bytes_io = report_agent.generate_burndown_chart_image(burndown_data)
             if not image_bytes_io:
                 raise Exception("ReportGeneratorAgent failed to create chart image.")
             return image_bytes_io
@@ -2124,14 +2164,14 @@ class MasterOrchestrator:
         logging.info("Orchestrator: Generating workflow efficiency (CFD) data.")
         if not self.project_id: return "Error: No active project."
         try:
-            # Placeholder: Need historical status data over time.
-            # This requires logging status changes with timestamps or querying git history if available.
-            # For now, we'll use the current snapshot.
             current_status_counts = self.db_manager.get_backlog_status_summary(self.project_id)
-            cfd_data = {'current_snapshot': current_status_counts} # Simplified data structure
+            dates, counts_by_status = self.db_manager.get_daily_status_counts(
+                self.project_id, STATUS_STREAM_BACKLOG, current_status_counts
+            )
+            cfd_data = {'dates': dates, **counts_by_status}
 
             report_agent = ReportGeneratorAgent(self.db_manager)
-            image_bytes_io = report_agent.generate_cfd_chart_image(cfd_data) # New method needed
+            image_bytes_io = report_agent.generate_cfd_chart_image(cfd_data)
             if not image_bytes_io:
                 raise Exception("ReportGeneratorAgent failed to create CFD chart image.")
             return image_bytes_io
@@ -2149,14 +2189,24 @@ class MasterOrchestrator:
         logging.info("Orchestrator: Generating code quality trend data.")
         if not self.project_id: return "Error: No active project."
         try:
-            # Placeholder: Need historical test status data across sprints/time.
-            # This requires snapshotting Artifacts.unit_test_status at sprint ends or over time.
-            # For now, use the current snapshot.
             current_test_status_counts = self.db_manager.get_component_test_status_summary(self.project_id)
-            trend_data = {'current_snapshot': current_test_status_counts} # Simplified
+            dates, counts_by_status = self.db_manager.get_daily_status_counts(
+                self.project_id, STATUS_STREAM_COMPONENT_TESTS, current_test_status_counts
+            )
+
+            # Group the recorded unit test statuses into the three chart series.
+            trend_data = {'dates': dates, 'PASSED': [0] * len(dates), 'FAILED': [0] * len(dates), 'NOT_TESTED': [0] * len(dates)}
+            for status, counts in counts_by_status.items():
+                if status == "TESTS_PASSING":
+                    series = 'PASSED'
+                elif "FAIL" in status:
+                    series = 'FAILED'
+                else:
+                    series = 'NOT_TESTED'
+                trend_data[series] = [total + count for total, count in zip(trend_data[series], counts)]
 
             report_agent = ReportGeneratorAgent(self.db_manager)
-            image_bytes_io = report_agent.generate_quality_trend_chart_image(trend_data) # New method needed
+            image_bytes_io = report_agent.generate_quality_trend_chart_image(trend_data)
             if not image_bytes_io:
                 raise Exception("ReportGeneratorAgent failed to create quality trend chart image.")
             return image_bytes_io
@@ -2174,23 +2224,35 @@ class MasterOrchestrator:
         logging.info("Orchestrator: Generating AI assistance rate data.")
         if not self.project_id: return "Error: No active project."
         try:
-            # Placeholder: Need historical tracking of DEBUG_PM_ESCALATION phase entries.
-            # This could involve querying logs or a dedicated event table if implemented.
-            # Simulate a simple calculation for now.
-            # Assume 5 escalations happened over 2 sprints.
+            total_sprints = len(self.db_manager.get_all_sprints_for_project(self.project_id))
+            total_escalations = self.db_manager.get_status_entry_count(
+                self.project_id, STATUS_STREAM_PHASES, FactoryPhase.DEBUG_PM_ESCALATION.name
+            )
             assistance_data = {
-                "total_sprints_analyzed": 2,
-                "total_escalations": 5,
-                "average_escalations_per_sprint": 2.5
+                "total_sprints_analyzed": total_sprints,
+                "total_escalations": total_escalations,
+                "average_escalations_per_sprint": total_escalations / total_sprints if total_sprints else 0
             }
 
             report_agent = ReportGeneratorAgent(self.db_manager)
-            report_text = report_agent.generate_ai_assistance_report(assistance_data) # New method needed
+            report_text = report_agent.generate_ai_assistance_report(assistance_data)
             return report_text
         except Exception as e:
             logging.error(f"Failed to generate AI assistance rate data: {e}", exc_info=True)
             return f"Error: {e}"
 
+    def _index_plan_trace_links(self, source: str, plan_json_str: str):
+        """
+        Records which backlog items each task of a saved plan implements, so the
+        traceability matrix can join on them instead of re-parsing every plan.
+        """
+        try:
+            links = plan_trace_links(self._parse_plan_json(plan_json_str))
+            self.db_manager.replace_trace_links(self.project_id, source, links)
+        except Exception as e:
+            # The traceability report indexes any plan not yet marked as indexed itself.
+            logging.warning(f"Could not index trace links of plan '{source}': {e}")
+
     # Helper method used by Sprint Deliverables Report
     def _parse_plan_json(self, plan_json_str: str | None) -> list:
         """Safely parses a plan JSON string into a list of tasks."""
@@ -2285,14 +2347,8 @@ class MasterOrchestrator:
             agent = ReportGeneratorAgent(self.db_manager)
             xlsx_bytes_io = agent.generate_traceability_xlsx(trace_data, self.project_name)
 
-            # 3. Save the file
-            report_filename = f"{self.project_name}_Backlog_Traceability_Report.xlsx"
-            save_path = self.get_project_reports_dir() / report_filename
-
-            with open(save_path, 'wb') as f:
-                f.write(xlsx_bytes_io.getbuffer())
-
-            logging.info(f"Traceability Matrix .xlsx report saved to: {save_path}")
+            # The file saving is done by the helper method save_report_file, which
+            # also runs when the report is served from the report cache.
             return xlsx_bytes_io
         except Exception as e:
             logging.error(f"Failed to generate Backlog Traceability Matrix report: {e}", exc_info=True)
@@ -2554,6 +2610,7 @@ class MasterOrchestrator:
             db = self.db_manager
             db.update_project_field(self.project_id, "target_os", target_os)
             db.update_project_field(self.project_id, "tech_spec_text", pure_tech_spec_content)
+            self._index_spec_sections()
             logging.info(f"Successfully saved final Technical Specification to database for project {self.project_id}")
 
             project_details = db.get_project_by_id(self.project_id)
@@ -2733,6 +2790,7 @@ class MasterOrchestrator:
             # --- THIS IS THE FIX ---
             # Save the PURE JSON content directly to the database.
             self.db_manager.update_project_field(self.project_id, "development_plan_text", plan_json_string)
+            self._index_plan_trace_links(TRACE_SOURCE_DEV_PLAN, plan_json_string)
 
             # Generate the headed version only for the file system artifacts.
             final_doc_with_header = self.prepend_standard_header(
@@ -2798,11 +2856,18 @@ class MasterOrchestrator:
                 self.is_project_dirty = True
                 logging.info(f"Project marked as dirty due to phase transition to {new_phase.name}")
 
+            old_phase = self.current_phase
             self.current_phase = new_phase
             logging.info(f"Transitioning to phase: {self.current_phase.name}")
 
             if self.project_id and new_phase not in non_dirtying_phases:
                 self._save_current_state()
+                self._record_progress_event(EVENT_PHASE_CHANGED, phase=new_phase.name)
+                if new_phase != old_phase:
+                    try:
+                        self.db_manager.record_phase_change(self.project_id, old_phase.name if old_phase else None, new_phase.name)
+                    except Exception as e:
+                        logging.warning(f"Could not record phase history for {new_phase.name}: {e}")
 
         except KeyError:
             logging.error(f"Attempted to set an invalid phase: {phase_name}")
@@ -2842,6 +2907,7 @@ class MasterOrchestrator:
                 self.is_in_fix_mode = False
                 self.fix_plan = None
                 self.fix_plan_cursor = 0
+                self._record_progress_event(EVENT_FIX_PLAN_COMPLETED, is_in_fix_mode=False, fix_plan=None, fix_plan_cursor=0)
                 # Re-enter the loop to re-attempt the original task that prompted the fix.
                 return self.handle_proceed_action(**kwargs)
             else:
@@ -2858,6 +2924,8 @@ class MasterOrchestrator:
 
                     self._execute_source_code_generation_task(task, project_root_path, db, progress_callback)
                     self.fix_plan_cursor += 1
+                    self._record_progress_event(EVENT_TASK_COMPLETED, info={"component_name": component_name},
+                                                fix_plan_cursor=self.fix_plan_cursor)
                     return "Fix step complete."
                 except EnvironmentFailureException:
                     logging.warning("Halting fix plan due to an unrecoverable environment failure.")
@@ -2881,6 +2949,8 @@ class MasterOrchestrator:
         task = self.active_plan[self.active_plan_cursor]
         component_name = task.get('component_name')
         logging.info(f"Executing task {self.active_plan_cursor + 1} for component: {component_name}")
+        self._record_progress_event(EVENT_TASK_STARTED, info={"component_name": component_name},
+                                    active_plan_cursor=self.active_plan_cursor)
         if progress_callback:
             progress_callback(("INFO", f"Executing task {self.active_plan_cursor + 1}/{len(self.active_plan)} for component: {component_name}"))
 
@@ -2909,6 +2979,8 @@ class MasterOrchestrator:
             # If it succeeds, we advance the plan
             self.active_plan_cursor += 1
             self.debug_attempt_counter = 0 # Reset counter on a successful task
+            self._record_progress_event(EVENT_TASK_COMPLETED, info={"component_name": component_name},
+                                        active_plan_cursor=self.active_plan_cursor, debug_attempt_counter=0)
             return "Step complete."
 
         except EnvironmentFailureException as env_e:
@@ -3181,8 +3253,13 @@ class MasterOrchestrator:
         logging.warning(f"DEBUG PRE-FLIGHT: version_control_enabled is '{version_control_enabled}' for project {self.project_id}")
 
         all_artifacts_rows = db.get_all_artifacts_for_project(self.project_id)
-        rowd_json = json.dumps([dict(row) for row in all_artifacts_rows])
         micro_spec_content = task.get("task_description")
+        rowd_json = build_rowd_context_json(
+            all_artifacts_rows,
+            task_text=f"{component_name}\n{task.get('component_file_path') or ''}\n{micro_spec_content or ''}",
+            anchor_ids=[task.get("artifact_id")],
+            anchor_paths=[task.get("component_file_path")]
+        )
 
         if progress_callback: progress_callback(("INFO", f"Generating logic plan for {component_name}..."))
         logic_agent = LogicAgent_AppTarget(llm_service=self.llm_service)
@@ -3244,7 +3321,8 @@ class MasterOrchestrator:
             unit_tests,                      # Arg 4: Test Code
             test_command,                    # Arg 5: Test Command
             self.llm_service,                # Arg 6: LLM Service
-            version_control_enabled          # Arg 7: VCS Flag
+            version_control_enabled,         # Arg 7: VCS Flag
+            progress_callback=progress_callback
         )
 
         if status == 'ENVIRONMENT_FAILURE':
@@ -3256,6 +3334,7 @@ class MasterOrchestrator:
             raise Exception(f"BuildAndCommitAgent failed for {component_name}: {result_message}")
 
         commit_hash = result_message.split(":")[-1].strip() if "New commit hash:" in result_message else "N/A"
+        self._record_progress_event(EVENT_TASK_COMMITTED, info={"component_name": component_name, "commit_hash": commit_hash})
         if progress_callback: progress_callback(("SUCCESS", "... Component successfully tested and committed."))
 
         if progress_callback: progress_callback(("INFO", f"Summarizing new code for {component_name}..."))
@@ -3682,8 +3761,13 @@ class MasterOrchestrator:
             logging.error("Cannot identify integration files: LLM Service is not configured.")
             return []
 
-        rowd_json = json.dumps([dict(row) for row in all_artifacts_rows], indent=2)
         new_artifacts_json = json.dumps(new_artifacts, indent=2)
+        rowd_json = build_rowd_context_json(
+            all_artifacts_rows,
+            task_text=new_artifacts_json,
+            anchor_paths=[artifact.get("file_path") for artifact in new_artifacts if isinstance(artifact, dict)],
+            indent=2
+        )
 
         prompt = vault.get_prompt("master_orchestrator__prompt_3384").format(rowd_json=rowd_json, new_artifacts_json=new_artifacts_json)
         try:
@@ -3922,7 +4006,12 @@ class MasterOrchestrator:
             if context_package.get("error"): raise Exception(f"Context Builder Error: {context_package['error']}")
 
             all_artifacts = db.get_all_artifacts_for_project(self.project_id)
-            rowd_json = json.dumps([dict(row) for row in all_artifacts])
+            rowd_json = build_rowd_context_json(
+                all_artifacts,
+                task_text=f"{cr_details['title'] or ''}\n{cr_details['description']}",
+                anchor_ids=impacted_ids,
+                anchor_paths=source_code_files.keys()
+            )
 
             planner_agent = RefactoringPlannerAgent_AppTarget(llm_service=self.llm_service)
             detected_technologies_json = project_details.get('detected_technologies', '[]')
@@ -4361,12 +4450,12 @@ class MasterOrchestrator:
         Resumes a project using the detailed state loaded into self.resumable_state.
         """
         # Highest Priority: Attempt to load a detailed, formally saved session state.
-        if self.resumable_state:
+        if self.resumable_state or self.state_store.has_saved_state(self.project_id):
             try:
                 logging.info(f"Found a saved session state for project {self.project_id}. Resuming...")
 
-                # Load the details first
-                details = json.loads(self.resumable_state['state_details'])
+                # Rebuild the state from the last snapshot plus the journal tail
+                saved_phase, details = self.state_store.load_state(self.project_id, self.resumable_state)
                 if "task_awaiting_approval" in details:
                     # Handles the existing format (e.g., from a manual pause)
                     self.task_awaiting_approval = details.get("task_awaiting_approval")
@@ -4381,7 +4470,7 @@ class MasterOrchestrator:
                     logging.info("Detected 'resuming_from_manual_fix' flag. Overriding phase to GENESIS.")
                 else:
                     # If not our special condition, resume to the phase that was saved
-                    self.current_phase = FactoryPhase[self.resumable_state['current_phase']]
+                    self.current_phase = FactoryPhase[saved_phase]
 
                 # Load the rest of the state
                 self.active_plan = details.get("active_plan")
@@ -4389,7 +4478,11 @@ class MasterOrchestrator:
                 self.debug_attempt_counter = details.get("debug_attempt_counter", 0)
                 self.active_spec_draft = details.get("active_spec_draft")
                 self.active_sprint_id = details.get("active_sprint_id")
+                self.is_in_fix_mode = details.get("is_in_fix_mode", False)
+                self.fix_plan = details.get("fix_plan")
+                self.fix_plan_cursor = details.get("fix_plan_cursor", 0)
 
+                self.state_store.forget(self.project_id)
                 self.db_manager.delete_orchestration_state_for_project(self.project_id)
                 self.resumable_state = None
                 logging.info(f"Project '{self.project_name}' resumed successfully to phase {self.current_phase.name}.")
@@ -4564,6 +4657,8 @@ class MasterOrchestrator:
         Handles the PM's confirmation that a manual fix is complete.
         This workflow trusts the PM's fix, updates the RoWD, and advances the plan.
         """
+        import git
+
         logging.info("PM has acknowledged a manual fix. Updating records and proceeding.")
         try:
             db = self.db_manager
@@ -4771,6 +4866,8 @@ class MasterOrchestrator:
 
                 self._execute_source_code_generation_task(task, project_root_path, db, progress_callback)
                 self.fix_plan_cursor += 1
+                self._record_progress_event(EVENT_TASK_COMPLETED, info={"component_name": component_name},
+                                            fix_plan_cursor=self.fix_plan_cursor)
 
             # If the loop completes without error, the fix was applied
             logging.info("Automated fix plan executed successfully.")
@@ -4780,6 +4877,8 @@ class MasterOrchestrator:
             self.is_in_fix_mode = False
             self.fix_plan = None
             self.fix_plan_cursor = 0
+            self._record_progress_event(EVENT_FIX_PLAN_COMPLETED, active_plan_cursor=self.active_plan_cursor,
+                                        is_in_fix_mode=False, fix_plan=None, fix_plan_cursor=0)
             if progress_callback:
                 progress_callback(("COMPLETED", "Automated fix applied successfully."))
             return True # Signal that the fix was applied
@@ -4827,7 +4926,7 @@ class MasterOrchestrator:
 
         # The agent constructor is now called with the required second argument
         agent = BuildAndCommitAgentAppTarget(project_root, version_control_enabled)
-        success, output = agent.run_test_suite_only(test_command)
+        success, output = agent.run_test_suite_only(test_command, progress_callback=progress_callback)
 
         if progress_callback:
             progress_callback(("SUCCESS", "Test run complete."))
@@ -5132,7 +5231,7 @@ class MasterOrchestrator:
         agent = VerificationAgent_AppTarget(self.llm_service)
         if progress_callback: progress_callback(("INFO", f"Executing command: {command}"))
 
-        status, output = agent.run_all_tests(project_root, command)
+        status, output = agent.run_all_tests(project_root, command, progress_callback=progress_callback)
 
         if progress_callback: progress_callback(("INFO", f"Execution finished with status: {status}"))
 
@@ -5245,7 +5344,7 @@ class MasterOrchestrator:
                 raise Exception("Cannot run automated UI tests: The UI Test Execution Command is not configured for this project.")
 
             verification_agent = VerificationAgent_AppTarget(self.llm_service)
-            status, raw_output = verification_agent.run_all_tests(project_details['project_root_folder'], ui_test_command)
+            status, raw_output = verification_agent.run_all_tests(project_details['project_root_folder'], ui_test_command, progress_callback=progress_callback)
 
             if status == 'ENVIRONMENT_FAILURE':
                 if progress_callback: progress_callback(("ERROR", "Front-end test execution failed due to an environment error."))
@@ -5332,7 +5431,7 @@ class MasterOrchestrator:
 
             from agents.agent_verification_app_target import VerificationAgent_AppTarget
             verification_agent = VerificationAgent_AppTarget(self.llm_service)
-            status, raw_output = verification_agent.run_all_tests(project_details['project_root_folder'], ui_test_command)
+            status, raw_output = verification_agent.run_all_tests(project_details['project_root_folder'], ui_test_command, progress_callback=progress_callback)
 
             if status == 'ENVIRONMENT_FAILURE':
                 if progress_callback: progress_callback(("ERROR", "Front-end test execution failed due to an environment error."))
@@ -5607,6 +5706,7 @@ class MasterOrchestrator:
             cr_ids_to_update = [item['cr_id'] for item in sprint_items]
             sprint_goal_text = ", ".join(f"'{item['title']}'" for item in sprint_items if item.get('title'))
             self.db_manager.create_sprint(self.project_id, sprint_id, plan_json_str, sprint_goal_text)
+            self._index_plan_trace_links(sprint_id, plan_json_str)
             self.db_manager.link_items_to_sprint(sprint_id, cr_ids_to_update)
             self.db_manager.batch_update_cr_status(cr_ids_to_update, "IMPLEMENTATION_IN_PROGRESS")
 
@@ -5746,6 +5846,36 @@ class MasterOrchestrator:
         logging.info("All coding standards finalized. Proceeding to Backlog Gateway.")
         self.set_phase("AWAITING_BACKLOG_GATEWAY_DECISION")
 
+    def _get_artifact_relevance_scores(self, query: str) -> dict | None:
+        """
+        Pre-selects candidate artifacts for a query from the local search index.
+        Returns None (so callers fall back to in-memory ranking) if the lookup fails.
+        """
+        try:
+            return ProjectSearchIndex(self.db_manager).artifact_relevance_scores(self.project_id, query)
+        except Exception as e:
+            logging.warning(f"Search index lookup failed; falling back to in-memory ranking: {e}")
+            return None
+
+    def _index_spec_sections(self, project_id: str | None = None):
+        """Refreshes the search index over the project's spec sections after a spec is saved."""
+        try:
+            ProjectSearchIndex(self.db_manager).sync_spec_sections(project_id or self.project_id)
+        except Exception as e:
+            # search_spec_sections refreshes the index itself before every lookup.
+            logging.warning(f"Could not index spec sections: {e}")
+
+    def _select_spec_context(self, spec_field: str, spec_text: str | None, query: str) -> str | None:
+        """
+        Returns the spec text to put in a prompt for the query: whole if it is
+        small enough, otherwise its most relevant sections from the search index.
+        """
+        try:
+            return ProjectSearchIndex(self.db_manager).select_spec_context(self.project_id, spec_field, spec_text, query)
+        except Exception as e:
+            logging.warning(f"Spec section search failed; using the whole {spec_field}: {e}")
+            return spec_text
+
     def run_full_analysis(self, cr_id: int, **kwargs):
         """
         Orchestrates a full analysis (impact + technical) for a CR item.
@@ -5768,13 +5898,19 @@ class MasterOrchestrator:
             if not cr_details or not project_details:
                 raise Exception(f"Could not retrieve details for CR-{cr_id} or project.")
 
-            rowd_json = json.dumps([dict(row) for row in all_artifacts], indent=2)
+            cr_query = f"{cr_details['title'] or ''}\n{cr_details['description']}"
+            rowd_json = build_rowd_context_json(
+                all_artifacts,
+                task_text=cr_query,
+                lexical_override=self._get_artifact_relevance_scores(cr_query),
+                indent=2
+            )
             agent = ImpactAnalysisAgent_AppTarget(llm_service=self.llm_service)
 
             # --- Reverted to Single, Robust Call ---
             analysis_result = agent.run_full_analysis(
                 change_request_desc=cr_details['description'],
-                final_spec_text=project_details['final_spec_text'],
+                final_spec_text=self._select_spec_context("final_spec_text", project_details['final_spec_text'], cr_query),
                 rowd_json=rowd_json
             )
 
@@ -5818,8 +5954,7 @@ class MasterOrchestrator:
 
             all_impacted_ids = set()
             analysis_agent = ImpactAnalysisAgent_AppTarget(llm_service=self.llm_service)
-            all_artifacts_for_analysis = db.get_all_artifacts_for_project(self.project_id)
-            rowd_json_for_analysis = json.dumps([dict(row) for row in all_artifacts_for_analysis])
+            all_artifacts = db.get_all_artifacts_for_project(self.project_id)
             description_parts = []
 
             for item in sprint_items:
@@ -5827,9 +5962,15 @@ class MasterOrchestrator:
                 if item.get('status') == 'IMPACT_ANALYZED':
                     impacted_ids = json.loads(item.get('impacted_artifact_ids') or '[]')
                 else:
+                    item_query = f"{item.get('title') or ''}\n{item['description']}"
+                    rowd_json_for_analysis = build_rowd_context_json(
+                        all_artifacts,
+                        task_text=item_query,
+                        lexical_override=self._get_artifact_relevance_scores(item_query)
+                    )
                     analysis_result = analysis_agent.run_full_analysis(
                         change_request_desc=item['description'],
-                        final_spec_text=project_details.get('final_spec_text'),
+                        final_spec_text=self._select_spec_context("final_spec_text", project_details.get('final_spec_text'), item_query),
                         rowd_json=rowd_json_for_analysis
                     )
                     impacted_ids = analysis_result.get("impacted_artifact_ids", []) if analysis_result else []
@@ -5849,22 +5990,28 @@ class MasterOrchestrator:
 
             # Gather all available specs using the safe .get() method on the dictionary
             core_docs = {"final_spec_text": project_details.get('final_spec_text')}
-            ux_spec = project_details.get('ux_spec_text')
-            db_spec = project_details.get('db_schema_spec_text')
+            # Large supporting specs are cut down to the sections relevant to these items.
+            tech_spec = self._select_spec_context("tech_spec_text", project_details.get('tech_spec_text'), combined_description)
+            ux_spec = self._select_spec_context("ux_spec_text", project_details.get('ux_spec_text'), combined_description)
+            db_spec = self._select_spec_context("db_schema_spec_text", project_details.get('db_schema_spec_text'), combined_description)
 
             self.context_package_summary = self._build_and_validate_context_package(core_docs, source_code_files)
             if self.context_package_summary.get("error"):
                 raise Exception(f"Context Builder Error: {self.context_package_summary['error']}")
 
-            all_artifacts = db.get_all_artifacts_for_project(self.project_id)
-            rowd_json = json.dumps([dict(row) for row in all_artifacts])
+            rowd_json = build_rowd_context_json(
+                all_artifacts,
+                task_text=combined_description,
+                anchor_ids=all_impacted_ids,
+                anchor_paths=source_code_files.keys()
+            )
 
             planner_agent = RefactoringPlannerAgent_AppTarget(llm_service=self.llm_service)
             detected_technologies_json = project_details.get('detected_technologies', '[]')
             new_plan_str = planner_agent.create_refactoring_plan(
                 change_request_desc=combined_description,
                 final_spec_text=project_details.get('final_spec_text'),
-                tech_spec_text=project_details.get('tech_spec_text'),
+                tech_spec_text=tech_spec,
                 rowd_json=rowd_json,
                 source_code_context=self.context_package_summary["source_code"],
                 ux_spec_text=ux_spec,
@@ -6013,21 +6160,10 @@ class MasterOrchestrator:
                 return None
         return None
 
-    def _calculate_klyve_effort_metrics(self, spec_text: str) -> dict:
-        """
-        Performs a non-LLM, heuristic analysis on a spec text to generate
-        objective metrics that anchor the ProjectScopingAgent's analysis.
-        """
-        logging.info("Calculating Klyve Effort metrics for spec text...")
-        metrics = {
-            "context_pressure_score": len(spec_text),
-            "component_density_score": 0,
-            "ui_score": 0,
-            "backend_score": 0
-        }
-
-        # Use more specific phrases to avoid ambiguity
-        component_keywords = [
+    # Keyword categories of the Klyve Effort heuristics, counted as substrings
+    # (so 'screens' counts for 'screen'). Use more specific phrases to avoid ambiguity.
+    EFFORT_METRIC_KEYWORDS = {
+        "component_density_score": [
             # UI Components
             "screen", "view", "page", "window", "form", "dialog", "dashboard",
             "input field", "text field", "button", "dropdown",
@@ -6042,8 +6178,8 @@ class MasterOrchestrator:
             "ml model", "prediction service", "training pipeline",
             # Security Components
             "authentication service", "authorization rule"
-        ]
-        ui_keywords = [
+        ],
+        "ui_score": [
             # Core & Paradigms
             "gui", "ui", "user interface", "front-end", "view",
             # Desktop & Web
@@ -6057,8 +6193,8 @@ class MasterOrchestrator:
             # Digital & AI
             "chatbot", "voice interface", "virtual assistant", "visualization",
             "digital twin", "ar", "vr", "augmented reality", "virtual reality"
-        ]
-        backend_keywords = [
+        ],
+        "backend_score": [
             # Core Backend
             "backend", "server", "api", "database", "algorithm",
             # Data & AI
@@ -6072,15 +6208,21 @@ class MasterOrchestrator:
             # Cloud Computing
             "cloud", "aws", "azure", "gcp", "docker", "kubernetes", "container",
             "vm", "virtual machine"
-        ]
+        ],
+    }
+    EFFORT_METRIC_MATCHER = KeywordMatcher(EFFORT_METRIC_KEYWORDS)
 
-        lower_spec = spec_text.lower()
-        for keyword in component_keywords:
-            metrics["component_density_score"] += lower_spec.count(keyword)
-        for keyword in ui_keywords:
-            metrics["ui_score"] += lower_spec.count(keyword)
-        for keyword in backend_keywords:
-            metrics["backend_score"] += lower_spec.count(keyword)
+    def _calculate_klyve_effort_metrics(self, spec_text: str) -> dict:
+        """
+        Performs a non-LLM, heuristic analysis on a spec text to generate
+        objective metrics that anchor the ProjectScopingAgent's analysis.
+        All keyword categories are counted in a single pass over the spec.
+        """
+        logging.info("Calculating Klyve Effort metrics for spec text...")
+        metrics = {
+            "context_pressure_score": len(spec_text),
+            **self.EFFORT_METRIC_MATCHER.count(spec_text)
+        }
 
         logging.info(f"Klyve Effort Metrics calculated: {metrics}")
         return metrics
@@ -6138,6 +6280,7 @@ class MasterOrchestrator:
                 f"```json\n{json.dumps(external_blueprint_json, indent=2)}\n```"
             )
             db.update_project_field(self.project_id, "ux_spec_text", composite_spec_for_db)
+            self._index_spec_sections()
             final_blueprint_for_consolidation = external_blueprint_json
             # ux_spec_text_from_db = composite_spec_for_db
 
@@ -6183,6 +6326,8 @@ class MasterOrchestrator:
 
     def _commit_document(self, file_path: Path, commit_message: str):
         """A helper method to stage and commit a single document, but only if version control is enabled."""
+        import git
+
         if not self.project_id:
             return
         try:
@@ -6397,44 +6542,60 @@ class MasterOrchestrator:
                 flat_list.extend(self._flatten_hierarchy(item["user_stories"]))
         return flat_list
 
-    def _save_current_state(self):
+    def _save_current_state(self, immediate: bool = False):
         """
         Saves the currently active project's detailed operational state to the
         database. This is called automatically on phase transitions.
+
+        Saves are debounced and only changed fields are written; pass
+        immediate=True (or call flush_state) to force the write to disk.
         """
         if not self.project_id:
             return
 
         try:
-            db = self.db_manager
-            db.delete_orchestration_state_for_project(self.project_id)
-
             state_details_dict = {
                 "active_plan": self.active_plan,
                 "active_plan_cursor": self.active_plan_cursor,
                 "debug_attempt_counter": self.debug_attempt_counter,
                 "task_awaiting_approval": self.task_awaiting_approval,
                 "active_spec_draft": self.active_spec_draft,
-                "active_sprint_id": self.active_sprint_id
+                "active_sprint_id": self.active_sprint_id,
+                "is_in_fix_mode": self.is_in_fix_mode,
+                "fix_plan": self.fix_plan,
+                "fix_plan_cursor": self.fix_plan_cursor
             }
-            state_details_json = json.dumps(state_details_dict)
-
-            # --- ADD THIS LINE ---
-            logging.info(f"DEBUG: Attempting to save state for phase: {self.current_phase.name}")
-            # --- END OF ADDITION ---
-
-            db.save_orchestration_state(
+            self.state_store.save(
                 project_id=self.project_id,
                 current_phase=self.current_phase.name,
                 current_step="auto_saved_state",
-                state_details=state_details_json,
-                timestamp=datetime.now(timezone.utc).isoformat()
+                fields=state_details_dict,
+                immediate=immediate
             )
-            logging.info(f"Project '{self.project_name}' state automatically saved.")
+            logging.debug(f"Project '{self.project_name}' state queued for saving (phase: {self.current_phase.name}).")
 
         except Exception as e:
             logging.error(f"Failed to auto-save state for project {self.project_id}: {e}")
 
+    def flush_state(self):
+        """Forces any debounced state save to be written to the database."""
+        self.state_store.flush()
+
+    def _record_progress_event(self, event_type: str, phase: str | None = None, info: dict | None = None, **fields):
+        """
+        Appends a progress event to the state journal. Appends are cheap, so this
+        can be called at fine granularity; a full snapshot is only saved once
+        enough events have accumulated. `fields` are the absolute state values
+        the event sets when replayed on resume.
+        """
+        if not self.project_id:
+            return
+        try:
+            if self.state_store.append_event(self.project_id, event_type, phase=phase, fields=fields, info=info):
+                self._save_current_state()
+        except Exception as e:
+            logging.warning(f"Failed to record {event_type} event for project {self.project_id}: {e}")
+
     def pause_project(self):
         """
         Saves the project's current session state and resets the orchestrator to idle.
@@ -6446,7 +6607,7 @@ class MasterOrchestrator:
             return
 
         try:
-            self._save_current_state()
+            self._save_current_state(immediate=True)
             self.reset()
         except Exception as e:
             logging.error(f"Failed to cleanly pause project {self.project_id}: {e}", exc_info=True)
@@ -6476,14 +6637,20 @@ class MasterOrchestrator:
         # Delete other project data
         db.delete_all_artifacts_for_project(project_id)
         db.delete_all_change_requests_for_project(project_id)
+        self.state_store.forget(project_id)
         db.delete_orchestration_state_for_project(project_id)
+        db.delete_search_index_for_project(project_id)
+        db.delete_status_history_for_project(project_id)
+        db.delete_trace_links_for_project(project_id)
         db.delete_project_by_id(project_id)
         logging.info(f"Cleared all active data for project ID: {project_id}")
 
     def _create_project_archive_and_history_record(self, override_cr_data=None):
         """
         A reusable helper method that exports the current project DB state to
-        archive files and creates a corresponding history record.
+        a compressed archive and creates a corresponding history record.
+        Rows are streamed straight from the database; if an earlier archive of
+        the project exists, only the changes since then are written.
         It can now accept an override for the CR data for in-memory states.
         """
         if not self.project_id:
@@ -6500,34 +6667,37 @@ class MasterOrchestrator:
         archive_name = f"{self.project_name.replace(' ', '_')}_{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}"
 
         archive_dir.mkdir(parents=True, exist_ok=True)
-        rowd_file = archive_dir / f"{archive_name}_rowd.json"
-        cr_file = archive_dir / f"{archive_name}_cr.json"
-        project_file = archive_dir / f"{archive_name}_project.json"
+        archive_file = archive_dir / f"{archive_name}{ARCHIVE_SUFFIX}"
 
         try:
-            artifacts = db.get_all_artifacts_for_project(self.project_id)
             project_details_row = db.get_project_by_id(self.project_id)
 
             # --- START FIX: Use override data if provided ---
             if override_cr_data is not None:
-                cr_list = override_cr_data
+                cr_rows = override_cr_data
                 logging.info("Archiving with override CR data from in-memory state.")
             else:
-                change_requests = db.get_all_change_requests_for_project(self.project_id)
-                cr_list = [dict(row) for row in change_requests]
+                cr_rows = db.iter_change_requests_for_project(self.project_id)
             # --- END FIX ---
 
-            artifacts_list = [dict(row) for row in artifacts]
-            with open(rowd_file, 'w', encoding='utf-8') as f:
-                json.dump(artifacts_list, f, indent=4)
-
-            with open(cr_file, 'w', encoding='utf-8') as f:
-                json.dump(cr_list, f, indent=4)
-
-            if project_details_row:
-                project_details_dict = dict(project_details_row)
-                with open(project_file, 'w', encoding='utf-8') as f:
-                    json.dump(project_details_dict, f, indent=4)
+            # Chain onto the previous archive of this project if it is in the same folder.
+            previous_archive = None
+            latest_history = db.get_latest_history_for_project(self.project_id)
+            if latest_history and is_streaming_archive(latest_history['archive_file_path']):
+                candidate = Path(latest_history['archive_file_path'])
+                if candidate.parent == archive_dir and candidate.exists():
+                    previous_archive = candidate
+
+            write_project_archive(
+                archive_file,
+                self.project_id,
+                {
+                    TABLE_PROJECT: [dict(project_details_row)] if project_details_row else [],
+                    TABLE_ARTIFACT: db.iter_artifacts_for_project(self.project_id),
+                    TABLE_CR: cr_rows,
+                },
+                previous_archive=previous_archive
+            )
 
             root_folder_path = project_details_row['project_root_folder'] if project_details_row else "N/A"
 
@@ -6535,7 +6705,7 @@ class MasterOrchestrator:
                 project_id=self.project_id,
                 project_name=self.project_name,
                 root_folder=root_folder_path,
-                archive_path=str(rowd_file),
+                archive_path=str(archive_file),
                 timestamp=datetime.now(timezone.utc).isoformat()
             )
             logging.info(f"Successfully created archive and history record for '{self.project_name}'.")
@@ -6759,18 +6929,24 @@ class MasterOrchestrator:
                 return False, error_msg
 
             archive_path_str = history_record['archive_file_path']
-            rowd_file = Path(archive_path_str)
-            cr_file = rowd_file.with_name(rowd_file.name.replace("_rowd.json", "_cr.json"))
-            project_file = rowd_file.with_name(rowd_file.name.replace("_rowd.json", "_project.json"))
-
-            for file_to_delete in [rowd_file, cr_file, project_file]:
-                if file_to_delete.exists():
-                    file_to_delete.unlink()
-                    logging.info(f"Deleted archive file: {file_to_delete}")
-                else:
-                    logging.warning(f"Could not find archive file to delete at: {file_to_delete}")
+            if is_streaming_archive(archive_path_str):
+                # Base archives of later deltas are kept until nothing depends on them.
+                db.delete_project_from_history(history_id)
+                still_referenced = [Path(record['archive_file_path']) for record in db.get_project_history()]
+                delete_archive_files(Path(archive_path_str), still_referenced)
+            else:
+                rowd_file = Path(archive_path_str)
+                cr_file = rowd_file.with_name(rowd_file.name.replace("_rowd.json", "_cr.json"))
+                project_file = rowd_file.with_name(rowd_file.name.replace("_rowd.json", "_project.json"))
+
+                for file_to_delete in [rowd_file, cr_file, project_file]:
+                    if file_to_delete.exists():
+                        file_to_delete.unlink()
+                        logging.info(f"Deleted archive file: {file_to_delete}")
+                    else:
+                        logging.warning(f"Could not find archive file to delete at: {file_to_delete}")
 
-            db.delete_project_from_history(history_id)
+                db.delete_project_from_history(history_id)
             success_msg = f"Successfully deleted archived project (History ID: {history_id})."
             logging.info(success_msg)
             return True, success_msg
@@ -6801,10 +6977,11 @@ class MasterOrchestrator:
             logging.error(error_msg, exc_info=True)
             return False, error_msg
 
-    def load_archived_project(self, history_id: int):
+    def load_archived_project(self, history_id: int, progress_callback=None):
         """
         Loads an archived project's data, performs pre-flight checks,
         and sets the appropriate phase for UI resolution.
+        Archive rows are streamed into the database in a single transaction.
         """
         try:
             db = self.db_manager
@@ -6818,21 +6995,11 @@ class MasterOrchestrator:
 
             project_id_to_load = history_record['project_id']
 
-            rowd_file_path = Path(history_record['archive_file_path'])
-            project_file_path = rowd_file_path.with_name(rowd_file_path.name.replace("_rowd.json", "_project.json"))
-            cr_file_path = rowd_file_path.with_name(rowd_file_path.name.replace("_rowd.json", "_cr.json"))
-
-            if project_file_path.exists():
-                with open(project_file_path, 'r', encoding='utf-8') as f:
-                    db.create_or_update_project_record(json.load(f))
-            if rowd_file_path.exists():
-                with open(rowd_file_path, 'r', encoding='utf-8') as f:
-                    artifacts_to_load = json.load(f)
-                    if artifacts_to_load: db.bulk_insert_artifacts(artifacts_to_load)
-            if cr_file_path.exists():
-                with open(cr_file_path, 'r', encoding='utf-8') as f:
-                    crs_to_load = json.load(f)
-                    if crs_to_load: db.bulk_insert_change_requests(crs_to_load)
+            archive_path = Path(history_record['archive_file_path'])
+            if is_streaming_archive(archive_path):
+                import_project_archive(db, archive_path, progress_callback)
+            else:
+                import_legacy_archive(db, archive_path, progress_callback)
 
             self.project_id = project_id_to_load
             self.project_name = history_record['project_name']
@@ -6900,7 +7067,7 @@ class MasterOrchestrator:
 
                 # Extract file paths from the error log
                 failure_desc = self.task_awaiting_approval.get("failure_log", "")
-                files = triage.parse_stack_trace(failure_desc)
+                files = triage.parse_stack_trace(failure_desc, project_root=project_row['project_root_folder'], project_id=self.project_id)
 
                 if files:
                     from pathlib import Path
@@ -6971,6 +7138,7 @@ class MasterOrchestrator:
             self.fix_plan = parsed_plan
             self.fix_plan_cursor = 0
             self.is_in_fix_mode = True
+            self._record_progress_event(EVENT_FIX_PLAN_LOADED, fix_plan=parsed_plan, fix_plan_cursor=0, is_in_fix_mode=True)
 
             self.set_phase("GENESIS")
             logging.info(f"Successfully generated a fix plan with {len(parsed_plan)} steps. Entering fix mode.")
@@ -7841,6 +8009,33 @@ class MasterOrchestrator:
         recurse_and_add_ids(full_hierarchy)
         return full_hierarchy
 
+    def _get_hierarchical_id_map(self) -> dict[int, str]:
+        """
+        Returns {cr_id: hierarchical_id} with the same numbering as
+        _get_backlog_with_hierarchical_numbers, from a single query over the
+        parent links instead of building the full nested backlog.
+        """
+        links = self.db_manager.get_backlog_tree_links(self.project_id)
+        cr_ids = {row['cr_id'] for row in links}
+        top_level = []
+        children = {}
+        for row in links: # Ordered by cr_id, as children are listed in the hierarchy
+            if row['parent_cr_id'] is None:
+                top_level.append(row)
+            elif row['parent_cr_id'] in cr_ids:
+                children.setdefault(row['parent_cr_id'], []).append(row['cr_id'])
+        top_level.sort(key=lambda row: row['display_order'])
+
+        hierarchical_ids = {}
+        stack = [(row['cr_id'], str(i)) for i, row in reversed(list(enumerate(top_level, 1)))]
+        while stack:
+            cr_id, number = stack.pop()
+            if cr_id in hierarchical_ids:
+                continue
+            hierarchical_ids[cr_id] = number
+            stack.extend((child_id, f"{number}.{i}") for i, child_id in reversed(list(enumerate(children.get(cr_id, []), 1))))
+        return hierarchical_ids
+
     def get_project_documents(self) -> tuple[list[dict], list[str]]:
         """
         Gets a classified list of documents for the Document Hub.
@@ -8053,10 +8248,10 @@ class MasterOrchestrator:
                 self.load_development_plan(latest_sprint['sprint_plan_json'])
                 self._recalculate_plan_cursor_from_db()
 
-                # We must also re-load the task_awaiting_approval if it was a pause
-                saved_state = self.db_manager.get_orchestration_state_for_project(self.project_id)
-                if saved_state:
-                    details = json.loads(saved_state['state_details'])
+                # We must also re-load the task_awaiting_approval if it was a pause,
+                # replaying any journalled progress over the last snapshot.
+                if self.state_store.has_saved_state(self.project_id):
+                    details = self.state_store.load_details(self.project_id)
                     self.task_awaiting_approval = details.get("task_awaiting_approval")
                     if self.task_awaiting_approval and self.task_awaiting_approval.get("resuming_from_manual_fix"):
                         self.is_resuming_from_manual_fix = True
@@ -8081,8 +8276,12 @@ class MasterOrchestrator:
         try:
             from agents.agent_triage_app_target import TriageAgent_AppTarget
             agent = TriageAgent_AppTarget(self.llm_service, self.db_manager)
+            project_root = None
+            if self.project_id:
+                project_details = self.db_manager.get_project_by_id(self.project_id)
+                project_root = project_details['project_root_folder'] if project_details else None
             # We can reuse the existing parse_stack_trace method
-            file_paths = agent.parse_stack_trace(failure_log)
+            file_paths = agent.parse_stack_trace(failure_log, project_root=project_root, project_id=self.project_id)
             return file_paths
         except Exception as e:
             logging.error(f"Failed to parse stack trace for IDE launch: {e}")
@@ -0,0 +1,258 @@
+# orchestration_state_store.py
+
+import hashlib
+import json
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
+# Fields that can grow large (full plans, failure logs, spec drafts). These are
+# stored once per distinct content hash instead of inline with the state row.
+BLOB_FIELDS = ("active_plan", "fix_plan", "task_awaiting_approval", "active_spec_draft")
+
+# Rapid phase transitions inside this window are coalesced into a single write.
+DEFAULT_DEBOUNCE_SECONDS = 0.5
+
+# Number of journal events after which the caller is asked to write a snapshot.
+DEFAULT_COMPACTION_THRESHOLD = 50
+
+# Snapshot field recording the last journal event the snapshot already covers.
+JOURNAL_SEQ_FIELD = "journal_seq"
+
+# Journal event types.
+EVENT_PHASE_CHANGED = "PHASE_CHANGED"
+EVENT_PLAN_LOADED = "PLAN_LOADED"
+EVENT_FIX_PLAN_LOADED = "FIX_PLAN_LOADED"
+EVENT_FIX_PLAN_COMPLETED = "FIX_PLAN_COMPLETED"
+EVENT_TASK_STARTED = "TASK_STARTED"
+EVENT_TASK_COMMITTED = "TASK_COMMITTED"
+EVENT_TASK_COMPLETED = "TASK_COMPLETED"
+
+
+def _fingerprint(serialized: str) -> str:
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class OrchestrationStateStore:
+    """
+    Persists the orchestrator's resumable session state incrementally.
+
+    Each state field is stored as its own row and only rewritten when its
+    serialized value changes. Large fields are stored by content hash, so an
+    unchanged plan or draft is never written twice. Saves are debounced, and
+    flush() forces any pending save to disk (used on pause and application exit).
+
+    Between snapshots, fine-grained progress is recorded as append-only journal
+    events. Every event carries absolute field values, so replaying an event the
+    snapshot already reflects is harmless. Writing a snapshot compacts the
+    journal up to the last event it covers.
+    """
+
+    def __init__(self, db_manager, debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+                 compaction_threshold: int = DEFAULT_COMPACTION_THRESHOLD):
+        if not db_manager:
+            raise ValueError("Database manager cannot be None.")
+        self.db_manager = db_manager
+        self.debounce_seconds = debounce_seconds
+        self.compaction_threshold = compaction_threshold
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        # (project_id, phase, step, {field_name: serialized JSON}, journal seq) of the queued save.
+        self._pending: Optional[tuple[str, str, str, dict[str, str], int]] = None
+        # project_id -> {field_name: fingerprint} of what is known to be on disk.
+        self._written: dict[str, dict[str, str]] = {}
+        # project_id -> sequence number of the newest journal event.
+        self._last_seq: dict[str, int] = {}
+        # project_id -> journal seq covered by the last snapshot written in this session.
+        self._written_seq: dict[str, int] = {}
+        self._events_since_snapshot: dict[str, int] = {}
+
+    def append_event(self, project_id: str, event_type: str, phase: Optional[str] = None,
+                     fields: Optional[dict] = None, info: Optional[dict] = None) -> bool:
+        """
+        Appends a progress event to the journal.
+
+        Args:
+            phase: The phase the orchestrator is in after the event, if it changed.
+            fields: State fields (absolute values) the event sets on replay.
+            info: Descriptive details (task names, commit hashes) kept for diagnostics.
+
+        Returns:
+            True if enough events have accumulated that a snapshot should be saved.
+        """
+        payload = {}
+        if phase:
+            payload["phase"] = phase
+        if fields:
+            payload["fields"] = fields
+        if info:
+            payload["info"] = info
+        seq = self.db_manager.append_orchestration_event(
+            project_id, event_type, json.dumps(payload), datetime.now(timezone.utc).isoformat()
+        )
+        with self._write_lock:
+            self._last_seq[project_id] = max(seq, self._last_seq.get(project_id, 0))
+            count = self._events_since_snapshot.get(project_id, 0) + 1
+            self._events_since_snapshot[project_id] = count
+        return count >= self.compaction_threshold
+
+    def save(self, project_id: str, current_phase: str, current_step: str, fields: dict, immediate: bool = False):
+        """
+        Queues the given state for persistence. The write happens after the
+        debounce window unless `immediate` is True.
+
+        The snapshot covers the journal only up to the newest event at the time
+        of this call: events appended during the debounce window are not in
+        `fields`, so they stay in the journal.
+
+        Fields are serialized here, on the caller's thread, so later changes to
+        the live objects cannot leak into (or break) the deferred write.
+        """
+        serialized_fields = {field_name: json.dumps(value) for field_name, value in fields.items()}
+        snapshot_seq = self._journal_seq(project_id)
+        with self._lock:
+            self._pending = (project_id, current_phase, current_step, serialized_fields, snapshot_seq)
+            if not immediate and self.debounce_seconds > 0:
+                if self._timer is None:
+                    self._timer = threading.Timer(self.debounce_seconds, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self.flush()
+
+    def _journal_seq(self, project_id: str) -> int:
+        with self._write_lock:
+            if project_id not in self._last_seq:
+                self._last_seq[project_id] = self.db_manager.get_latest_orchestration_event_seq(project_id)
+            return self._last_seq[project_id]
+
+    def flush(self):
+        """Writes any pending state to the database now."""
+        # Taking the pending save and writing it happen under one lock, so a
+        # snapshot taken here can never land after a newer one written meanwhile.
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, None
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if pending:
+                self._write(*pending)
+
+    def forget(self, project_id: str):
+        """
+        Drops any pending save and cached fingerprints for a project. Must be
+        called whenever the project's saved state is deleted from the database.
+        """
+        with self._lock:
+            if self._pending and self._pending[0] == project_id:
+                self._pending = None
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+        with self._write_lock:
+            self._written.pop(project_id, None)
+            self._written_seq.pop(project_id, None)
+            self._last_seq.pop(project_id, None)
+            self._events_since_snapshot.pop(project_id, None)
+
+    def has_saved_state(self, project_id: str) -> bool:
+        """True if a snapshot or any journal events exist for the project."""
+        self.flush()
+        return bool(self.db_manager.get_orchestration_state_for_project(project_id)
+                    or self.db_manager.get_latest_orchestration_event_seq(project_id))
+
+    def load_state(self, project_id: str, state_row=None) -> tuple[Optional[str], dict]:
+        """
+        Rebuilds a project's saved state by replaying the journal tail over the
+        last snapshot.
+
+        Returns:
+            A tuple of (phase name or None, state fields dict).
+        """
+        self.flush()
+        if state_row is None:
+            state_row = self.db_manager.get_orchestration_state_for_project(project_id)
+        phase = state_row['current_phase'] if state_row else None
+        details = self._load_snapshot_fields(project_id, state_row)
+        snapshot_seq = details.pop(JOURNAL_SEQ_FIELD, None) or 0
+
+        events = self.db_manager.get_orchestration_events(project_id, snapshot_seq)
+        for event in events:
+            payload = json.loads(event['payload'] or "{}")
+            details.update(payload.get("fields") or {})
+            phase = payload.get("phase") or phase
+        if events:
+            logging.info(f"Replayed {len(events)} journal event(s) over the saved snapshot for project {project_id}.")
+        return phase, details
+
+    def load_details(self, project_id: str, state_row=None) -> dict:
+        """Returns only the state fields from load_state()."""
+        return self.load_state(project_id, state_row)[1]
+
+    def _load_snapshot_fields(self, project_id: str, state_row) -> dict:
+        """
+        Returns the snapshot fields for a project. Falls back to the legacy
+        single-blob `state_details` column for states saved by older versions.
+        """
+        details = {}
+        for row in self.db_manager.get_orchestration_state_fields(project_id):
+            value = row['blob_content'] if row['blob_hash'] else row['value_json']
+            details[row['field_name']] = json.loads(value) if value is not None else None
+        if details:
+            return details
+        if state_row and state_row['state_details']:
+            return json.loads(state_row['state_details'])
+        return {}
+
+    def _write(self, project_id: str, current_phase: str, current_step: str, serialized_fields: dict[str, str],
+               snapshot_seq: int):
+        # Called by flush() with _write_lock held.
+        if snapshot_seq < self._written_seq.get(project_id, 0):
+            # A newer snapshot already compacted the journal past this one; writing
+            # it would roll the state back to before events that are now gone.
+            logging.warning(f"Skipped a stale orchestration state save for project {project_id} "
+                            f"(covers journal seq {snapshot_seq}, already saved through "
+                            f"{self._written_seq[project_id]}).")
+            return
+        try:
+            # snapshot_seq was read when the fields were captured, so every event
+            # up to it is already reflected in the values being written.
+            fields = dict(serialized_fields, **{JOURNAL_SEQ_FIELD: json.dumps(snapshot_seq)})
+
+            written = self._written.get(project_id, {})
+            changed_fields = []
+            new_blobs = {}
+            fingerprints = {}
+            for field_name, serialized in fields.items():
+                fingerprint = _fingerprint(serialized)
+                fingerprints[field_name] = fingerprint
+                if written.get(field_name) == fingerprint:
+                    continue
+                if field_name in BLOB_FIELDS and serialized != "null":
+                    new_blobs[fingerprint] = serialized
+                    changed_fields.append((field_name, None, fingerprint))
+                else:
+                    changed_fields.append((field_name, serialized, None))
+
+            self.db_manager.upsert_orchestration_state(
+                project_id=project_id,
+                current_phase=current_phase,
+                current_step=current_step,
+                timestamp=datetime.now(timezone.utc).isoformat(),
+                changed_fields=changed_fields,
+                new_blobs=new_blobs,
+                compact_through_seq=snapshot_seq
+            )
+            self._written[project_id] = fingerprints
+            self._written_seq[project_id] = snapshot_seq
+            self._events_since_snapshot[project_id] = 0
+            logging.debug(f"Saved orchestration state for project {project_id} "
+                          f"({len(changed_fields)} of {len(fields)} fields changed).")
+        except Exception as e:
+            # Leave the cache untouched so the next save rewrites everything.
+            self._written.pop(project_id, None)
+            logging.error(f"Failed to save orchestration state for project {project_id}: {e}")
@@ -0,0 +1,250 @@
+# process_runner.py
+
+import logging
+import os
+import queue
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+# Default limits for a single test/build command. A hung test runner must never
+# block the worker thread forever.
+DEFAULT_WALL_CLOCK_TIMEOUT_SECONDS = 1800
+DEFAULT_IDLE_TIMEOUT_SECONDS = 300
+
+# Default limits for the captured output that is handed back to callers (and
+# from there into LLM failure logs).
+DEFAULT_HEAD_LINES = 200
+DEFAULT_TAIL_LINES = 400
+DEFAULT_FAILURE_LINES = 600
+DEFAULT_FAILURE_CONTEXT_LINES = 25
+MAX_LINE_LENGTH = 2000
+
+# Lines that open a "failure section" worth keeping even when it falls in the
+# middle of a very long log (pytest, unittest, jest, go test, dotnet, cargo, ...).
+FAILURE_MARKER_PATTERN = re.compile(
+    r"(Traceback \(most recent call last\)|^=+ (FAILURES|ERRORS) =+|^_{3,} .* _{3,}$"
+    r"|^(FAIL|ERROR)[:\s]|\bFAILED\b|AssertionError|Exception in thread|--- FAIL:|^panic:"
+    r"|panicked at|^\s*●\s|✕|Failed\s+\S+\s*\[|error(\[E\d+\])?:|\bUnhandled\b)"
+)
+
+
+@dataclass
+class CommandResult:
+    """
+    The outcome of a streamed command execution.
+    `output` holds the bounded capture (head, failure sections and tail), not
+    the full log.
+    """
+    returncode: Optional[int]
+    output: str
+    timed_out: bool = False
+    timeout_reason: Optional[str] = None
+    total_lines: int = 0
+    dropped_lines: int = 0
+    duration_seconds: float = 0.0
+
+
+class BoundedOutputBuffer:
+    """
+    Retains a bounded view of a potentially unbounded line stream: the first
+    `head_lines`, the last `tail_lines`, and any failure sections found in
+    between (each marker line plus a few lines of context).
+    """
+
+    def __init__(self, head_lines: int = DEFAULT_HEAD_LINES, tail_lines: int = DEFAULT_TAIL_LINES,
+                 failure_lines: int = DEFAULT_FAILURE_LINES, failure_context_lines: int = DEFAULT_FAILURE_CONTEXT_LINES):
+        self.head_limit = head_lines
+        self.failure_limit = failure_lines
+        self.failure_context_lines = failure_context_lines
+        self.head: list[str] = []
+        self.tail: deque = deque(maxlen=tail_lines)
+        self.failure_sections: list[tuple[int, str]] = []
+        self.total_lines = 0
+        self._failure_window = 0
+
+    def add_line(self, line: str):
+        """Adds a single line (without trailing newline) to the buffer."""
+        if len(line) > MAX_LINE_LENGTH:
+            line = line[:MAX_LINE_LENGTH] + " ...[line truncated]"
+
+        line_number = self.total_lines
+        self.total_lines += 1
+
+        if len(self.head) < self.head_limit:
+            self.head.append(line)
+            return
+
+        if FAILURE_MARKER_PATTERN.search(line):
+            self._failure_window = self.failure_context_lines
+
+        if self._failure_window > 0:
+            self._failure_window -= 1
+            if len(self.failure_sections) < self.failure_limit:
+                self.failure_sections.append((line_number, line))
+
+        # Anything that falls out of the tail window has either been kept as part
+        # of a failure section above or is dropped.
+        self.tail.append((line_number, line))
+
+    @property
+    def dropped_lines(self) -> int:
+        kept = {n for n, _ in self.failure_sections} | {n for n, _ in self.tail}
+        return max(0, self.total_lines - len(self.head) - len(kept))
+
+    def render(self) -> str:
+        """Returns the retained lines as a single string, marking any gaps."""
+        parts = list(self.head)
+        last_line_number = len(self.head) - 1
+
+        tail_start = self.tail[0][0] if self.tail else self.total_lines
+        middle = [(n, text) for n, text in self.failure_sections if n < tail_start]
+
+        for line_number, text in middle + list(self.tail):
+            if line_number <= last_line_number:
+                continue
+            if line_number != last_line_number + 1:
+                skipped = line_number - last_line_number - 1
+                parts.append(f"... [{skipped} lines omitted] ...")
+            parts.append(text)
+            last_line_number = line_number
+
+        return "\n".join(parts)
+
+
+def _popen_group_kwargs() -> dict:
+    """Returns Popen arguments that place the child in its own process group."""
+    if sys.platform == "win32":
+        return {"creationflags": subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def _kill_process_group(process: subprocess.Popen):
+    """Terminates the process and every child it spawned."""
+    try:
+        if sys.platform == "win32":
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                capture_output=True,
+                check=False,
+                creationflags=subprocess.CREATE_NO_WINDOW
+            )
+        else:
+            os.killpg(os.getpgid(process.pid), signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, OSError) as e:
+        logging.warning(f"Could not kill process group for PID {process.pid}: {e}")
+    finally:
+        try:
+            process.kill()
+        except OSError:
+            pass
+
+
+def _reader_thread(stream, line_queue: queue.Queue):
+    """Pushes lines from the child's output stream onto a queue until EOF."""
+    try:
+        for line in iter(stream.readline, ''):
+            line_queue.put(line)
+    except (ValueError, OSError):
+        pass
+    finally:
+        line_queue.put(None)
+
+
+def run_streaming_command(command: str | list[str], cwd: str | Path, progress_callback: Optional[Callable] = None,
+                          shell: bool = True, wall_clock_timeout: Optional[float] = DEFAULT_WALL_CLOCK_TIMEOUT_SECONDS,
+                          idle_timeout: Optional[float] = DEFAULT_IDLE_TIMEOUT_SECONDS,
+                          buffer: Optional[BoundedOutputBuffer] = None) -> CommandResult:
+    """
+    Runs a command with stdout and stderr merged, streaming each line to the
+    optional progress_callback as ("INFO", line) while it runs.
+
+    Only a bounded capture of the output is kept in memory. If the command runs
+    longer than `wall_clock_timeout` seconds, or produces no output for
+    `idle_timeout` seconds, the whole process group is killed.
+
+    Raises:
+        FileNotFoundError: If the executable could not be found (shell=False).
+    """
+    buffer = buffer or BoundedOutputBuffer()
+    start_time = time.monotonic()
+
+    process = subprocess.Popen(
+        command,
+        shell=shell,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        stdin=subprocess.DEVNULL,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        bufsize=1,
+        **_popen_group_kwargs()
+    )
+
+    line_queue: queue.Queue = queue.Queue()
+    reader = threading.Thread(target=_reader_thread, args=(process.stdout, line_queue), daemon=True)
+    reader.start()
+
+    timeout_reason = None
+    last_output_time = start_time
+
+    while True:
+        try:
+            line = line_queue.get(timeout=0.25)
+        except queue.Empty:
+            line = ""
+        else:
+            if line is None:
+                break
+            last_output_time = time.monotonic()
+            line = line.rstrip("\r\n")
+            buffer.add_line(line)
+            if progress_callback:
+                try:
+                    progress_callback(("INFO", line))
+                except Exception as e:
+                    logging.debug(f"Progress callback failed while streaming output: {e}")
+
+        # Checked after every line too, so a command that never stops printing still times out.
+        now = time.monotonic()
+        if wall_clock_timeout and now - start_time > wall_clock_timeout:
+            timeout_reason = f"Command exceeded the wall-clock timeout of {wall_clock_timeout} seconds."
+        elif idle_timeout and now - last_output_time > idle_timeout:
+            timeout_reason = f"Command produced no output for {idle_timeout} seconds."
+
+        if timeout_reason:
+            logging.error(f"{timeout_reason} Killing process group for: {command}")
+            _kill_process_group(process)
+            break
+
+    try:
+        returncode = process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        _kill_process_group(process)
+        returncode = process.poll()
+    reader.join(timeout=2)
+    if process.stdout:
+        process.stdout.close()
+
+    output = buffer.render()
+    if timeout_reason:
+        output += f"\n[Klyve] {timeout_reason} The process was terminated."
+
+    return CommandResult(
+        returncode=returncode,
+        output=output,
+        timed_out=timeout_reason is not None,
+        timeout_reason=timeout_reason,
+        total_lines=buffer.total_lines,
+        dropped_lines=buffer.dropped_lines,
+        duration_seconds=time.monotonic() - start_time
+    )
@@ -0,0 +1,310 @@
+# project_archive.py
+
+import gzip
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+ARCHIVE_SUFFIX = ".klyvearc"
+INDEX_SUFFIX = ".klyveidx"
+ARCHIVE_FORMAT = "klyve-archive"
+ARCHIVE_FORMAT_VERSION = 1
+
+# A full archive is written again once this many deltas have been chained,
+# which bounds how many files a load has to read.
+MAX_DELTA_CHAIN = 10
+
+# Text values at least this long are stored once per archive chain, keyed by
+# their SHA-256, and referenced from rows as {"$blob": "<hash>"}.
+BLOB_MIN_LENGTH = 1024
+BLOB_REF_KEY = "$blob"
+
+COMPRESS_LEVEL = 6
+
+TABLE_PROJECT = "project"
+TABLE_ARTIFACT = "artifact"
+TABLE_CR = "cr"
+
+# Archived table -> primary key column.
+TABLE_KEYS = {
+    TABLE_PROJECT: "project_id",
+    TABLE_ARTIFACT: "artifact_id",
+    TABLE_CR: "cr_id",
+}
+
+
+@dataclass
+class ArchiveResult:
+    """Summary of a single archive export."""
+    path: Path
+    kind: str
+    rows_written: int = 0
+    rows_unchanged: int = 0
+    rows_deleted: int = 0
+    blobs_written: int = 0
+    blobs_reused: int = 0
+    size_bytes: int = 0
+    duration_seconds: float = 0.0
+
+
+@dataclass
+class _ArchiveIndex:
+    """
+    The sidecar index of an archive: the row hashes of the full project state
+    at that archive, and the blobs available anywhere in its chain.
+    """
+    archive_name: str
+    chain_length: int = 0
+    rows: dict[str, dict[str, str]] = field(default_factory=dict)
+    blobs: set[str] = field(default_factory=set)
+
+
+def _row_hash(row: dict) -> str:
+    return hashlib.sha256(json.dumps(row, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _index_path(archive_path: Path) -> Path:
+    return archive_path.with_suffix(INDEX_SUFFIX)
+
+
+def is_streaming_archive(path: str | Path) -> bool:
+    return Path(path).suffix == ARCHIVE_SUFFIX
+
+
+def _write_index(archive_path: Path, index: _ArchiveIndex):
+    payload = {
+        "archive": index.archive_name,
+        "chain_length": index.chain_length,
+        "rows": index.rows,
+        "blobs": sorted(index.blobs),
+    }
+    with gzip.open(_index_path(archive_path), "wt", encoding="utf-8", compresslevel=COMPRESS_LEVEL) as f:
+        json.dump(payload, f)
+
+
+def _read_index(archive_path: Path) -> Optional[_ArchiveIndex]:
+    index_path = _index_path(archive_path)
+    if not archive_path.exists() or not index_path.exists():
+        return None
+    try:
+        with gzip.open(index_path, "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+        return _ArchiveIndex(
+            archive_name=payload["archive"],
+            chain_length=payload.get("chain_length", 0),
+            rows={table: dict(hashes) for table, hashes in payload.get("rows", {}).items()},
+            blobs=set(payload.get("blobs", [])),
+        )
+    except (OSError, ValueError, KeyError) as e:
+        logging.warning(f"Archive index {index_path} is unreadable; a full archive will be written instead. Error: {e}")
+        return None
+
+
+class _ArchiveWriter:
+    """Writes JSON Lines records into a gzip container, deduplicating large text values."""
+
+    def __init__(self, handle, known_blobs: set[str], result: ArchiveResult):
+        self._handle = handle
+        self._known_blobs = known_blobs
+        self._result = result
+
+    def write_record(self, record: dict):
+        self._handle.write(json.dumps(record, default=str))
+        self._handle.write("\n")
+
+    def write_row(self, table: str, row: dict):
+        stored = {}
+        for column, value in row.items():
+            if isinstance(value, str) and len(value) >= BLOB_MIN_LENGTH:
+                blob_hash = hashlib.sha256(value.encode("utf-8")).hexdigest()
+                if blob_hash in self._known_blobs:
+                    self._result.blobs_reused += 1
+                else:
+                    # Blobs always precede the first row that references them.
+                    self.write_record({"type": "blob", "hash": blob_hash, "text": value})
+                    self._known_blobs.add(blob_hash)
+                    self._result.blobs_written += 1
+                value = {BLOB_REF_KEY: blob_hash}
+            stored[column] = value
+        self.write_record({"type": "row", "table": table, "row": stored})
+
+
+def write_project_archive(archive_path: Path, project_id: str, tables: dict[str, Iterable[dict]],
+                          previous_archive: Optional[Path] = None) -> ArchiveResult:
+    """
+    Streams a project's rows into a compressed archive.
+
+    If `previous_archive` (an earlier archive of the same project) has a usable
+    index and its chain is not too long, only rows that changed since then are
+    written, plus deletion markers for rows that disappeared. Otherwise a full
+    archive is written.
+
+    Args:
+        archive_path: Target file; should end with ARCHIVE_SUFFIX.
+        tables: {table name: iterable of row dicts}. Rows are consumed lazily, so
+            database cursors can be passed straight through.
+        previous_archive: The latest earlier archive of this project, if any.
+    """
+    started = time.perf_counter()
+    base_index = _read_index(previous_archive) if previous_archive else None
+    if base_index and base_index.chain_length >= MAX_DELTA_CHAIN:
+        base_index = None
+
+    kind = "delta" if base_index else "full"
+    result = ArchiveResult(path=archive_path, kind=kind)
+    new_index = _ArchiveIndex(
+        archive_name=archive_path.name,
+        chain_length=base_index.chain_length + 1 if base_index else 0,
+        blobs=set(base_index.blobs) if base_index else set(),
+    )
+
+    temp_path = archive_path.with_name(archive_path.name + ".tmp")
+    with gzip.open(temp_path, "wt", encoding="utf-8", compresslevel=COMPRESS_LEVEL) as handle:
+        writer = _ArchiveWriter(handle, new_index.blobs, result)
+        writer.write_record({
+            "type": "header",
+            "format": ARCHIVE_FORMAT,
+            "version": ARCHIVE_FORMAT_VERSION,
+            "project_id": project_id,
+            "kind": kind,
+            "base": previous_archive.name if base_index else None,
+            "created": datetime.now(timezone.utc).isoformat(),
+        })
+
+        for table, rows in tables.items():
+            key_column = TABLE_KEYS[table]
+            previous_hashes = base_index.rows.get(table, {}) if base_index else {}
+            current_hashes = {}
+            for row in rows:
+                row = row if isinstance(row, dict) else dict(row)
+                key = str(row[key_column])
+                row_hash = _row_hash(row)
+                current_hashes[key] = row_hash
+                if previous_hashes.get(key) == row_hash:
+                    result.rows_unchanged += 1
+                    continue
+                writer.write_row(table, row)
+                result.rows_written += 1
+
+            for key in previous_hashes.keys() - current_hashes.keys():
+                writer.write_record({"type": "delete", "table": table, "key": key})
+                result.rows_deleted += 1
+            new_index.rows[table] = current_hashes
+
+        # A missing trailer marks an archive that was cut short.
+        writer.write_record({"type": "end", "rows_written": result.rows_written, "rows_deleted": result.rows_deleted})
+
+    temp_path.replace(archive_path)
+    _write_index(archive_path, new_index)
+
+    result.size_bytes = archive_path.stat().st_size
+    result.duration_seconds = time.perf_counter() - started
+    logging.info(
+        f"Wrote {kind} archive {archive_path.name}: {result.rows_written} rows written, "
+        f"{result.rows_unchanged} unchanged, {result.rows_deleted} deleted, {result.blobs_written} new blobs, "
+        f"{result.size_bytes / 1024:.1f} KB in {result.duration_seconds:.2f}s."
+    )
+    return result
+
+
+# --- Reading ---
+
+def iter_archive_file(archive_path: Path) -> Iterator[dict]:
+    """Yields the raw records of a single archive file, one line at a time."""
+    saw_end = False
+    with gzip.open(archive_path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get("type") == "end":
+                saw_end = True
+            yield record
+    if not saw_end:
+        raise ValueError(f"Archive {archive_path} is incomplete (no end record).")
+
+
+def read_archive_header(archive_path: Path) -> dict:
+    with gzip.open(archive_path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+    if header.get("type") != "header" or header.get("format") != ARCHIVE_FORMAT:
+        raise ValueError(f"{archive_path} is not a Klyve archive.")
+    return header
+
+
+def resolve_archive_chain(archive_path: Path) -> list[Path]:
+    """Returns the archive files needed to restore `archive_path`, oldest (full) first."""
+    chain = []
+    current = Path(archive_path)
+    while True:
+        if current in chain:
+            raise ValueError(f"Archive chain for {archive_path} contains a cycle.")
+        if not current.exists():
+            raise FileNotFoundError(f"Archive {current} required by {archive_path} is missing.")
+        chain.append(current)
+        base = read_archive_header(current).get("base")
+        if not base:
+            break
+        current = current.with_name(base)
+    chain.reverse()
+    return chain
+
+
+def iter_archive_chain(archive_path: Path) -> Iterator[dict]:
+    """Yields the records of every archive in the chain, oldest first."""
+    for path in resolve_archive_chain(archive_path):
+        yield from iter_archive_file(path)
+
+
+def find_dependent_archives(archive_path: Path) -> list[Path]:
+    """Returns the archives in the same folder that use `archive_path` as their base."""
+    archive_path = Path(archive_path)
+    dependents = []
+    for candidate in archive_path.parent.glob(f"*{ARCHIVE_SUFFIX}"):
+        if candidate == archive_path:
+            continue
+        try:
+            if read_archive_header(candidate).get("base") == archive_path.name:
+                dependents.append(candidate)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not read archive header of {candidate}: {e}")
+    return dependents
+
+
+def delete_archive_files(archive_path: Path, still_referenced: Iterable[Path] = ()) -> list[Path]:
+    """
+    Deletes an archive and its index, unless a later delta archive still
+    depends on it. Base archives left without dependents that are not in
+    `still_referenced` (no history record points at them) are deleted too.
+
+    Returns:
+        The archive files that were removed.
+    """
+    still_referenced = {Path(path) for path in still_referenced}
+    removed = []
+    current = Path(archive_path)
+    while current and current.exists():
+        dependents = find_dependent_archives(current)
+        if dependents:
+            logging.info(f"Keeping archive {current.name}: it is the base of {len(dependents)} later archive(s).")
+            break
+        try:
+            base = read_archive_header(current).get("base")
+        except (OSError, ValueError):
+            base = None
+        for path in (current, _index_path(current)):
+            if path.exists():
+                path.unlink()
+                logging.info(f"Deleted archive file: {path}")
+        removed.append(current)
+
+        current = current.with_name(base) if base else None
+        if current in still_referenced:
+            break
+    return removed
+
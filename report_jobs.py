@@ -0,0 +1,129 @@
+# report_jobs.py
+
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Callable, Optional
+
+REPORT_JOB_WORKERS = 2
+REPORT_CACHE_MAX_ENTRIES = 32
+
+
+@dataclass(frozen=True)
+class ReportJobKey:
+    """Identifies a report output: the same key always produces the same file."""
+    project_id: str
+    report_type: str
+    data_version: int
+    options: tuple = field(default=())
+
+    @classmethod
+    def create(cls, project_id: str, report_type: str, data_version: int, options: dict) -> "ReportJobKey":
+        frozen_options = tuple(sorted(
+            (name, tuple(value) if isinstance(value, list) else value) for name, value in options.items()
+        ))
+        return cls(project_id, report_type, data_version, frozen_options)
+
+
+class ReportJobQueue:
+    """
+    Runs report generation jobs in the background.
+
+    Identical requests (same project, report type, options and data version)
+    that are still pending share one job. Finished BytesIO outputs are kept in
+    a small LRU cache, so asking again for a report whose data has not changed
+    returns at once. Anything else a generator returns (error or info strings)
+    is delivered but not cached.
+    """
+
+    def __init__(self, max_workers: int = REPORT_JOB_WORKERS, max_cached: int = REPORT_CACHE_MAX_ENTRIES):
+        self.max_cached = max_cached
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-job")
+        self._lock = threading.Lock()
+        self._pending: dict[ReportJobKey, Future] = {}
+        self._cache: OrderedDict[ReportJobKey, bytes] = OrderedDict()
+
+    def get_cached(self, key: ReportJobKey) -> Optional[BytesIO]:
+        """Returns a fresh copy of the cached output for the key, or None."""
+        with self._lock:
+            data = self._cache.get(key)
+            if data is None:
+                return None
+            self._cache.move_to_end(key)
+        return BytesIO(data)
+
+    def submit(self, key: ReportJobKey, generation_function: Callable, **kwargs) -> Future:
+        """
+        Returns a future for the report identified by `key`, generated by
+        calling generation_function(**kwargs) unless it is cached or already
+        pending.
+        """
+        with self._lock:
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+                logging.info(f"Report '{key.report_type}' served from cache (data version {key.data_version}).")
+                future = Future()
+                future.set_result(BytesIO(data))
+                return future
+            pending = self._pending.get(key)
+            if pending is not None:
+                logging.info(f"Report '{key.report_type}' is already being generated; joining the pending job.")
+                return pending
+            future = self._executor.submit(self._run, key, generation_function, kwargs)
+            self._pending[key] = future
+        future.add_done_callback(lambda done, k=key: self._discard_pending(k, done))
+        return future
+
+    def _run(self, key: ReportJobKey, generation_function: Callable, kwargs: dict):
+        result = generation_function(**kwargs)
+        if isinstance(result, BytesIO):
+            data = result.getvalue()
+            with self._lock:
+                self._cache[key] = data
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_cached:
+                    self._cache.popitem(last=False)
+            return BytesIO(data)
+        return result
+
+    def _discard_pending(self, key: ReportJobKey, future: Future):
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def cancel_pending(self, project_id: Optional[str] = None) -> int:
+        """
+        Cancels queued jobs (of one project, or all) that have not started yet.
+        Jobs already running finish, and their output is still cached.
+        Returns the number of jobs cancelled.
+        """
+        with self._lock:
+            futures = [future for key, future in self._pending.items()
+                       if project_id is None or key.project_id == project_id]
+        cancelled = sum(1 for future in futures if future.cancel())
+        if cancelled:
+            logging.info(f"Cancelled {cancelled} queued report job(s).")
+        return cancelled
+
+    def clear(self, project_id: Optional[str] = None):
+        """Cancels queued jobs and drops cached outputs, for one project or all."""
+        self.cancel_pending(project_id)
+        with self._lock:
+            for key in [key for key in self._cache if project_id is None or key.project_id == project_id]:
+                del self._cache[key]
+
+
+def wait_for_report(future: Future):
+    """
+    Blocks until a report job finishes. Callers that joined the same job each
+    get their own copy of the output; a cancellation becomes an info message.
+    """
+    try:
+        result = future.result()
+    except CancelledError:
+        return "Info: Report generation was cancelled."
+    return BytesIO(result.getvalue()) if isinstance(result, BytesIO) else result
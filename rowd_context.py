@@ -0,0 +1,221 @@
+# rowd_context.py
+
+import json
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+from pathlib import PurePosixPath
+from typing import Iterable, Optional
+
+# Columns sent to the LLM for each selected artifact. Full code summaries,
+# hashes and timestamps are deliberately left out.
+DEFAULT_CONTEXT_COLUMNS = (
+    "artifact_id", "file_path", "artifact_name", "artifact_type", "status", "micro_spec_id", "dependencies"
+)
+DEFAULT_MAX_ARTIFACTS = 60
+DEFAULT_SUMMARY_CHARS = 240
+
+# Relative weights of the ranking signals.
+LEXICAL_WEIGHT = 1.0
+ANCHOR_WEIGHT = 100.0
+DEPENDENCY_WEIGHT = 4.0
+PATH_PROXIMITY_WEIGHT = 2.0
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9]+")
+_CAMEL_SPLIT = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_STOPWORDS = frozenset(
+    "the and for with that this from into are was were will shall should must can may has have had not but "
+    "all any each its use used using when then than which who what where how why new add update file files "
+    "code class function method return returns value values data based also only more most other such".split()
+)
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    """Splits text (including snake_case, camelCase and paths) into lower-case terms."""
+    if not text:
+        return []
+    terms = []
+    for raw in _TOKEN_PATTERN.findall(text):
+        for part in _CAMEL_SPLIT.split(raw):
+            part = part.lower()
+            if len(part) > 2 and part not in _STOPWORDS:
+                terms.append(part)
+    return terms
+
+
+def _row_to_dict(row) -> dict:
+    return row if isinstance(row, dict) else dict(row)
+
+
+def _artifact_text(artifact: dict) -> str:
+    return " ".join(str(artifact.get(column) or "") for column in
+                    ("file_path", "artifact_name", "signature", "short_description", "code_summary"))
+
+
+def _parse_dependencies(value) -> list[str]:
+    """Dependencies are stored as a JSON list or a comma-separated string."""
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    try:
+        parsed = json.loads(value)
+        if isinstance(parsed, list):
+            return [str(v) for v in parsed]
+    except (TypeError, ValueError):
+        pass
+    return [part.strip() for part in str(value).split(",") if part.strip()]
+
+
+def build_dependency_graph(artifacts: list[dict]) -> dict[str, set[str]]:
+    """
+    Builds an undirected artifact_id graph from the `dependencies` column and
+    from file names that one artifact's summary mentions for another.
+    """
+    by_reference: dict[str, str] = {}
+    for artifact in artifacts:
+        artifact_id = artifact.get("artifact_id")
+        file_path = artifact.get("file_path")
+        for reference in (artifact_id, artifact.get("artifact_name"), file_path,
+                          PurePosixPath(file_path).name if file_path else None):
+            if reference:
+                by_reference.setdefault(str(reference).lower(), artifact_id)
+
+    file_name_pattern = None
+    file_names = sorted({PurePosixPath(a["file_path"]).name for a in artifacts if a.get("file_path")}, key=len, reverse=True)
+    if file_names:
+        file_name_pattern = re.compile(r"(?<![\w.])(" + "|".join(re.escape(name) for name in file_names) + r")(?![\w])", re.IGNORECASE)
+
+    graph: dict[str, set[str]] = defaultdict(set)
+    for artifact in artifacts:
+        artifact_id = artifact.get("artifact_id")
+        references = [d.lower() for d in _parse_dependencies(artifact.get("dependencies"))]
+        if file_name_pattern:
+            text = f"{artifact.get('code_summary') or ''} {artifact.get('signature') or ''}"
+            references.extend(match.lower() for match in file_name_pattern.findall(text))
+        for reference in references:
+            target = by_reference.get(reference)
+            if target and target != artifact_id:
+                graph[artifact_id].add(target)
+                graph[target].add(artifact_id)
+    return graph
+
+
+def _path_proximity(path_a: Optional[str], path_b: Optional[str]) -> float:
+    """Returns 0..1: the share of leading directories two file paths have in common."""
+    if not path_a or not path_b:
+        return 0.0
+    dirs_a = PurePosixPath(path_a.replace("\\", "/")).parts[:-1]
+    dirs_b = PurePosixPath(path_b.replace("\\", "/")).parts[:-1]
+    if not dirs_a and not dirs_b:
+        return 0.5
+    shared = 0
+    for part_a, part_b in zip(dirs_a, dirs_b):
+        if part_a != part_b:
+            break
+        shared += 1
+    return shared / max(len(dirs_a), len(dirs_b))
+
+
+def lexical_scores(artifacts: list[dict], query: str) -> dict[str, float]:
+    """Scores each artifact against the query with an in-memory BM25."""
+    query_terms = set(tokenize(query))
+    if not query_terms or not artifacts:
+        return {}
+
+    k1, b = 1.2, 0.75
+    documents = {a["artifact_id"]: Counter(tokenize(_artifact_text(a))) for a in artifacts}
+    doc_lengths = {artifact_id: sum(terms.values()) for artifact_id, terms in documents.items()}
+    average_length = (sum(doc_lengths.values()) / len(doc_lengths)) or 1.0
+    document_frequency = Counter(term for terms in documents.values() for term in query_terms & terms.keys())
+
+    total_docs = len(documents)
+    scores = {}
+    for artifact_id, terms in documents.items():
+        score = 0.0
+        for term in query_terms:
+            frequency = terms.get(term)
+            if not frequency:
+                continue
+            idf = math.log(1 + (total_docs - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+            norm = frequency + k1 * (1 - b + b * doc_lengths[artifact_id] / average_length)
+            score += idf * frequency * (k1 + 1) / norm
+        if score:
+            scores[artifact_id] = score
+    return scores
+
+
+def rank_artifacts(artifacts: list[dict], task_text: str, anchor_ids: Iterable[str] = (),
+                   anchor_paths: Iterable[str] = (), lexical_override: Optional[dict[str, float]] = None) -> list[tuple[dict, float]]:
+    """
+    Ranks artifacts by relevance to a task. Anchors (artifacts the task names
+    directly) come first, followed by artifacts that are lexically similar to
+    the task, connected to an anchor or strong lexical hit in the dependency
+    graph, or located near an anchor in the directory tree.
+    """
+    anchor_ids = {a for a in anchor_ids if a}
+    anchor_paths = {p.replace("\\", "/").lower() for p in anchor_paths if p}
+    for artifact in artifacts:
+        if (artifact.get("file_path") or "").replace("\\", "/").lower() in anchor_paths:
+            anchor_ids.add(artifact["artifact_id"])
+    anchor_file_paths = [a.get("file_path") for a in artifacts if a["artifact_id"] in anchor_ids]
+
+    lexical = lexical_override if lexical_override is not None else lexical_scores(artifacts, task_text)
+    max_lexical = max(lexical.values(), default=0.0) or 1.0
+    graph = build_dependency_graph(artifacts)
+
+    # Seeds for graph expansion: anchors plus the strongest lexical hits.
+    seeds = set(anchor_ids) | {artifact_id for artifact_id, score in lexical.items() if score >= 0.5 * max_lexical}
+
+    ranked = []
+    for artifact in artifacts:
+        artifact_id = artifact["artifact_id"]
+        score = LEXICAL_WEIGHT * lexical.get(artifact_id, 0.0) / max_lexical * 10
+        if artifact_id in anchor_ids:
+            score += ANCHOR_WEIGHT
+        score += DEPENDENCY_WEIGHT * len(graph.get(artifact_id, set()) & seeds)
+        if anchor_file_paths:
+            score += PATH_PROXIMITY_WEIGHT * max(_path_proximity(artifact.get("file_path"), path) for path in anchor_file_paths)
+        ranked.append((artifact, score))
+
+    ranked.sort(key=lambda item: item[1], reverse=True)
+    return ranked
+
+
+def project_artifact(artifact: dict, columns: Iterable[str] = DEFAULT_CONTEXT_COLUMNS,
+                     summary_chars: int = DEFAULT_SUMMARY_CHARS) -> dict:
+    """Returns a compact view of an artifact with only the requested columns."""
+    projected = {column: artifact.get(column) for column in columns if artifact.get(column) not in (None, "")}
+    if summary_chars:
+        summary = artifact.get("short_description") or artifact.get("code_summary") or ""
+        summary = " ".join(summary.split())
+        if summary:
+            projected["summary"] = summary if len(summary) <= summary_chars else summary[:summary_chars].rstrip() + "..."
+    return projected
+
+
+def select_rowd_context(artifact_rows, task_text: str, anchor_ids: Iterable[str] = (), anchor_paths: Iterable[str] = (),
+                        max_artifacts: int = DEFAULT_MAX_ARTIFACTS, columns: Iterable[str] = DEFAULT_CONTEXT_COLUMNS,
+                        summary_chars: int = DEFAULT_SUMMARY_CHARS, lexical_override: Optional[dict[str, float]] = None) -> list[dict]:
+    """
+    Selects the RoWD artifacts most relevant to a task and returns them as
+    compact dictionaries, most relevant first. At most `max_artifacts` are
+    returned, regardless of project size.
+    """
+    artifacts = [_row_to_dict(row) for row in artifact_rows]
+    artifacts = [a for a in artifacts if a.get("artifact_id")]
+    if not artifacts:
+        return []
+
+    ranked = rank_artifacts(artifacts, task_text, anchor_ids, anchor_paths, lexical_override)
+    selected = [artifact for artifact, _ in ranked[:max_artifacts]]
+
+    if len(artifacts) > max_artifacts:
+        logging.info(f"RoWD context selector kept {len(selected)} of {len(artifacts)} artifacts for the prompt.")
+    return [project_artifact(artifact, columns, summary_chars) for artifact in selected]
+
+
+def build_rowd_context_json(artifact_rows, task_text: str, indent: Optional[int] = None, **kwargs) -> str:
+    """Convenience wrapper returning select_rowd_context() as a JSON string for prompts."""
+    return json.dumps(select_rowd_context(artifact_rows, task_text, **kwargs), indent=indent)
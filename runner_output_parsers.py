@@ -0,0 +1,335 @@
+# runner_output_parsers.py
+
+import logging
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+MAX_FAILURE_EXCERPTS = 20
+MAX_EXCERPT_LENGTH = 600
+
+
+@dataclass
+class ParsedTestRun:
+    """
+    A framework-agnostic summary of a single test runner invocation, extracted
+    locally from the runner's output without an LLM round trip.
+    """
+    framework: str
+    passed: int = 0
+    failed: int = 0
+    errors: int = 0
+    skipped: int = 0
+    failures: list[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return self.passed + self.failed + self.errors + self.skipped
+
+    @property
+    def success(self) -> bool:
+        return self.failed == 0 and self.errors == 0 and (self.passed + self.skipped) > 0
+
+    def to_result_dict(self) -> dict:
+        """Returns the {'success', 'summary'} contract used by AutomatedTestResultParserAgent."""
+        counts = f"{self.passed} passed, {self.failed} failed, {self.errors} errors, {self.skipped} skipped"
+        if self.success:
+            summary = f"All tests passed successfully ({counts}; parsed from {self.framework} output)."
+        elif self.total == 0:
+            summary = f"No tests were executed (parsed from {self.framework} output)."
+        else:
+            summary = f"Test run failed: {counts} (parsed from {self.framework} output)."
+            if self.failures:
+                summary += "\n\nFailing tests:\n" + "\n".join(f"- {excerpt}" for excerpt in self.failures)
+        return {"success": self.success, "summary": summary, "framework": self.framework}
+
+
+def _excerpt(text: str) -> str:
+    text = text.strip()
+    if len(text) > MAX_EXCERPT_LENGTH:
+        text = text[:MAX_EXCERPT_LENGTH] + " ..."
+    return text
+
+
+def _add_failure(run: ParsedTestRun, text: str):
+    if len(run.failures) < MAX_FAILURE_EXCERPTS and text.strip():
+        run.failures.append(_excerpt(text))
+
+
+# --- Parser registry ---
+# Each parser receives the raw runner output and returns a ParsedTestRun if it
+# recognizes the format, or None otherwise. Parsers are tried in registration
+# order, so the more specific formats come first.
+_PARSERS: list[tuple[str, Callable[[str], Optional[ParsedTestRun]]]] = []
+
+
+def register_parser(name: str):
+    """Decorator that adds a parser function to the registry."""
+    def decorator(func):
+        _PARSERS.append((name, func))
+        return func
+    return decorator
+
+
+def get_registered_parsers() -> list[str]:
+    return [name for name, _ in _PARSERS]
+
+
+def parse_test_output(test_output: str) -> Optional[ParsedTestRun]:
+    """
+    Runs the registered parsers over the output and returns the first match,
+    or None if no parser recognizes the format.
+    """
+    if not test_output or not test_output.strip():
+        return None
+
+    for name, parser in _PARSERS:
+        try:
+            result = parser(test_output)
+        except Exception as e:
+            logging.warning(f"Test output parser '{name}' raised an error and was skipped: {e}")
+            continue
+        if result is not None:
+            return result
+    return None
+
+
+# --- JUnit XML ---
+
+_JUNIT_START = re.compile(r"<(\?xml|testsuites|testsuite)\b")
+
+
+@register_parser("junit-xml")
+def parse_junit_xml(test_output: str) -> Optional[ParsedTestRun]:
+    match = _JUNIT_START.search(test_output)
+    if not match or "<testsuite" not in test_output:
+        return None
+
+    document = test_output[match.start():]
+    for closing_tag in ("</testsuites>", "</testsuite>"):
+        end = document.rfind(closing_tag)
+        if end != -1:
+            document = document[:end + len(closing_tag)]
+            break
+
+    try:
+        root = ET.fromstring(document)
+    except ET.ParseError:
+        return None
+
+    suites = [root] if root.tag == "testsuite" else root.findall(".//testsuite")
+    if not suites:
+        return None
+
+    run = ParsedTestRun(framework="junit-xml")
+    for case in root.iter("testcase"):
+        name = ".".join(part for part in (case.get("classname"), case.get("name")) if part)
+        failure = case.find("failure")
+        error = case.find("error")
+        if failure is not None:
+            run.failed += 1
+            _add_failure(run, f"{name}: {failure.get('message') or (failure.text or '').strip()}")
+        elif error is not None:
+            run.errors += 1
+            _add_failure(run, f"{name}: {error.get('message') or (error.text or '').strip()}")
+        elif case.find("skipped") is not None:
+            run.skipped += 1
+        else:
+            run.passed += 1
+
+    if run.total == 0:
+        # Suites without <testcase> children still carry the aggregate counts.
+        for suite in suites:
+            tests = int(suite.get("tests", 0))
+            failures = int(suite.get("failures", 0))
+            errors = int(suite.get("errors", 0))
+            skipped = int(suite.get("skipped", suite.get("disabled", 0)))
+            run.failed += failures
+            run.errors += errors
+            run.skipped += skipped
+            run.passed += max(0, tests - failures - errors - skipped)
+    return run
+
+
+# --- pytest ---
+
+# The final counts line; `pytest -q` prints it without the ===== borders.
+_PYTEST_SUMMARY = re.compile(
+    r"^(?:=+ )?(?P<body>(?:\d+ (?:passed|failed|errors?|skipped|xfailed|xpassed|warnings?|deselected|rerun)(?:, )?)+) in [\d.]+s(?: \([^)]*\))?(?: =+)?[ \t\r]*$",
+    re.MULTILINE
+)
+_PYTEST_NO_TESTS = re.compile(r"^(?:=+ )?no tests ran in [\d.]+s(?: =+)?[ \t\r]*$", re.MULTILINE)
+_PYTEST_COUNT = re.compile(r"(\d+) (passed|failed|errors?|skipped|xfailed|xpassed)")
+_PYTEST_FAILED_LINE = re.compile(r"^(?:FAILED|ERROR) (\S+.*)$", re.MULTILINE)
+
+
+@register_parser("pytest")
+def parse_pytest(test_output: str) -> Optional[ParsedTestRun]:
+    summaries = list(_PYTEST_SUMMARY.finditer(test_output))
+    if not summaries:
+        if _PYTEST_NO_TESTS.search(test_output):
+            return ParsedTestRun(framework="pytest")
+        return None
+
+    run = ParsedTestRun(framework="pytest")
+    for count, kind in _PYTEST_COUNT.findall(summaries[-1].group("body")):
+        count = int(count)
+        if kind in ("passed", "xfailed", "xpassed"):
+            run.passed += count
+        elif kind == "failed":
+            run.failed += count
+        elif kind.startswith("error"):
+            run.errors += count
+        elif kind == "skipped":
+            run.skipped += count
+
+    for failure in _PYTEST_FAILED_LINE.findall(test_output):
+        _add_failure(run, failure)
+    return run
+
+
+# --- Jest ---
+
+_JEST_TESTS_LINE = re.compile(r"^Tests:\s+(?P<body>.*\d+ total)\s*$", re.MULTILINE)
+_JEST_COUNT = re.compile(r"(\d+) (passed|failed|skipped|todo|total)")
+_JEST_FAILURE_HEADER = re.compile(r"^\s*●\s+(?!Console)(.+)$", re.MULTILINE)
+
+
+@register_parser("jest")
+def parse_jest(test_output: str) -> Optional[ParsedTestRun]:
+    summary = _JEST_TESTS_LINE.search(test_output)
+    if not summary:
+        return None
+
+    run = ParsedTestRun(framework="jest")
+    for count, kind in _JEST_COUNT.findall(summary.group("body")):
+        count = int(count)
+        if kind == "passed":
+            run.passed += count
+        elif kind == "failed":
+            run.failed += count
+        elif kind in ("skipped", "todo"):
+            run.skipped += count
+
+    lines = test_output.splitlines()
+    for index, line in enumerate(lines):
+        header = _JEST_FAILURE_HEADER.match(line)
+        if not header:
+            continue
+        detail = next((candidate.strip() for candidate in lines[index + 1:index + 6] if candidate.strip()), "")
+        _add_failure(run, f"{header.group(1).strip()}: {detail}" if detail else header.group(1))
+    return run
+
+
+# --- go test ---
+
+_GO_RESULT = re.compile(r"^\s*--- (PASS|FAIL|SKIP): (\S+)", re.MULTILINE)
+_GO_PACKAGE = re.compile(r"^(ok|FAIL|\?)\s+\S+\s+(?:[\d.]+s|\[[^\]]+\])", re.MULTILINE)
+
+
+@register_parser("go-test")
+def parse_go_test(test_output: str) -> Optional[ParsedTestRun]:
+    results = _GO_RESULT.findall(test_output)
+    packages = _GO_PACKAGE.findall(test_output)
+    if not results and not packages:
+        return None
+
+    run = ParsedTestRun(framework="go-test")
+    if results:
+        for status, name in results:
+            if status == "PASS":
+                run.passed += 1
+            elif status == "SKIP":
+                run.skipped += 1
+            else:
+                run.failed += 1
+                _add_failure(run, name)
+    else:
+        # Non-verbose output only reports per-package results.
+        for status in packages:
+            if status == "ok":
+                run.passed += 1
+            elif status == "FAIL":
+                run.failed += 1
+
+    for line in test_output.splitlines():
+        if line.startswith("panic:") or line.startswith("FAIL\t"):
+            _add_failure(run, line)
+    return run
+
+
+# --- dotnet test ---
+
+_DOTNET_SUMMARY = re.compile(
+    r"(?:Passed|Failed)!\s+-\s+Failed:\s+(\d+),\s+Passed:\s+(\d+),\s+Skipped:\s+(\d+),\s+Total:\s+(\d+)"
+)
+_DOTNET_LEGACY_TOTAL = re.compile(r"^Total tests:\s*(\d+)", re.MULTILINE)
+_DOTNET_LEGACY_COUNT = re.compile(r"^\s+(Passed|Failed|Skipped):\s*(\d+)\s*$", re.MULTILINE)
+_DOTNET_FAILED_TEST = re.compile(r"^\s+Failed (\S+) \[[^\]]*\]\s*$", re.MULTILINE)
+_DOTNET_ERROR_MESSAGE = re.compile(r"^\s+Error Message:\s*\n\s*(.+)$", re.MULTILINE)
+
+
+@register_parser("dotnet-test")
+def parse_dotnet_test(test_output: str) -> Optional[ParsedTestRun]:
+    summaries = _DOTNET_SUMMARY.findall(test_output)
+    run = ParsedTestRun(framework="dotnet-test")
+
+    if summaries:
+        # One summary line is printed per test assembly.
+        for failed, passed, skipped, _total in summaries:
+            run.failed += int(failed)
+            run.passed += int(passed)
+            run.skipped += int(skipped)
+    elif _DOTNET_LEGACY_TOTAL.search(test_output):
+        for kind, count in _DOTNET_LEGACY_COUNT.findall(test_output):
+            setattr(run, kind.lower(), int(count))
+    else:
+        return None
+
+    names = _DOTNET_FAILED_TEST.findall(test_output)
+    messages = _DOTNET_ERROR_MESSAGE.findall(test_output)
+    for index, name in enumerate(names):
+        message = messages[index] if index < len(messages) else ""
+        _add_failure(run, f"{name}: {message}" if message else name)
+    return run
+
+
+# --- unittest ---
+
+_UNITTEST_RAN = re.compile(r"^Ran (\d+) tests? in [\d.]+s\s*$", re.MULTILINE)
+_UNITTEST_STATUS = re.compile(r"^(OK|FAILED)(?: \((?P<body>[^)]*)\))?\s*$", re.MULTILINE)
+_UNITTEST_COUNT = re.compile(r"(failures|errors|skipped|expected failures|unexpected successes)=(\d+)")
+_UNITTEST_FAILURE_HEADER = re.compile(r"^(FAIL|ERROR): (.+)$")
+
+
+@register_parser("unittest")
+def parse_unittest(test_output: str) -> Optional[ParsedTestRun]:
+    ran = _UNITTEST_RAN.findall(test_output)
+    statuses = list(_UNITTEST_STATUS.finditer(test_output))
+    if not ran or not statuses:
+        return None
+
+    total = int(ran[-1])
+    counts = {kind: int(count) for kind, count in _UNITTEST_COUNT.findall(statuses[-1].group("body") or "")}
+
+    run = ParsedTestRun(framework="unittest")
+    run.failed = counts.get("failures", 0) + counts.get("unexpected successes", 0)
+    run.errors = counts.get("errors", 0)
+    run.skipped = counts.get("skipped", 0)
+    run.passed = max(0, total - run.failed - run.errors - run.skipped)
+
+    lines = test_output.splitlines()
+    for index, line in enumerate(lines):
+        header = _UNITTEST_FAILURE_HEADER.match(line)
+        if not header:
+            continue
+        # The last non-empty line before the next separator is usually the assertion message.
+        message = ""
+        for candidate in lines[index + 2:]:
+            if candidate.startswith("=" * 10) or candidate.startswith("-" * 10):
+                break
+            if candidate.strip():
+                message = candidate.strip()
+        _add_failure(run, f"{header.group(2)}: {message}" if message else header.group(2))
+    return run
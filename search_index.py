@@ -0,0 +1,293 @@
+# search_index.py
+
+import hashlib
+import logging
+import math
+import re
+from collections import Counter
+from pathlib import PurePosixPath
+from typing import Optional
+
+from rowd_context import tokenize
+
+DOC_TYPE_ARTIFACT = "ARTIFACT"
+DOC_TYPE_SPEC_SECTION = "SPEC_SECTION"
+
+# Project columns whose markdown sections are indexed.
+SPEC_FIELDS = ("final_spec_text", "tech_spec_text", "ux_spec_text", "db_schema_spec_text")
+
+# Terms from paths, names and signatures are weighted above summary terms.
+IDENTIFIER_FIELD_WEIGHT = 3
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Specs longer than this are cut down to their sections most relevant to the task
+# before they go into a prompt (see ProjectSearchIndex.select_spec_context).
+SPEC_CONTEXT_MAX_CHARS = 60000
+
+# Part of every spec section hash; bump it when split_spec_sections changes so
+# specs indexed with the old sections are re-indexed.
+SPEC_SECTION_SPLIT_VERSION = 2
+
+_SYMBOL_PATTERN = re.compile(r"`([A-Za-z_][\w.]*)`|\b(?:def|class|function|interface|struct|fn|func)\s+([A-Za-z_]\w*)")
+_HEADING_PATTERN = re.compile(r"^(#{1,4})\s+(.+?)\s*#*\s*$", re.MULTILINE)
+_FENCE_PATTERN = re.compile(r" {0,3}(`{3,}|~{3,})")
+
+
+def _artifact_doc_key(project_id: str, artifact_id: str) -> str:
+    return f"{project_id}:artifact:{artifact_id}"
+
+
+def _spec_doc_key(project_id: str, spec_field: str, section_index: int) -> str:
+    return f"{project_id}:spec:{spec_field}:{section_index}"
+
+
+def _content_hash(*parts) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part or "").encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def extract_symbol_names(text: Optional[str]) -> list[str]:
+    """Pulls identifiers (backticked names, def/class/func declarations) out of a summary or signature."""
+    if not text:
+        return []
+    return [name for match in _SYMBOL_PATTERN.finditer(text) for name in match.groups() if name]
+
+
+def artifact_term_frequencies(artifact: dict) -> Counter:
+    """Builds the weighted term bag for a single artifact."""
+    identifier_text = " ".join(str(artifact.get(column) or "") for column in ("file_path", "artifact_name", "signature"))
+    identifier_text += " " + " ".join(extract_symbol_names(artifact.get("code_summary")))
+    if artifact.get("file_path"):
+        identifier_text += " " + PurePosixPath(artifact["file_path"].replace("\\", "/")).stem
+
+    terms = Counter()
+    for term in tokenize(identifier_text):
+        terms[term] += IDENTIFIER_FIELD_WEIGHT
+    terms.update(tokenize(artifact.get("short_description")))
+    terms.update(tokenize(artifact.get("code_summary")))
+    return terms
+
+
+def _find_headings(spec_text: str) -> list[re.Match]:
+    """Heading matches in a markdown spec, skipping `#` lines inside fenced code blocks."""
+    headings = []
+    fence = None
+    position = 0
+    for line in spec_text.splitlines(keepends=True):
+        marker = _FENCE_PATTERN.match(line)
+        if fence is None:
+            if marker:
+                fence = marker.group(1)
+            else:
+                heading = _HEADING_PATTERN.match(spec_text, position, position + len(line.rstrip("\r\n")))
+                if heading:
+                    headings.append(heading)
+        elif marker and marker.group(1)[0] == fence[0] and len(marker.group(1)) >= len(fence) \
+                and not line.strip().strip(fence[0]):
+            fence = None
+        position += len(line)
+    return headings
+
+
+def split_spec_sections(spec_text: Optional[str]) -> list[tuple[str, str]]:
+    """Splits a markdown spec into (heading, body) sections."""
+    if not spec_text:
+        return []
+    headings = _find_headings(spec_text)
+    if not headings:
+        return [("Document", spec_text)]
+
+    sections = []
+    preamble = spec_text[:headings[0].start()].strip()
+    if preamble:
+        sections.append(("Preamble", preamble))
+    for index, heading in enumerate(headings):
+        end = headings[index + 1].start() if index + 1 < len(headings) else len(spec_text)
+        sections.append((heading.group(2), spec_text[heading.end():end]))
+    return sections
+
+
+def spec_section_texts(spec_text: Optional[str]) -> list[str]:
+    """The full markdown of each section (heading line included), indexed like split_spec_sections."""
+    if not spec_text:
+        return []
+    headings = _find_headings(spec_text)
+    if not headings:
+        return [spec_text]
+
+    sections = []
+    if spec_text[:headings[0].start()].strip():
+        sections.append(spec_text[:headings[0].start()])
+    for index, heading in enumerate(headings):
+        end = headings[index + 1].start() if index + 1 < len(headings) else len(spec_text)
+        sections.append(spec_text[heading.start():end])
+    return sections
+
+
+class ProjectSearchIndex:
+    """
+    An on-disk BM25 inverted index over a project's RoWD artifacts and spec
+    sections, stored in the Klyve database. Artifacts are indexed incrementally
+    as they are written; spec sections are refreshed whenever the spec text
+    hash changes.
+    """
+
+    def __init__(self, db_manager):
+        if not db_manager:
+            raise ValueError("Database manager cannot be None.")
+        self.db_manager = db_manager
+
+    def index_artifact(self, artifact: dict):
+        """Adds or replaces one artifact in the index."""
+        project_id = artifact.get("project_id")
+        artifact_id = artifact.get("artifact_id")
+        if not project_id or not artifact_id:
+            return
+        content_hash = _content_hash(*(artifact.get(column) for column in
+                                       ("file_path", "artifact_name", "signature", "short_description", "code_summary")))
+        self.db_manager.replace_search_document(
+            _artifact_doc_key(project_id, artifact_id), project_id, DOC_TYPE_ARTIFACT, artifact_id,
+            artifact.get("file_path") or artifact.get("artifact_name"), artifact_term_frequencies(artifact), content_hash
+        )
+
+    def sync_artifacts(self, project_id: str) -> int:
+        """
+        Brings the artifact part of the index in line with the RoWD, re-indexing
+        only artifacts whose content hash has changed and dropping deleted ones.
+        Returns the number of documents written or removed.
+        """
+        indexed_hashes = self.db_manager.get_search_document_hashes(project_id, DOC_TYPE_ARTIFACT)
+        seen_keys = set()
+        changes = 0
+        for row in self.db_manager.get_all_artifacts_for_project(project_id):
+            artifact = dict(row)
+            doc_key = _artifact_doc_key(project_id, artifact["artifact_id"])
+            seen_keys.add(doc_key)
+            content_hash = _content_hash(*(artifact.get(column) for column in
+                                           ("file_path", "artifact_name", "signature", "short_description", "code_summary")))
+            if indexed_hashes.get(doc_key) != content_hash:
+                self.index_artifact(artifact)
+                changes += 1
+
+        stale_keys = [doc_key for doc_key in indexed_hashes if doc_key not in seen_keys]
+        self.db_manager.delete_search_documents(stale_keys)
+        changes += len(stale_keys)
+        if changes:
+            logging.info(f"Search index: synchronized {changes} artifact documents for project {project_id}.")
+        return changes
+
+    def sync_spec_sections(self, project_id: str) -> int:
+        """Re-indexes the sections of any project spec whose text has changed."""
+        project = self.db_manager.get_project_by_id(project_id)
+        if not project:
+            return 0
+
+        indexed_hashes = self.db_manager.get_search_document_hashes(project_id, DOC_TYPE_SPEC_SECTION)
+        changes = 0
+        for spec_field in SPEC_FIELDS:
+            spec_text = project[spec_field]
+            spec_hash = _content_hash(SPEC_SECTION_SPLIT_VERSION, spec_text)
+            prefix = f"{project_id}:spec:{spec_field}:"
+            existing_keys = [doc_key for doc_key in indexed_hashes if doc_key.startswith(prefix)]
+            # Every section of a spec carries the hash of the whole spec text.
+            if existing_keys and all(indexed_hashes[doc_key] == spec_hash for doc_key in existing_keys):
+                continue
+            if not existing_keys and not spec_text:
+                continue
+
+            self.db_manager.delete_search_documents(existing_keys)
+            for index, (heading, body) in enumerate(split_spec_sections(spec_text)):
+                terms = Counter()
+                for term in tokenize(heading):
+                    terms[term] += IDENTIFIER_FIELD_WEIGHT
+                terms.update(tokenize(body))
+                self.db_manager.replace_search_document(
+                    _spec_doc_key(project_id, spec_field, index), project_id, DOC_TYPE_SPEC_SECTION,
+                    f"{spec_field}#{index}", heading, terms, spec_hash
+                )
+            changes += 1
+        return changes
+
+    def search(self, project_id: str, query: str, doc_types: tuple[str, ...] = (DOC_TYPE_ARTIFACT,),
+               limit: int = 50) -> list[dict]:
+        """
+        Runs a BM25 query against the index.
+
+        Returns:
+            A list of {'ref_id', 'doc_type', 'title', 'score'} dicts, best first.
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+
+        doc_count, average_length = self.db_manager.get_search_corpus_stats(project_id, list(doc_types))
+        if not doc_count:
+            return []
+        average_length = average_length or 1.0
+
+        postings = self.db_manager.get_search_postings(project_id, terms, list(doc_types))
+        document_frequency = Counter(row['term'] for row in postings)
+
+        scores: dict[str, float] = {}
+        documents: dict[str, dict] = {}
+        for row in postings:
+            df = document_frequency[row['term']]
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            tf = row['term_frequency']
+            norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * row['term_count'] / average_length)
+            scores[row['doc_key']] = scores.get(row['doc_key'], 0.0) + idf * tf * (BM25_K1 + 1) / norm
+            documents[row['doc_key']] = {"ref_id": row['ref_id'], "doc_type": row['doc_type'], "title": row['title']}
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [dict(documents[doc_key], score=score) for doc_key, score in ranked]
+
+    def artifact_relevance_scores(self, project_id: str, query: str, limit: int = 200) -> dict[str, float]:
+        """
+        Returns {artifact_id: bm25_score} for the best-matching artifacts, after
+        bringing the index up to date. Suitable as a lexical_override for
+        rowd_context.select_rowd_context.
+        """
+        self.sync_artifacts(project_id)
+        return {hit["ref_id"]: hit["score"] for hit in self.search(project_id, query, (DOC_TYPE_ARTIFACT,), limit)}
+
+    def search_spec_sections(self, project_id: str, query: str, limit: int = 10) -> list[dict]:
+        """Returns the spec sections most relevant to the query, after refreshing them."""
+        self.sync_spec_sections(project_id)
+        return self.search(project_id, query, (DOC_TYPE_SPEC_SECTION,), limit)
+
+    def select_spec_context(self, project_id: str, spec_field: str, spec_text: Optional[str], query: str,
+                            max_chars: int = SPEC_CONTEXT_MAX_CHARS) -> Optional[str]:
+        """
+        Returns the spec text for a prompt. A spec within max_chars is returned
+        whole; a longer one is reduced to its sections that best match the
+        query (BM25 over the indexed sections), kept in document order.
+        `spec_text` must be the saved value of `spec_field`.
+        """
+        if not spec_text or len(spec_text) <= max_chars:
+            return spec_text
+        sections = spec_section_texts(spec_text)
+        prefix = f"{spec_field}#"
+        ranked = [int(hit["ref_id"][len(prefix):]) for hit in self.search_spec_sections(project_id, query, limit=1000)
+                  if hit["ref_id"].startswith(prefix)]
+        # Sections that match nothing fill any remaining room in document order.
+        ranked_set = set(ranked)
+        ranked += [index for index in range(len(sections)) if index not in ranked_set]
+
+        selected = set()
+        used_chars = 0
+        for index in ranked:
+            if index < len(sections) and used_chars + len(sections[index]) <= max_chars:
+                selected.add(index)
+                used_chars += len(sections[index])
+        omitted = len(sections) - len(selected)
+        logging.info(f"Search index: packed {len(selected)} of {len(sections)} sections of {spec_field} "
+                     f"({used_chars} of {len(spec_text)} characters) for the prompt.")
+        text = "".join(sections[index] for index in sorted(selected))
+        if omitted:
+            text += f"\n\n[{omitted} section(s) of this specification were omitted as least relevant to this task.]\n"
+        return text
@@ -0,0 +1,225 @@
+# stack_trace_parser.py
+
+import re
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Iterable, Optional
+
+# Path fragments that identify frames owned by the runtime or third-party
+# packages rather than by the project itself.
+THIRD_PARTY_MARKERS = (
+    "site-packages/", "dist-packages/", "node_modules/", "/lib/python", "<frozen", "node:internal",
+    "/usr/lib/", "/usr/local/go/", "/rustc/", ".cargo/registry/", "/.nuget/", "<anonymous>", "/Microsoft.NET/"
+)
+
+
+@dataclass
+class StackFrame:
+    """A single frame location extracted from a stack trace."""
+    language: str
+    raw_path: str
+    line: Optional[int] = None
+    function: Optional[str] = None
+
+
+def _to_int(value: Optional[str]) -> Optional[int]:
+    return int(value) if value and value.isdigit() else None
+
+
+# --- Language-specific extractors ---
+# Each extractor returns frames innermost-first (closest to the error first).
+
+_PYTHON_FRAME = re.compile(r'^\s*File "(?P<path>[^"]+)", line (?P<line>\d+)(?:, in (?P<func>\S+))?', re.MULTILINE)
+_PYTHON_SHORT = re.compile(r'^(?P<path>[\w./\\:-]+\.py):(?P<line>\d+):', re.MULTILINE)
+
+
+def extract_python_frames(log: str) -> list[StackFrame]:
+    frames = [StackFrame("python", m.group("path"), _to_int(m.group("line")), m.group("func"))
+              for m in _PYTHON_FRAME.finditer(log)]
+    # Python prints the innermost frame last.
+    frames.reverse()
+    # pytest's short tracebacks use "path.py:42: ErrorType".
+    frames.extend(StackFrame("python", m.group("path"), _to_int(m.group("line")))
+                  for m in _PYTHON_SHORT.finditer(log))
+    return frames
+
+
+_NODE_FRAME = re.compile(
+    r'^\s*at (?:(?P<func>[^\s(]+(?: \[as \w+\])?) \()?(?:file://)?(?P<path>[^\s():]*(?:[A-Za-z]:)?[^\s():]+\.(?:m?js|cjs|jsx|tsx?|vue)):(?P<line>\d+)(?::\d+)?\)?\s*$',
+    re.MULTILINE
+)
+
+
+def extract_node_frames(log: str) -> list[StackFrame]:
+    return [StackFrame("node", m.group("path"), _to_int(m.group("line")), m.group("func"))
+            for m in _NODE_FRAME.finditer(log)]
+
+
+_JAVA_FRAME = re.compile(r'^\s*at (?P<qualified>[\w$.]+)\.(?P<func>[\w$<>]+)\((?P<file>[\w$]+\.(?:java|kt|scala|groovy)):(?P<line>\d+)\)', re.MULTILINE)
+
+
+def extract_java_frames(log: str) -> list[StackFrame]:
+    frames = []
+    for m in _JAVA_FRAME.finditer(log):
+        # Java only prints the file name; the package gives us the directory.
+        package_parts = m.group("qualified").split(".")[:-1]
+        raw_path = "/".join(package_parts + [m.group("file")])
+        frames.append(StackFrame("java", raw_path, _to_int(m.group("line")), m.group("func")))
+    return frames
+
+
+_DOTNET_FRAME = re.compile(r'^\s*at (?P<func>[^\r\n]+?) in (?P<path>[^\r\n]+?\.(?:cs|fs|vb)):line (?P<line>\d+)', re.MULTILINE)
+
+
+def extract_dotnet_frames(log: str) -> list[StackFrame]:
+    return [StackFrame("dotnet", m.group("path"), _to_int(m.group("line")), m.group("func"))
+            for m in _DOTNET_FRAME.finditer(log)]
+
+
+_GO_FRAME = re.compile(r'^\s+(?P<path>\S+\.go):(?P<line>\d+)(?: \+0x[0-9a-f]+)?\s*$', re.MULTILINE)
+_GO_TEST_LOCATION = re.compile(r'^\s+(?P<path>[\w./-]+\.go):(?P<line>\d+): ', re.MULTILINE)
+
+
+def extract_go_frames(log: str) -> list[StackFrame]:
+    frames = [StackFrame("go", m.group("path"), _to_int(m.group("line"))) for m in _GO_FRAME.finditer(log)]
+    frames.extend(StackFrame("go", m.group("path"), _to_int(m.group("line"))) for m in _GO_TEST_LOCATION.finditer(log))
+    return frames
+
+
+_RUST_FRAME = re.compile(r'(?:^\s+at |panicked at |^\s*--> )(?P<path>[^\s:]+\.rs):(?P<line>\d+)(?::\d+)?', re.MULTILINE)
+
+
+def extract_rust_frames(log: str) -> list[StackFrame]:
+    return [StackFrame("rust", m.group("path"), _to_int(m.group("line"))) for m in _RUST_FRAME.finditer(log)]
+
+
+EXTRACTORS = (
+    extract_python_frames,
+    extract_node_frames,
+    extract_java_frames,
+    extract_dotnet_frames,
+    extract_go_frames,
+    extract_rust_frames,
+)
+
+
+def extract_frames(log: str) -> list[StackFrame]:
+    """Runs every language extractor over the log and returns all frames found."""
+    frames = []
+    for extractor in EXTRACTORS:
+        frames.extend(extractor(log))
+    return frames
+
+
+# --- Resolution and ranking ---
+
+def _normalize(path: str) -> str:
+    return path.strip().replace("\\", "/")
+
+
+def _is_third_party(path: str) -> bool:
+    # Older Node versions print core module frames as "internal/...".
+    return path.startswith("internal/") or any(marker in path for marker in THIRD_PARTY_MARKERS)
+
+
+def build_known_path_index(file_paths: Iterable[str]) -> dict[str, Optional[str]]:
+    """
+    Indexes RoWD file paths by every trailing sub-path (lower-cased), so a frame
+    path only needs to share its tail with an artifact to be resolved. Tails
+    shared by more than one artifact map to None and are ignored.
+    """
+    normalized_paths = [_normalize(file_path) for file_path in file_paths if file_path]
+    index: dict[str, Optional[str]] = {}
+    for normalized in normalized_paths:
+        parts = PurePosixPath(normalized).parts
+        for start in range(1, len(parts)):
+            suffix = "/".join(parts[start:]).lower()
+            index[suffix] = normalized if index.get(suffix, normalized) == normalized else None
+    # Full paths always win over a tail of some other artifact's path.
+    for normalized in normalized_paths:
+        index[normalized.lower()] = normalized
+    return index
+
+
+def resolve_frame_path(raw_path: str, project_root: Optional[Path], known_paths: dict[str, Optional[str]]) -> tuple[Optional[str], int]:
+    """
+    Resolves a raw frame path to a project-relative path.
+
+    Returns:
+        A tuple of (relative_path or None, ownership_score) where the score is
+        2 for a RoWD artifact, 1 for a file that exists in the project, and 0
+        for an unresolvable or third-party path.
+    """
+    path = _normalize(raw_path)
+    if not path or _is_third_party(path):
+        return None, 0
+
+    root_str = _normalize(str(project_root)).rstrip("/") if project_root else None
+
+    candidate = path
+    if root_str and candidate.lower().startswith(root_str.lower() + "/"):
+        candidate = candidate[len(root_str) + 1:]
+    if candidate.startswith("./"):
+        candidate = candidate[2:]
+
+    # Match the longest trailing part of the frame path against the RoWD index.
+    # This handles Java package paths, container paths (/app/src/x.py) and
+    # absolute paths recorded on another machine.
+    parts = PurePosixPath(candidate).parts
+    for start in range(len(parts)):
+        suffix = "/".join(parts[start:]).lower()
+        if known_paths.get(suffix):
+            return known_paths[suffix], 2
+
+    if project_root and not PurePosixPath(candidate).is_absolute() and ":" not in candidate:
+        if (project_root / candidate).is_file():
+            return candidate, 1
+        for start in range(1, len(parts)):
+            suffix = "/".join(parts[start:])
+            if (project_root / suffix).is_file():
+                return suffix, 1
+
+    if not project_root and not known_paths and not PurePosixPath(candidate).is_absolute():
+        # Nothing to check ownership against; keep the relative path as-is.
+        return candidate, 0
+
+    return None, 0
+
+
+def parse_stack_trace_locally(log: str, project_root: str | Path | None = None,
+                              known_file_paths: Optional[Iterable[str]] = None) -> Optional[list[str]]:
+    """
+    Extracts file paths from Python, Node, Java, .NET, Go and Rust stack traces
+    without an LLM.
+
+    Paths are resolved against the project root and the RoWD file paths, and
+    ranked so project-owned frames closest to the error come first.
+
+    Returns:
+        A list of unique project-relative paths, or None if no frames in a
+        recognized format were found or none of them resolved to a project
+        file (signalling the caller to fall back).
+    """
+    if not log:
+        return None
+
+    frames = extract_frames(log)
+    if not frames:
+        return None
+
+    root = Path(project_root) if project_root else None
+    known_paths = build_known_path_index(known_file_paths or [])
+
+    ranked: dict[str, tuple[int, int]] = {}
+    for position, frame in enumerate(frames):
+        resolved, ownership = resolve_frame_path(frame.raw_path, root, known_paths)
+        if not resolved:
+            continue
+        # Higher ownership first, then the earliest (innermost) position.
+        key = (-ownership, position)
+        if resolved not in ranked or key < ranked[resolved]:
+            ranked[resolved] = key
+
+    if not ranked:
+        return None
+    return sorted(ranked, key=ranked.get)
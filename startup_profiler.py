@@ -0,0 +1,144 @@
+# startup_profiler.py
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+# Setting this to a file path enables startup profiling; the trace is written there.
+TRACE_ENV_VAR = "KLYVE_STARTUP_TRACE"
+
+# When set (used by the benchmark), the application quits right after the
+# trace has been written instead of continuing to run.
+EXIT_AFTER_TRACE_ENV_VAR = "KLYVE_STARTUP_EXIT"
+
+# Standard startup span names.
+SPAN_IMPORT = "import"
+SPAN_QT_APP = "qt_app"
+SPAN_DB_OPEN = "db_open"
+SPAN_CONFIG_LOAD = "config_load"
+SPAN_STYLESHEET = "stylesheet"
+SPAN_ORCHESTRATOR = "orchestrator"
+SPAN_WINDOW_BUILD = "window_build"
+SPAN_FIRST_PAINT = "first_paint"
+
+_PROCESS_START = time.perf_counter()
+
+
+@dataclass
+class StartupSpan:
+    """A named, timed section of the startup sequence. Times are seconds since process start."""
+    name: str
+    start: float
+    end: Optional[float] = None
+    parent: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end if self.end is not None else self.start) - self.start) * 1000
+
+
+@dataclass
+class StartupProfiler:
+    """
+    Records startup spans and writes them to a JSON trace. The trace uses the
+    Chrome trace-event format, so it can be opened in chrome://tracing or
+    Perfetto, and also carries a flat summary for scripts.
+
+    When disabled, span() and mark() cost next to nothing, so the calls can
+    stay in the startup path permanently.
+    """
+    trace_path: Optional[Path] = None
+    spans: list[StartupSpan] = field(default_factory=list)
+    _stack: list[str] = field(default_factory=list, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    @classmethod
+    def from_environment(cls) -> "StartupProfiler":
+        trace_path = os.environ.get(TRACE_ENV_VAR)
+        return cls(trace_path=Path(trace_path) if trace_path else None)
+
+    @property
+    def enabled(self) -> bool:
+        return self.trace_path is not None
+
+    @property
+    def exit_after_trace(self) -> bool:
+        return self.enabled and bool(os.environ.get(EXIT_AFTER_TRACE_ENV_VAR))
+
+    @staticmethod
+    def now() -> float:
+        """Seconds since this module was imported (the start of the profiled launch)."""
+        return time.perf_counter() - _PROCESS_START
+
+    @contextmanager
+    def span(self, name: str):
+        """Times the enclosed block as a span nested under any span that is already open."""
+        if not self.enabled:
+            yield
+            return
+        with self._lock:
+            record = StartupSpan(name=name, start=self.now(), parent=self._stack[-1] if self._stack else None)
+            self.spans.append(record)
+            self._stack.append(name)
+        try:
+            yield
+        finally:
+            with self._lock:
+                record.end = self.now()
+                self._stack.remove(name)
+
+    def mark(self, name: str, since: Optional[float] = None):
+        """
+        Records an instant, or a span that started at `since` (seconds since
+        process start, as returned by now()) and ends now.
+        """
+        if not self.enabled:
+            return
+        end = self.now()
+        with self._lock:
+            self.spans.append(StartupSpan(name=name, start=end if since is None else since, end=end))
+
+    def summary(self) -> dict:
+        """Returns {'total_ms', 'spans': {name: duration_ms}} for the top-level spans."""
+        spans = {}
+        for span in self.spans:
+            if span.parent is None:
+                spans[span.name] = round(spans.get(span.name, 0.0) + span.duration_ms, 3)
+        total = max((span.end or span.start for span in self.spans), default=0.0) * 1000
+        return {"total_ms": round(total, 3), "spans": spans}
+
+    def write_trace(self) -> Optional[Path]:
+        """Writes the trace file. Returns its path, or None when profiling is disabled or the write fails."""
+        if not self.enabled:
+            return None
+        pid = os.getpid()
+        events = []
+        for span in self.spans:
+            event = {"name": span.name, "cat": "startup", "pid": pid, "tid": 0, "ts": round(span.start * 1e6)}
+            if span.end is None or span.end == span.start:
+                event.update(ph="i", s="p")
+            else:
+                event.update(ph="X", dur=round((span.end - span.start) * 1e6))
+            if span.parent:
+                event["args"] = {"parent": span.parent}
+            events.append(event)
+
+        payload = {"traceEvents": events, "displayTimeUnit": "ms", "summary": self.summary()}
+        try:
+            self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+            self.trace_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        except OSError as e:
+            logging.error(f"Failed to write startup trace to {self.trace_path}: {e}")
+            return None
+        logging.info(f"Startup trace written to {self.trace_path} (total {payload['summary']['total_ms']:.0f} ms).")
+        return self.trace_path
+
+
+# The process-wide profiler used by klyve.py.
+profiler = StartupProfiler.from_environment()
@@ -0,0 +1,110 @@
+"""
+Benchmark for keyword_matcher.KeywordMatcher against the per-keyword scans it
+replaces.
+
+- 'effort metrics': MasterOrchestrator._calculate_klyve_effort_metrics on a
+  synthetic multi-megabyte specification, comparing one str.count per keyword
+  (the previous loop) with EFFORT_METRIC_MATCHER.count. The category totals
+  must be identical.
+- 'repo scan': the content check of SpecSynthesisAgent._detect_database_usage
+  over a synthetic repository whose files mostly contain no database keyword,
+  comparing any(keyword in content.lower() ...) with first_match.
+
+The keyword lists are read from the source files (the modules themselves
+import PySide6), so the benchmark always measures the lists in use.
+
+Usage:
+    python tools/benchmark_keyword_matcher.py --spec-mb 5 --files 2000
+"""
+import argparse
+import ast
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from keyword_matcher import KeywordMatcher
+
+WORDS = [
+    "the", "service", "validates", "screens", "request", "payload", "and", "stores", "orders",
+    "in", "database", "tables", "user", "opens", "dashboard", "view", "button", "component",
+    "returns", "json", "response", "cache", "layer", "function", "handles", "errors", "report",
+    "window", "form", "api", "endpoint", "security", "review", "guide", "items", "processing",
+]
+
+
+def literal_assignment(path: Path, name: str):
+    """Returns the literal value assigned to `name` anywhere in the file."""
+    for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+        if isinstance(node, ast.Assign) and any(isinstance(target, ast.Name) and target.id == name
+                                                for target in node.targets):
+            return ast.literal_eval(node.value)
+    raise LookupError(f"{name} not found in {path}")
+
+
+def synthetic_text(size: int, seed: int, vocabulary: list = WORDS) -> str:
+    rng = random.Random(seed)
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(vocabulary)
+        words.append(word if rng.random() > 0.05 else word.capitalize())
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def count_per_keyword(categories: dict, text: str) -> dict:
+    lower_text = text.lower()
+    return {category: sum(lower_text.count(keyword) for keyword in keywords)
+            for category, keywords in categories.items()}
+
+
+def scan_any(keywords: list, files: list) -> int:
+    return sum(1 for content in files if any(keyword in content.lower() for keyword in keywords))
+
+
+def scan_matcher(matcher: KeywordMatcher, files: list) -> int:
+    return sum(1 for content in files if matcher.first_match(content))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-keyword scans with KeywordMatcher.")
+    parser.add_argument("--spec-mb", type=float, default=5)
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--file-kb", type=float, default=8)
+    args = parser.parse_args()
+
+    effort_keywords = literal_assignment(ROOT / "master_orchestrator.py", "EFFORT_METRIC_KEYWORDS")
+    spec_text = synthetic_text(int(args.spec_mb * 1024 * 1024), seed=1)
+    expected, loop_seconds = timed(count_per_keyword, effort_keywords, spec_text)
+    matcher = KeywordMatcher(effort_keywords)
+    actual, matcher_seconds = timed(matcher.count, spec_text)
+    if actual != expected:
+        raise SystemExit(f"Effort metrics differ: {actual} != {expected}")
+    print(f"effort metrics ({args.spec_mb:g} MB spec): per-keyword {loop_seconds:6.2f} s  "
+          f"matcher {matcher_seconds:6.2f} s  speed-up {loop_seconds / matcher_seconds:.2f}x  {actual}")
+
+    db_keywords = literal_assignment(ROOT / "agents" / "agent_spec_synthesis.py", "DB_KEYWORDS")
+    db_matcher = KeywordMatcher({"database": db_keywords}, whole_words=True)
+    # Most source files hold no database keyword, so the scan has to read them to the end.
+    plain_words = [word for word in WORDS if not any(keyword in word for keyword in db_keywords)]
+    files = [synthetic_text(int(args.file_kb * 1024), seed=index, vocabulary=plain_words)
+             for index in range(args.files)]
+    for index in range(0, len(files), 50):
+        files[index] += "\nimport sqlite3\n"
+    any_hits, any_seconds = timed(scan_any, db_keywords, files)
+    matcher_hits, matcher_seconds = timed(scan_matcher, db_matcher, files)
+    print(f"repo scan ({args.files} files): any() {any_seconds:6.2f} s ({any_hits} hits)  "
+          f"matcher {matcher_seconds:6.2f} s ({matcher_hits} hits)  speed-up {any_seconds / matcher_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Microbenchmark for the log filtering done by main_window.LogBridge.
+
+Pushes a synthetic mix of agent log records (DEBUG chatter, HTTP noise,
+translatable progress lines and ordinary messages) through two handlers
+attached to a real logger:
+
+- 'legacy': formats every record, then runs str.replace sanitizing and
+  linear scans of the noise and translation tables (the previous LogBridge).
+- 'translator': level/logger gating before formatting, then LogTranslator.
+
+On the records the new handler accepts, both must produce identical output.
+The logger runs at DEBUG, as in 'Detailed' logging mode. Qt is not needed;
+the handlers collect messages in a list instead of emitting a signal.
+
+Usage:
+    python tools/benchmark_log_bridge.py --records 200000
+"""
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gui.log_translation import FRIENDLY_MESSAGES, IGNORED_LOGGERS, IGNORED_PATTERNS, MIN_LEVEL, LogTranslator
+
+SAMPLE_RECORDS = [
+    ("agents.agent_code_generator", logging.DEBUG, "Prompt assembled with %d context artifacts", (42,)),
+    ("klyve_db_manager", logging.DEBUG, "Executing query on table %s", ("Artifacts",)),
+    ("httpx", logging.INFO, 'HTTP Request: POST https://api.example.com/v1/messages "HTTP/1.1 200 OK"', ()),
+    ("master_orchestrator", logging.INFO, "Project 'demo' state automatically saved.", ()),
+    ("agents.agent_fix_planner", logging.INFO, "Invoking FixPlannerAgent for task %s", ("MS-12",)),
+    ("agents.agent_triage", logging.INFO, "TriageAgent: tier 2 hypothesis generated", ()),
+    ("agents.build_and_commit_agent_app_target", logging.INFO, "Running test suite with command: '%s'", ("pytest -q",)),
+    ("master_orchestrator", logging.INFO, "Saved artifact record for %s with %d dependencies.", ("src/app/models/user.py", 4)),
+    ("master_orchestrator", logging.WARNING, "Retrying component %s after a failed verification run.", ("OrderService",)),
+]
+
+
+class LegacyBridgeHandler(logging.Handler):
+    """The filtering LogBridge.emit performed before LogTranslator."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        raw_msg = self.format(record)
+        raw_msg = raw_msg.replace("BuildAndCommitAgent", "Automated Builder")
+        raw_msg = raw_msg.replace("TriageAgent", "Diagnostic System")
+        if any(pattern in raw_msg for pattern in IGNORED_PATTERNS):
+            return
+        final_msg = raw_msg
+        for tech_key, user_text in FRIENDLY_MESSAGES.items():
+            if tech_key in raw_msg:
+                final_msg = user_text
+                break
+        self.messages.append(final_msg)
+
+
+class TranslatorBridgeHandler(logging.Handler):
+    """The filtering LogBridge.emit performs now."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.translator = LogTranslator()
+        self.setLevel(self.translator.min_level)
+
+    def emit(self, record):
+        if not self.translator.accepts(record):
+            return
+        final_msg = self.translator.translate(self.format(record))
+        if final_msg is not None:
+            self.messages.append(final_msg)
+
+
+def build_workload(count: int, seed: int = 7) -> list[logging.LogRecord]:
+    rng = random.Random(seed)
+    records = []
+    for index in range(count):
+        name, level, message, args = rng.choice(SAMPLE_RECORDS)
+        records.append(logging.LogRecord(name, level, __file__, index, message, args, None))
+    return records
+
+
+def run(handler: logging.Handler, records: list[logging.LogRecord]) -> float:
+    """Returns the time in seconds to pass every record through a logger with the handler attached."""
+    logger = logging.getLogger("benchmark_log_bridge")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.handlers = [handler]
+    started = time.perf_counter()
+    for record in records:
+        logger.handle(record)
+    return time.perf_counter() - started
+
+
+def legacy_results_per_record(records: list[logging.LogRecord]) -> list:
+    """Per-record legacy result (None when filtered), used to check equivalence."""
+    handler = LegacyBridgeHandler()
+    results = []
+    for record in records:
+        before = len(handler.messages)
+        handler.emit(record)
+        results.append(handler.messages[-1] if len(handler.messages) > before else None)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare LogBridge filtering strategies.")
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5, help="Best-of-N timing.")
+    args = parser.parse_args()
+
+    records = build_workload(args.records)
+    results = {}
+    outputs = {}
+    for name, handler_class in (("legacy", LegacyBridgeHandler), ("translator", TranslatorBridgeHandler)):
+        timings = []
+        for _ in range(args.repeat):
+            handler = handler_class()
+            timings.append(run(handler, records))
+        results[name] = min(timings)
+        outputs[name] = handler.messages
+
+    # The new path additionally drops DEBUG records and transport loggers.
+    expected = [message for message, record in zip(legacy_results_per_record(records), records)
+                if message is not None and record.levelno >= MIN_LEVEL and not record.name.startswith(IGNORED_LOGGERS)]
+    if outputs["translator"] != expected:
+        raise SystemExit("Translator output differs from the legacy filter on the accepted records.")
+
+    for name, seconds in results.items():
+        print(f"{name:<11} {seconds * 1000:9.1f} ms  {seconds / len(records) * 1e6:6.2f} us/record  "
+              f"{len(outputs[name])} lines shown")
+    print(f"speed-up: {results['legacy'] / results['translator']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Headless cold/warm launch benchmark for klyve.py.
+
+Each run starts klyve.py in a fresh process under the 'offscreen' Qt platform
+with startup profiling enabled (see startup_profiler.py). The application
+quits as soon as the main window has painted for the first time, and the
+spans from its trace are collected.
+
+- Cold runs use an empty bytecode cache (PYTHONPYCACHEPREFIX) and a newly
+  created user database, so every module is compiled and every config default
+  is written.
+- Warm runs reuse a populated bytecode cache and an initialized database.
+
+Usage:
+    python tools/benchmark_startup.py --runs 5 --output startup_benchmark.json
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+import startup_profiler
+
+RUN_TIMEOUT_SECONDS = 180
+
+# Creates the user database and accepts the EULA so the launch is not blocked by the dialog.
+SEED_SCRIPT = """
+from datetime import datetime, timezone
+from pathlib import Path
+from klyve_db_manager import KlyveDBManager
+data_dir = Path.home() / ".klyve" / "data"
+data_dir.mkdir(parents=True, exist_ok=True)
+db = KlyveDBManager(db_path=str(data_dir / "klyve.db"))
+db.create_tables()
+db.set_config_value("EULA_ACCEPTED_TIMESTAMP", datetime.now(timezone.utc).isoformat(), "Timestamp of EULA acceptance.")
+"""
+
+
+def _environment(home: Path, pycache: Path, trace_path: Path | None = None) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "HOME": str(home),
+        "USERPROFILE": str(home),
+        "QT_QPA_PLATFORM": "offscreen",
+        "PYTHONPYCACHEPREFIX": str(pycache),
+    })
+    if trace_path:
+        env[startup_profiler.TRACE_ENV_VAR] = str(trace_path)
+        env[startup_profiler.EXIT_AFTER_TRACE_ENV_VAR] = "1"
+    return env
+
+
+def seed_home(home: Path, pycache: Path):
+    subprocess.run([sys.executable, "-c", SEED_SCRIPT], cwd=PROJECT_ROOT, env=_environment(home, pycache),
+                   check=True, capture_output=True, timeout=RUN_TIMEOUT_SECONDS)
+
+
+def launch(home: Path, pycache: Path, trace_path: Path) -> dict:
+    """Launches klyve.py once and returns the trace summary plus the externally measured wall time."""
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "klyve.py"], cwd=PROJECT_ROOT,
+                            env=_environment(home, pycache, trace_path),
+                            capture_output=True, text=True, timeout=RUN_TIMEOUT_SECONDS)
+    wall_ms = (time.perf_counter() - started) * 1000
+    if not trace_path.exists():
+        raise RuntimeError(f"klyve.py exited with code {result.returncode} without writing a trace.\n"
+                           f"{result.stderr[-2000:]}")
+    summary = json.loads(trace_path.read_text(encoding="utf-8"))["summary"]
+    summary["process_wall_ms"] = round(wall_ms, 3)
+    return summary
+
+
+def aggregate(runs: list[dict]) -> dict:
+    """Returns {metric: {'median', 'min', 'max'}} over a list of run summaries."""
+    metrics: dict[str, list[float]] = {}
+    for run in runs:
+        metrics.setdefault("process_wall_ms", []).append(run["process_wall_ms"])
+        metrics.setdefault("total_ms", []).append(run["total_ms"])
+        for name, value in run["spans"].items():
+            metrics.setdefault(name, []).append(value)
+    return {name: {"median": round(statistics.median(values), 1), "min": round(min(values), 1),
+                   "max": round(max(values), 1)} for name, values in metrics.items()}
+
+
+def print_report(report: dict):
+    names = list(dict.fromkeys(name for mode in ("cold", "warm") for name in report[mode]))
+    print(f"{'span':<18}{'cold median':>14}{'cold min':>11}{'warm median':>14}{'warm min':>11}")
+    for name in names:
+        cold = report["cold"].get(name, {})
+        warm = report["warm"].get(name, {})
+        print(f"{name:<18}{cold.get('median', 0):>14.1f}{cold.get('min', 0):>11.1f}"
+              f"{warm.get('median', 0):>14.1f}{warm.get('min', 0):>11.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold and warm startup time of klyve.py.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold and of warm launches.")
+    parser.add_argument("--output", type=Path, help="Write the aggregated results and raw runs to this JSON file.")
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="klyve_startup_"))
+    try:
+        cold_runs = []
+        for index in range(args.runs):
+            home, pycache = work_dir / f"cold_home_{index}", work_dir / f"cold_pycache_{index}"
+            seed_home(home, work_dir / "seed_pycache")
+            cold_runs.append(launch(home, pycache, work_dir / f"cold_{index}.json"))
+            print(f"cold run {index + 1}/{args.runs}: {cold_runs[-1]['total_ms']:.0f} ms")
+
+        home, pycache = work_dir / "warm_home", work_dir / "warm_pycache"
+        seed_home(home, pycache)
+        launch(home, pycache, work_dir / "warm_priming.json")
+        warm_runs = []
+        for index in range(args.runs):
+            warm_runs.append(launch(home, pycache, work_dir / f"warm_{index}.json"))
+            print(f"warm run {index + 1}/{args.runs}: {warm_runs[-1]['total_ms']:.0f} ms")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {"runs": args.runs, "cold": aggregate(cold_runs), "warm": aggregate(warm_runs)}
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(dict(report, raw={"cold": cold_runs, "warm": warm_runs}), indent=2),
+                               encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
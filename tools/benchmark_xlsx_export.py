@@ -0,0 +1,85 @@
+"""
+Throughput and memory benchmark for the streamed XLSX report exports.
+
+Writes the same synthetic backlog rows two ways and reports rows/sec and peak
+Python memory (tracemalloc) for each:
+
+- 'in_memory': a regular openpyxl Workbook with every row appended before
+  saving (how the reports were written before xlsx_export).
+- 'write_only': xlsx_export.write_xlsx fed from a generator, as the reports
+  are written now.
+
+Usage:
+    python tools/benchmark_xlsx_export.py --rows 50000
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from xlsx_export import XlsxColumn, write_xlsx
+
+# The columns of the backlog report (see agents/agent_report_generator.py).
+BACKLOG_XLSX_COLUMNS = [XlsxColumn(header) for header in
+                        ('#', 'Title', 'Type', 'Status', 'Priority/Severity', 'Complexity', 'Last Modified')]
+
+STATUSES = ["TO_DO", "IN_PROGRESS", "COMPLETED", "BUG_RAISED"]
+
+
+def synthetic_rows(count: int):
+    for index in range(count):
+        yield [
+            f"{index // 100 + 1}.{index % 100 + 1}",
+            f"Backlog item {index} with a reasonably descriptive title",
+            "Backlog Item",
+            STATUSES[index % len(STATUSES)],
+            "Medium",
+            "Small",
+            "2026-10-18 12:00",
+        ]
+
+
+def export_in_memory(count: int) -> int:
+    from openpyxl import Workbook
+    wb = Workbook()
+    ws = wb.active
+    ws.append([column.header for column in BACKLOG_XLSX_COLUMNS])
+    for row in synthetic_rows(count):
+        ws.append(row)
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getbuffer().nbytes
+
+
+def export_write_only(count: int) -> int:
+    buffer = BytesIO()
+    write_xlsx(buffer, "Project Backlog", BACKLOG_XLSX_COLUMNS, synthetic_rows(count))
+    return buffer.getbuffer().nbytes
+
+
+def measure(function, count: int) -> dict:
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = function(count)
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": seconds, "rows_per_second": count / seconds, "peak_mb": peak / 1024 / 1024, "file_kb": size / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare in-memory and write-only XLSX exports.")
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    for name, function in (("in_memory", export_in_memory), ("write_only", export_write_only)):
+        result = measure(function, args.rows)
+        print(f"{name:<11} {result['seconds']:7.2f} s  {result['rows_per_second']:9.0f} rows/s  "
+              f"peak {result['peak_mb']:7.1f} MB  file {result['file_kb']:8.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
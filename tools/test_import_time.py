@@ -0,0 +1,70 @@
+import importlib.util
+import os
+import re
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Libraries that must only be loaded when a report, diagram, repository or
+# integration is actually used, never while the application starts.
+DEFERRED_MODULES = ("pandas", "docx", "htmldocx", "openpyxl", "markdown", "bs4", "PIL",
+                    "graphviz", "git", "plotly", "requests")
+
+# Cumulative import time allowed for each startup module, in milliseconds.
+# KLYVE_IMPORT_BUDGET_SCALE multiplies the budgets on slow CI machines.
+IMPORT_BUDGETS_MS = {
+    "master_orchestrator": 1500,
+    "main_window": 2500,
+}
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def measure_imports(module_name: str) -> dict[str, int]:
+    """Imports a module in a fresh interpreter and returns {module: cumulative microseconds}."""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+                            cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=120)
+    if result.returncode != 0:
+        raise AssertionError(f"Importing {module_name} failed:\n{result.stderr[-2000:]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            timings[match.group(4)] = int(match.group(2))
+    return timings
+
+
+@unittest.skipUnless(importlib.util.find_spec("PySide6"), "PySide6 is not installed")
+class TestImportTime(unittest.TestCase):
+
+    def assertNoDeferredImports(self, module_name: str, timings: dict[str, int]):
+        loaded = sorted(name for name in timings if name.split(".")[0] in DEFERRED_MODULES)
+        self.assertEqual(loaded, [], f"Importing {module_name} eagerly loads: {', '.join(loaded)}")
+
+    def assertWithinBudget(self, module_name: str, timings: dict[str, int]):
+        scale = float(os.environ.get("KLYVE_IMPORT_BUDGET_SCALE", "1"))
+        budget_ms = IMPORT_BUDGETS_MS[module_name] * scale
+        elapsed_ms = timings[module_name] / 1000
+        slowest = sorted(((us, name) for name, us in timings.items() if name != module_name), reverse=True)[:10]
+        breakdown = "\n".join(f"  {us / 1000:8.1f} ms  {name}" for us, name in slowest)
+        self.assertLessEqual(elapsed_ms, budget_ms,
+                             f"Importing {module_name} took {elapsed_ms:.0f} ms (budget {budget_ms:.0f} ms). "
+                             f"Slowest imports:\n{breakdown}")
+
+    def test_master_orchestrator(self):
+        timings = measure_imports("master_orchestrator")
+        self.assertNoDeferredImports("master_orchestrator", timings)
+        self.assertWithinBudget("master_orchestrator", timings)
+
+    def test_main_window(self):
+        timings = measure_imports("main_window")
+        self.assertNoDeferredImports("main_window", timings)
+        self.assertWithinBudget("main_window", timings)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from orchestration_state_store import JOURNAL_SEQ_FIELD, OrchestrationStateStore
+
+
+class InMemoryStateDB:
+    """Implements the orchestration state methods of KlyveDBManager the store uses."""
+
+    def __init__(self):
+        self.events = []
+        self.fields = {}
+        self.phase = None
+
+    def append_orchestration_event(self, project_id, event_type, payload, timestamp):
+        self.events.append(len(self.events) + 1)
+        return self.events[-1]
+
+    def get_latest_orchestration_event_seq(self, project_id):
+        return self.events[-1] if self.events else 0
+
+    def upsert_orchestration_state(self, project_id, current_phase, current_step, timestamp,
+                                   changed_fields, new_blobs, compact_through_seq):
+        self.phase = current_phase
+        for field_name, value_json, blob_hash in changed_fields:
+            self.fields[field_name] = new_blobs[blob_hash] if blob_hash else value_json
+        self.events = [seq for seq in self.events if seq > compact_through_seq]
+
+
+class TestSnapshotOrdering(unittest.TestCase):
+
+    def setUp(self):
+        self.db = InMemoryStateDB()
+        self.store = OrchestrationStateStore(self.db, debounce_seconds=0.01)
+
+    def test_debounced_snapshot_cannot_land_after_newer_immediate_one(self):
+        newer_saved = threading.Event()
+        debounced_write_started = threading.Event()
+        write = self.store._write
+
+        def delayed_write(*pending):
+            # Hold the debounced write between taking the pending snapshot and
+            # writing it, giving the immediate save the chance to overtake it.
+            if pending[1] == "OLD":
+                debounced_write_started.set()
+                newer_saved.wait(0.5)
+            write(*pending)
+
+        self.store._write = delayed_write
+        self.store.append_event("p1", "TASK_COMPLETED")
+        self.store.save("p1", "OLD", "", {"task": 1})
+        self.assertTrue(debounced_write_started.wait(2))
+
+        def save_newer():
+            self.store.append_event("p1", "TASK_COMPLETED")
+            self.store.save("p1", "NEW", "", {"task": 2}, immediate=True)
+            newer_saved.set()
+
+        saver = threading.Thread(target=save_newer)
+        saver.start()
+        saver.join(5)
+
+        self.assertEqual(self.db.phase, "NEW")
+        self.assertEqual(self.db.fields["task"], "2")
+        self.assertEqual(self.db.fields[JOURNAL_SEQ_FIELD], "2")
+
+    def test_snapshot_older_than_the_last_written_is_skipped(self):
+        self.store.append_event("p1", "TASK_COMPLETED")
+        stale_seq = self.store._journal_seq("p1")
+        self.store.append_event("p1", "TASK_COMPLETED")
+        self.store.save("p1", "NEW", "", {"task": 2}, immediate=True)
+
+        # A save that read the journal position before the newer snapshot.
+        self.store._journal_seq = lambda project_id: stale_seq
+        self.store.save("p1", "OLD", "", {"task": 1}, immediate=True)
+
+        self.assertEqual(self.db.phase, "NEW")
+        self.assertEqual(self.db.fields["task"], "2")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from process_runner import run_streaming_command
+
+
+@unittest.skipIf(sys.platform == "win32", "uses POSIX shell commands")
+class TestRunStreamingCommand(unittest.TestCase):
+
+    def test_completes_with_output(self):
+        result = run_streaming_command("echo one; echo two", cwd=".", wall_clock_timeout=10, idle_timeout=10)
+        self.assertEqual(result.returncode, 0)
+        self.assertFalse(result.timed_out)
+        self.assertIn("one", result.output)
+        self.assertIn("two", result.output)
+
+    def test_wall_clock_timeout_kills_chatty_command(self):
+        # Output keeps arriving, so only the wall-clock limit can stop this command.
+        result = run_streaming_command("while true; do echo x; sleep 0.05; done", cwd=".",
+                                       wall_clock_timeout=1, idle_timeout=5)
+        self.assertTrue(result.timed_out)
+        self.assertIn("wall-clock", result.timeout_reason)
+        self.assertLess(result.duration_seconds, 5)
+
+    def test_idle_timeout_kills_silent_command(self):
+        result = run_streaming_command("echo start; sleep 30", cwd=".", wall_clock_timeout=20, idle_timeout=1)
+        self.assertTrue(result.timed_out)
+        self.assertIn("no output", result.timeout_reason)
+        self.assertLess(result.duration_seconds, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from runner_output_parsers import parse_test_output
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "runner_outputs"
+
+
+def load_fixture(name: str) -> str:
+    return (FIXTURES_DIR / name).read_text(encoding='utf-8')
+
+
+class TestRunnerOutputParsers(unittest.TestCase):
+
+    def assertCounts(self, run, framework, passed, failed, errors, skipped):
+        self.assertIsNotNone(run, f"No parser recognized the {framework} fixture")
+        self.assertEqual(run.framework, framework)
+        self.assertEqual((run.passed, run.failed, run.errors, run.skipped), (passed, failed, errors, skipped))
+
+    def test_pytest_failures(self):
+        run = parse_test_output(load_fixture("pytest_failures.txt"))
+        self.assertCounts(run, "pytest", 11, 1, 1, 1)
+        self.assertFalse(run.success)
+        self.assertIn("tests/test_inventory.py::test_remove_item_stock - AssertionError: assert True is False", run.failures)
+        self.assertTrue(any("test_discount" in failure for failure in run.failures))
+
+    def test_pytest_passed(self):
+        run = parse_test_output(load_fixture("pytest_passed.txt"))
+        self.assertCounts(run, "pytest", 6, 0, 0, 0)
+        self.assertTrue(run.success)
+
+    def test_pytest_quiet_failures(self):
+        run = parse_test_output(load_fixture("pytest_quiet_failures.txt"))
+        self.assertCounts(run, "pytest", 5, 1, 0, 1)
+        self.assertEqual(run.failures, ["tests/test_cart.py::test_apply_discount - assert 20.0 == 18.0"])
+
+    def test_unittest_failures(self):
+        run = parse_test_output(load_fixture("unittest_failures.txt"))
+        self.assertCounts(run, "unittest", 4, 1, 1, 1)
+        self.assertIn("test_total (tests.test_cart.CartTests.test_total): AssertionError: 25 != 30", run.failures)
+        self.assertIn("test_load_config (tests.test_config.ConfigTests.test_load_config): KeyError: 'database'", run.failures)
+
+    def test_unittest_passed(self):
+        run = parse_test_output(load_fixture("unittest_passed.txt"))
+        self.assertCounts(run, "unittest", 5, 0, 0, 0)
+        self.assertTrue(run.success)
+
+    def test_jest_failures(self):
+        run = parse_test_output(load_fixture("jest_failures.txt"))
+        self.assertCounts(run, "jest", 7, 1, 0, 1)
+        self.assertEqual(len(run.failures), 1)
+        self.assertTrue(run.failures[0].startswith("Cart › shows the total price"))
+
+    def test_go_test_verbose(self):
+        run = parse_test_output(load_fixture("go_test_verbose.txt"))
+        self.assertCounts(run, "go-test", 2, 1, 0, 1)
+        self.assertIn("TestApplyDiscount", run.failures)
+
+    def test_dotnet_test_failures(self):
+        run = parse_test_output(load_fixture("dotnet_test_failures.txt"))
+        self.assertCounts(run, "dotnet-test", 11, 1, 0, 1)
+        self.assertIn("Billing.Tests.InvoiceTests.Total_IncludesTax: Assert.Equal() Failure: Values differ", run.failures)
+
+    def test_junit_xml(self):
+        run = parse_test_output(load_fixture("junit_report.xml"))
+        self.assertCounts(run, "junit-xml", 2, 1, 0, 1)
+        self.assertIn("LoginPage.rejects an empty password: expected 'Login' to equal 'Password required'", run.failures)
+
+    def test_junit_xml_embedded_in_log(self):
+        output = "Running mocha with reporter...\n" + load_fixture("junit_report.xml") + "\nDone in 1.2s\n"
+        run = parse_test_output(output)
+        self.assertCounts(run, "junit-xml", 2, 1, 0, 1)
+
+    def test_unrecognized_output_falls_through(self):
+        self.assertIsNone(parse_test_output(load_fixture("unrecognized.txt")))
+        self.assertIsNone(parse_test_output(""))
+
+    def test_result_dict_contract(self):
+        result = parse_test_output(load_fixture("pytest_failures.txt")).to_result_dict()
+        self.assertFalse(result["success"])
+        self.assertIn("1 failed", result["summary"])
+        self.assertIn("test_remove_item_stock", result["summary"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from search_index import spec_section_texts, split_spec_sections
+
+SPEC_WITH_CODE = (
+    "# Setup\n"
+    "Run:\n"
+    "```bash\n"
+    "# install deps\n"
+    "pip install -r requirements.txt\n"
+    "```\n"
+    "# Models\n"
+    "~~~python\n"
+    "# The order model\n"
+    "class Order: ...\n"
+    "~~~\n"
+    "## Next\n"
+    "Done.\n"
+)
+
+
+class TestSpecSections(unittest.TestCase):
+
+    def test_comment_lines_in_fenced_code_are_not_headings(self):
+        self.assertEqual([heading for heading, _ in split_spec_sections(SPEC_WITH_CODE)], ["Setup", "Models", "Next"])
+
+    def test_sections_keep_their_code_blocks_whole(self):
+        sections = spec_section_texts(SPEC_WITH_CODE)
+        self.assertEqual("".join(sections), SPEC_WITH_CODE)
+        self.assertEqual(sections[0], "# Setup\nRun:\n```bash\n# install deps\npip install -r requirements.txt\n```\n")
+        self.assertTrue(all(section.count("```") % 2 == 0 and section.count("~~~") % 2 == 0 for section in sections))
+
+    def test_longer_closing_fence_ends_the_block(self):
+        sections = spec_section_texts("# A\n```\n# not a heading\n````\n# B\n")
+        self.assertEqual(sections, ["# A\n```\n# not a heading\n````\n", "# B\n"])
+
+
+if __name__ == '__main__':
+    unittest.main()